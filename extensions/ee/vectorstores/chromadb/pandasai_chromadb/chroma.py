@@ -8,6 +8,7 @@ from chromadb.utils import embedding_functions
 
 from pandasai.helpers.logger import Logger
 from pandasai.helpers.path import find_project_root
+from pandasai.vectorstores.embeddings import cached_embedding_function
 from pandasai.vectorstores.vectorstore import VectorStore
 
 DEFAULT_EMBEDDING_FUNCTION = embedding_functions.DefaultEmbeddingFunction()
@@ -25,6 +26,9 @@ class ChromaDB(VectorStore):
         max_samples: int = 1,
         similary_threshold: int = 1.5,
         logger: Optional[Logger] = None,
+        embedding_cache_path: Optional[str] = None,
+        embedding_batch_size: int = 64,
+        embedding_workers: int = 1,
     ) -> None:
         self._logger = logger or Logger()
         self._max_samples = max_samples
@@ -54,7 +58,12 @@ class ChromaDB(VectorStore):
 
         self._logger.log(f"Persisting Agent Training data in {self._persist_directory}")
 
-        self._embedding_function = embedding_function or DEFAULT_EMBEDDING_FUNCTION
+        self._embedding_function = cached_embedding_function(
+            embedding_function or DEFAULT_EMBEDDING_FUNCTION,
+            cache_path=embedding_cache_path,
+            batch_size=embedding_batch_size,
+            max_workers=embedding_workers,
+        )
 
         self._qa_collection = self._client.get_or_create_collection(
             name=f"{collection_name}-qa", embedding_function=self._embedding_function
@@ -10,6 +10,7 @@ from lancedb.pydantic import LanceModel, Vector
 from sentence_transformers import SentenceTransformer
 
 from pandasai.helpers.logger import Logger
+from pandasai.vectorstores.embeddings import cached_embedding_function
 from pandasai.vectorstores.vectorstore import VectorStore
 
 
@@ -71,6 +72,9 @@ class LanceDB(VectorStore):
         max_samples: int = 1,
         similary_threshold: int = 1.5,
         logger: Optional[Logger] = None,
+        embedding_cache_path: Optional[str] = None,
+        embedding_batch_size: int = 64,
+        embedding_workers: int = 1,
     ) -> None:
         self._logger = logger or Logger()
         self._max_samples = max_samples
@@ -79,7 +83,16 @@ class LanceDB(VectorStore):
 
         self._db = lancedb.connect(self._persist_directory)
 
-        self._embedding_function = embedding_function
+        self._embedding_function = (
+            cached_embedding_function(
+                embedding_function,
+                cache_path=embedding_cache_path,
+                batch_size=embedding_batch_size,
+                max_workers=embedding_workers,
+            )
+            if embedding_function
+            else None
+        )
         if self._embedding_function is None:
             QA_pairs, Docs = Schema(custom_embedding_function=False)._create_schema()
         else:
@@ -6,6 +6,7 @@ from pydantic import Field
 from pymilvus import DataType, MilvusClient, model
 
 from pandasai.helpers.logger import Logger
+from pandasai.vectorstores.embeddings import CachedEmbeddingFunction
 from pandasai.vectorstores.vectorstore import VectorStore
 
 DEFAULT_COLLECTION_NAME = "pandasai"
@@ -33,6 +34,9 @@ class Milvus(VectorStore):
         uri: Optional[str] = URI,
         similarity_threshold: Optional[float] = None,
         logger: Optional[Logger] = None,
+        embedding_cache_path: Optional[str] = None,
+        embedding_batch_size: int = 64,
+        embedding_workers: int = 1,
     ):
         self.docs_collection_name = f"{collection_name}_docs"
         self.qa_collection_name = f"{collection_name}_qa"
@@ -40,6 +44,13 @@ class Milvus(VectorStore):
         self._logger = logger or Logger()
         self.similarity_threshold = similarity_threshold
         self.emb_function = model.DefaultEmbeddingFunction()
+        self._embed = CachedEmbeddingFunction(
+            lambda texts: self.emb_function.encode_documents(texts),
+            cache_path=embedding_cache_path,
+            batch_size=embedding_batch_size,
+            max_workers=embedding_workers,
+            namespace="milvus-default",
+        )
         self.client = MilvusClient(uri=self.uri)
 
     # Adds question-answer pairs to the Milvus collection.
@@ -60,7 +71,7 @@ class Milvus(VectorStore):
         format_qa = [
             self._format_qa(query, code) for query, code in zip(queries, codes)
         ]
-        vectors = self.emb_function.encode_documents(format_qa)
+        vectors = self._embed(format_qa)
         self.qa_dimension = self.emb_function.dim
         milvus_ids = (
             self._convert_ids(ids) if ids else self.generate_random_uuids(len(queries))
@@ -99,7 +110,7 @@ class Milvus(VectorStore):
         milvus_ids = (
             self._convert_ids(ids) if ids else self.generate_random_uuids(len(docs))
         )
-        vectors = self.emb_function.encode_documents(docs)
+        vectors = self._embed(docs)
 
         if not self.client.has_collection(collection_name=self.docs_collection_name):
             self._initiate_docs_collection()
@@ -135,7 +146,7 @@ class Milvus(VectorStore):
                 "ids": [],
             }
 
-        vector = self.emb_function.encode_documents(question)
+        vector = self._embed([question])
         response = self.client.search(
             collection_name=self.qa_collection_name,
             data=vector,
@@ -155,7 +166,7 @@ class Milvus(VectorStore):
                 "metadatas": [],
                 "ids": [],
             }
-        vector = self.emb_function.encode_documents(question)
+        vector = self._embed([question])
         response = self.client.search(
             collection_name=self.docs_collection_name,
             data=vector,
@@ -310,7 +321,7 @@ class Milvus(VectorStore):
         format_qa = [
             self._format_qa(query, code) for query, code in zip(queries, codes)
         ]
-        vectors = self.emb_function.encode_documents(format_qa)
+        vectors = self._embed(format_qa)
         data = [
             {ID: id, EMBEDDING: vector, DOCUMENT: doc}
             for id, vector, doc in zip(milvus_ids, vectors, format_qa)
@@ -336,7 +347,7 @@ class Milvus(VectorStore):
         ):
             return []
 
-        vectors = self.emb_function.encode_document(docs)
+        vectors = self._embed(docs)
         data = [
             {ID: id, EMBEDDING: vector, DOCUMENT: doc}
             for id, vector, doc in zip(milvus_ids, vectors, docs)
@@ -147,7 +147,7 @@ class TestMilvus(unittest.TestCase):
     def test_get_relevant_question_answers(self, mock_client):
         milvus = Milvus()
         question = "What is AGI?"
-        mock_vector = milvus.emb_function.encode_documents(question)
+        mock_vector = [[0.1, 0.2, 0.3]]
         milvus.emb_function.encode_documents = MagicMock(return_value=mock_vector)
 
         milvus.get_relevant_question_answers(question, k=3)
@@ -166,7 +166,7 @@ class TestMilvus(unittest.TestCase):
     def test_get_relevant_docs(self, mock_client):
         milvus = Milvus()
         question = "What is AGI?"
-        mock_vector = milvus.emb_function.encode_documents(question)
+        mock_vector = [[0.1, 0.2, 0.3]]
         milvus.emb_function.encode_documents = MagicMock(return_value=mock_vector)
 
         milvus.get_relevant_docs(question, k=3)
@@ -176,3 +176,16 @@ class TestMilvus(unittest.TestCase):
             limit=3,
             output_fields=["document"],
         )
+
+    @patch(
+        "extensions.ee.vectorstores.milvus.pandasai_milvus.milvus.MilvusClient",
+        autospec=True,
+    )
+    def test_question_embedding_is_cached(self, mock_client):
+        milvus = Milvus()
+        milvus.emb_function.encode_documents = MagicMock(return_value=[[0.1, 0.2]])
+
+        milvus.get_relevant_question_answers("What is AGI?")
+        milvus.get_relevant_docs("What is AGI?")
+
+        milvus.emb_function.encode_documents.assert_called_once_with(["What is AGI?"])
@@ -4,6 +4,7 @@ from typing import Any, Callable, Iterable, List, Optional, Union
 import pinecone
 
 from pandasai.helpers.logger import Logger
+from pandasai.vectorstores.embeddings import cached_embedding_function
 from pandasai.vectorstores.vectorstore import VectorStore
 
 
@@ -26,6 +27,9 @@ class Pinecone(VectorStore):
         max_samples: int = 1,
         similary_threshold: int = 1.5,
         logger: Optional[Any] = None,
+        embedding_cache_path: Optional[str] = None,
+        embedding_batch_size: int = 64,
+        embedding_workers: int = 1,
     ) -> None:
         self._logger = Logger() if logger is None else logger
         self._logger.log("Initializing Pinecone vector store")
@@ -35,7 +39,16 @@ class Pinecone(VectorStore):
 
         self._metatext_key = "text"
 
-        self._embedding_function = embedding_function
+        self._embedding_function = (
+            cached_embedding_function(
+                embedding_function,
+                cache_path=embedding_cache_path,
+                batch_size=embedding_batch_size,
+                max_workers=embedding_workers,
+            )
+            if embedding_function
+            else None
+        )
 
         # Initialize these as None first
         self._pinecone = None
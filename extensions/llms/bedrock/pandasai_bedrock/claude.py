@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import json
-from typing import TYPE_CHECKING, Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional
 
 from pandasai.core.prompts.base import BasePrompt
 from pandasai.exceptions import APIKeyNotFoundError, UnsupportedModelError
 from pandasai.helpers import load_dotenv
+from pandasai.helpers.memory import Memory, get_prompt_memory
 from pandasai.llm.base import LLM
 
 if TYPE_CHECKING:
@@ -26,6 +27,7 @@ class BedrockClaude(LLM):
         temperature: (Optional) The amount of randomness injected into the response.
         top_p: (Optional) Use nucleus sampling. In nucleus sampling, Anthropic Claude computes the cumulative distribution over all the options for each subsequent token in decreasing probability order and cuts it off once it reaches a particular probability specified by top_p. You should alter either temperature or top_p, but not both.
         top_k: (Optional) Only sample from the top K options for each subsequent token.
+        streaming: (Optional) Stream the completions when generating code, and stop them once the code block is closed.
         stop_sequences: (Optional) Custom text sequences that cause the model to stop generating. Anthropic Claude models normally stop when they have naturally completed their turn, in this case the value of the stop_reason response field is end_turn. If you want the model to stop generating when it encounters custom strings of text, you can use the stop_sequences parameter. If the model encounters one of the custom text strings, the value of the stop_reason response field is stop_sequence and the value of stop_sequence contains the matched stop sequence.
     """
 
@@ -42,6 +44,7 @@ class BedrockClaude(LLM):
         "top_p",
         "top_k",
         "stop_sequences",
+        "streaming",
     ]
 
     max_tokens: int = 1024
@@ -78,10 +81,7 @@ class BedrockClaude(LLM):
             "stop_sequences": self.stop_sequences,
         }
 
-    def call(self, instruction: BasePrompt, context: AgentState = None) -> str:
-        prompt = instruction.to_string()
-        memory = context.memory if context else None
-
+    def _request_body(self, prompt: str, memory: Optional[Memory]) -> str:
         messages = []
         system_prompt = ""
         if memory:
@@ -128,17 +128,48 @@ class BedrockClaude(LLM):
             if key != "model" and value is not None:
                 params[key] = value
 
-        body = json.dumps(params)
-        # print(body)
+        return json.dumps(params)
+
+    def call(self, instruction: BasePrompt, context: AgentState = None) -> str:
+        prompt = instruction.to_string()
+        memory = get_prompt_memory(context)
+
+        body = self._request_body(prompt, memory)
 
         response = self.client.invoke_model(modelId=self.model, body=body)
 
         response_body = json.loads(response.get("body").read())
 
         self.last_prompt = prompt
-        # print(response_body["content"][0]["text"])
         return response_body["content"][0]["text"]
 
+    def stream(
+        self, instruction: BasePrompt, context: AgentState = None
+    ) -> Iterator[str]:
+        prompt = instruction.to_string()
+        memory = get_prompt_memory(context)
+
+        body = self._request_body(prompt, memory)
+
+        response = self.client.invoke_model_with_response_stream(
+            modelId=self.model, body=body
+        )
+        self.last_prompt = prompt
+
+        events = response.get("body")
+        try:
+            for event in events:
+                if "chunk" not in event:
+                    continue
+                chunk = json.loads(event["chunk"]["bytes"])
+                if chunk.get("type") == "content_block_delta":
+                    text = chunk["delta"].get("text")
+                    if text:
+                        yield text
+        finally:
+            # Closing the event stream stops the generation
+            events.close()
+
     @property
     def type(self) -> str:
         return "bedrock-claude"
@@ -17,6 +17,31 @@ class MockBedrockRuntimeClient:
         text = io.StringIO(text)
         return {"body": text}
 
+    def invoke_model_with_response_stream(self, **kwargs):
+        self.stream = MockEventStream(
+            [
+                {"type": "message_start"},
+                {"type": "content_block_delta", "delta": {"text": "```python\n"}},
+                {"type": "content_block_delta", "delta": {"text": "result = 1\n"}},
+                {"type": "content_block_delta", "delta": {"text": "```"}},
+                {"type": "content_block_delta", "delta": {"text": "\nDone."}},
+            ]
+        )
+        return {"body": self.stream}
+
+
+class MockEventStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            yield {"chunk": {"bytes": json.dumps(chunk).encode()}}
+
+    def close(self):
+        self.closed = True
+
 
 class MockedCompletion:
     def __init__(self, result: str):
@@ -73,3 +98,10 @@ class TestBedrockClaude:
         expected_text = "This is the expected text."
         result = llm.call(instruction=prompt)
         assert result == expected_text
+
+    def test_stream(self, prompt):
+        client = MockBedrockRuntimeClient()
+        llm = BedrockClaude(bedrock_runtime_client=client, streaming=True)
+
+        assert llm.generate_code(prompt, None) == "result = 1"
+        assert client.stream.closed is True
@@ -7,7 +7,7 @@ from pandasai.core.prompts.base import BasePrompt
 from pandasai.exceptions import (
     MethodNotImplementedError,
 )
-from pandasai.helpers.memory import Memory
+from pandasai.helpers.memory import Memory, get_prompt_memory
 from pandasai.llm.base import LLM
 
 if TYPE_CHECKING:
@@ -89,5 +89,5 @@ class BaseGoogle(LLM):
 
         """
         self.last_prompt = instruction.to_string()
-        memory = context.memory if context else None
+        memory = get_prompt_memory(context)
         return self._generate_text(self.last_prompt, memory)
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from pandasai.core.prompts.base import BasePrompt
 from pandasai.helpers import load_dotenv
+from pandasai.helpers.memory import get_prompt_memory
 from pandasai.llm.base import LLM
 
 if TYPE_CHECKING:
@@ -113,7 +114,7 @@ class HuggingFaceTextGen(LLM):
         specified stop sequences."""
         prompt = instruction.to_string()
 
-        memory = context.memory if context else None
+        memory = get_prompt_memory(context)
 
         prompt = self.prepend_system_prompt(prompt, memory)
 
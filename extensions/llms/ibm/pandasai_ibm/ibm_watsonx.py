@@ -7,6 +7,7 @@ from pandasai.core.code_execution.environment import import_dependency
 from pandasai.core.prompts.base import BasePrompt
 from pandasai.exceptions import APIKeyNotFoundError
 from pandasai.helpers import load_dotenv
+from pandasai.helpers.memory import get_prompt_memory
 from pandasai.llm.base import LLM
 
 if TYPE_CHECKING:
@@ -134,7 +135,7 @@ class IBMwatsonx(LLM):
     def call(self, instruction: BasePrompt, context: AgentState = None) -> str:
         prompt = instruction.to_string()
 
-        memory = context.memory if context else None
+        memory = get_prompt_memory(context)
 
         prompt = self.prepend_system_prompt(prompt, memory)
 
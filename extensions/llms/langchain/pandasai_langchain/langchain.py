@@ -14,6 +14,7 @@ except ImportError:
 
 from typing import TYPE_CHECKING
 
+from pandasai.helpers.memory import get_prompt_memory
 from pandasai.llm.base import LLM
 
 if TYPE_CHECKING:
@@ -48,7 +49,7 @@ class LangchainLLM(LLM):
         self, instruction: BasePrompt, context: AgentState = None, suffix: str = ""
     ) -> str:
         prompt = instruction.to_string() + suffix
-        memory = context.memory if context else None
+        memory = get_prompt_memory(context)
         prompt = self.prepend_system_prompt(prompt, memory)
         self.last_prompt = prompt
 
@@ -1,27 +1,47 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Dict, Iterator
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from pandasai.core.prompts.base import BasePrompt
-from pandasai.helpers.memory import Memory
+from pandasai.helpers.memory import Memory, get_prompt_memory
 from pandasai.llm.base import LLM
+from pandasai.llm.client_registry import client_registry
 
 if TYPE_CHECKING:
     from pandasai.agent.state import AgentState
 
 
 class LocalLLM(LLM):
-    def __init__(self, api_base: str, model: str = "", api_key: str = "", **kwargs):
+    def __init__(
+        self,
+        api_base: str,
+        model: str = "",
+        api_key: str = "",
+        streaming: bool = False,
+        **kwargs,
+    ):
         if not api_key:
             api_key = "dummy"
 
         self.model = model
-        self.client = OpenAI(base_url=api_base, api_key=api_key).chat.completions
+        self.streaming = streaming
+        self._client_params = {"base_url": api_base, "api_key": api_key}
+        # Shared with the other local LLMs of the same server
+        self.client = client_registry.get(
+            OpenAI, **self._client_params
+        ).chat.completions
         self._invocation_params = kwargs
 
-    def chat_completion(self, value: str, memory: Memory) -> str:
+    @property
+    def async_client(self) -> Any:
+        """Async counterpart of `client`, for the running event loop."""
+        return client_registry.get_async(
+            AsyncOpenAI, **self._client_params
+        ).chat.completions
+
+    def _chat_completion_params(self, value: str, memory: Memory) -> Dict[str, Any]:
         messages = memory.to_openai_messages() if memory else []
 
         # adding current prompt as latest query message
@@ -32,7 +52,10 @@ class LocalLLM(LLM):
             }
         )
 
-        params = {"model": self.model, "messages": messages, **self._invocation_params}
+        return {"model": self.model, "messages": messages, **self._invocation_params}
+
+    def chat_completion(self, value: str, memory: Memory) -> str:
+        params = self._chat_completion_params(value, memory)
         response = self.client.create(**params)
 
         return response.choices[0].message.content
@@ -40,10 +63,27 @@ class LocalLLM(LLM):
     def call(self, instruction: BasePrompt, context: AgentState = None) -> str:
         self.last_prompt = instruction.to_string()
 
-        memory = context.memory if context else None
+        memory = get_prompt_memory(context)
 
         return self.chat_completion(self.last_prompt, memory)
 
+    def stream(
+        self, instruction: BasePrompt, context: AgentState = None
+    ) -> Iterator[str]:
+        self.last_prompt = instruction.to_string()
+
+        memory = get_prompt_memory(context)
+
+        params = self._chat_completion_params(self.last_prompt, memory)
+        response = self.client.create(**params, stream=True)
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # Closing the connection stops the generation
+            response.close()
+
     @property
     def type(self) -> str:
         return "local"
@@ -90,3 +90,33 @@ class TestLocalLLM:
         result = local_llm.call(instruction=prompt)
         assert result == expected_text
         mock_create.assert_called_once()
+
+    def test_stream(self, client, prompt):
+        chunks = [
+            MagicMock(choices=[MagicMock(delta=MagicMock(content=text))])
+            for text in ["```python\n", "result = 1\n", "```", "\nDone."]
+        ]
+        stream = MagicMock()
+        stream.__iter__.return_value = iter(chunks)
+        mock_create = client.return_value.chat.completions.create
+        mock_create.return_value = stream
+
+        llm = LocalLLM(
+            api_base="http://localhost:1234/v1", model="bamboo-llm", streaming=True
+        )
+        code = llm.generate_code(prompt, None)
+
+        assert code == "result = 1"
+        _, kwargs = mock_create.call_args
+        assert kwargs["stream"] is True
+        assert "streaming" not in kwargs
+        stream.close.assert_called_once()
+
+    def test_shares_the_client_of_a_server(self, client):
+        first = LocalLLM(api_base="http://localhost:1234/v1", model="a")
+        second = LocalLLM(api_base="http://localhost:1234/v1", model="b")
+        other = LocalLLM(api_base="http://localhost:5678/v1", model="a")
+
+        assert first.client is second.client
+        assert client.call_count == 2
+        assert other.client is not None
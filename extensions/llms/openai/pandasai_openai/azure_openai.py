@@ -33,6 +33,7 @@ class AzureOpenAI(BaseOpenAI):
     api_base: str
     """Legacy, for openai<1.0.0 support."""
     api_type: str = "azure"
+    _async_client_class = openai.AsyncAzureOpenAI
 
     def __init__(
         self,
@@ -113,9 +114,9 @@ class AzureOpenAI(BaseOpenAI):
         self._set_params(**kwargs)
         # set the client
         if self._is_chat_model:
-            self.client = openai.AzureOpenAI(**self._client_params).chat.completions
+            self.client = self._get_client(openai.AzureOpenAI).chat.completions
         else:
-            self.client = openai.AzureOpenAI(**self._client_params).completions
+            self.client = self._get_client(openai.AzureOpenAI).completions
 
     @property
     def _default_params(self) -> Dict[str, Any]:
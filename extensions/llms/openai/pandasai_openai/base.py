@@ -1,10 +1,21 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from pandasai.core.prompts.base import BasePrompt
-from pandasai.helpers.memory import Memory
+from pandasai.exceptions import NoCodeFoundError
+from pandasai.helpers.memory import Memory, get_prompt_memory
 from pandasai.llm.base import LLM
+from pandasai.llm.client_registry import client_registry
 
 if TYPE_CHECKING:
     from pandasai.agent.state import AgentState
@@ -39,13 +50,15 @@ class BaseOpenAI(LLM):
     http_client: Union[Any, None] = None
     client: Any
     _is_chat_model: bool
+    _async_client_class: Any = None
 
     def _set_params(self, **kwargs):
         """
         Set Parameters
         Args:
             **kwargs: ["model", "deployment_name", "temperature","max_tokens",
-            "top_p", "frequency_penalty", "presence_penalty", "stop", "seed"]
+            "top_p", "frequency_penalty", "presence_penalty", "stop", "seed",
+            "streaming", "http_client"]
 
         Returns:
             None.
@@ -62,6 +75,8 @@ class BaseOpenAI(LLM):
             "presence_penalty",
             "stop",
             "seed",
+            "streaming",
+            "http_client",
         ]
         for key, value in kwargs.items():
             if key in valid_params:
@@ -109,6 +124,68 @@ class BaseOpenAI(LLM):
             "http_client": self.http_client,
         }
 
+    @property
+    def _shared_client_params(self) -> Dict[str, Any]:
+        # The HTTP client is created by the registry
+        params = dict(self._client_params)
+        params.pop("http_client", None)
+        return params
+
+    def _get_client(self, client_class: type) -> Any:
+        """
+        Return the client of the SDK for the parameters of the LLM, shared with
+        the other LLMs with the same parameters unless an `http_client` is
+        given.
+        """
+        if self.http_client is not None:
+            return client_class(**self._client_params)
+
+        return client_registry.get(
+            client_class, proxy=self.openai_proxy, **self._shared_client_params
+        )
+
+    @property
+    def async_client(self) -> Any:
+        """
+        Async counterpart of `client`, sharing its connections with the other
+        LLMs with the same parameters in the running event loop.
+        """
+        client = client_registry.get_async(
+            self._async_client_class,
+            proxy=self.openai_proxy,
+            **self._shared_client_params,
+        )
+        return client.chat.completions if self._is_chat_model else client.completions
+
+    def _completion_params(self, prompt: str) -> Dict[str, Any]:
+        params = {**self._invocation_params, "prompt": prompt}
+
+        if self.stop is not None:
+            params["stop"] = [self.stop]
+
+        return params
+
+    def _chat_completion_params(self, value: str, memory: Memory) -> Dict[str, Any]:
+        messages = memory.to_openai_messages() if memory else []
+
+        # adding current prompt as latest query message
+        messages.append(
+            {
+                "role": "user",
+                "content": value,
+            },
+        )
+
+        params = {
+            **self._invocation_params,
+            "messages": messages,
+        }
+
+        if self.stop is not None:
+            params["stop"] = [self.stop]
+
+        return params
+
     def completion(self, prompt: str, memory: Memory) -> str:
         """
         Query the completion API
@@ -122,12 +199,7 @@ class BaseOpenAI(LLM):
         """
         prompt = self.prepend_system_prompt(prompt, memory)
 
-        params = {**self._invocation_params, "prompt": prompt}
-
-        if self.stop is not None:
-            params["stop"] = [self.stop]
-
-        response = self.client.create(**params)
+        response = self.client.create(**self._completion_params(prompt))
 
         self.last_prompt = prompt
 
@@ -144,23 +216,7 @@ class BaseOpenAI(LLM):
             str: LLM response.
 
         """
-        messages = memory.to_openai_messages() if memory else []
-
-        # adding current prompt as latest query message
-        messages.append(
-            {
-                "role": "user",
-                "content": value,
-            },
-        )
-
-        params = {
-            **self._invocation_params,
-            "messages": messages,
-        }
-
-        if self.stop is not None:
-            params["stop"] = [self.stop]
+        params = self._chat_completion_params(value, memory)
 
         response = self.client.create(**params)
 
@@ -182,10 +238,90 @@ class BaseOpenAI(LLM):
         """
         self.last_prompt = instruction.to_string()
 
-        memory = context.memory if context else None
+        memory = get_prompt_memory(context)
 
         return (
             self.chat_completion(self.last_prompt, memory)
             if self._is_chat_model
             else self.completion(self.last_prompt, memory)
         )
+
+    def generate_code_candidates(
+        self, instruction: BasePrompt, context: AgentState, n: int
+    ) -> Iterator[str]:
+        """
+        Generate several candidate codes in a single request, with the `n`
+        parameter of the API.
+
+        Args:
+            instruction (BasePrompt): A prompt object with instruction for LLM.
+            context (AgentState): context to pass.
+            n (int): Number of candidates.
+
+        Yields:
+            str: Python code of each candidate with valid code.
+        """
+        self.last_prompt = instruction.to_string()
+
+        memory = get_prompt_memory(context)
+
+        if self._is_chat_model:
+            params = self._chat_completion_params(self.last_prompt, memory)
+        else:
+            self.last_prompt = self.prepend_system_prompt(self.last_prompt, memory)
+            params = self._completion_params(self.last_prompt)
+
+        response = self.client.create(**{**params, "n": n})
+
+        error = None
+        generated = False
+        for choice in response.choices:
+            text = choice.message.content if self._is_chat_model else choice.text
+            try:
+                code = self._extract_code(text)
+            except NoCodeFoundError as e:
+                error = e
+                continue
+            generated = True
+            yield code
+
+        if not generated and error is not None:
+            raise error
+
+    def stream(
+        self, instruction: BasePrompt, context: AgentState = None
+    ) -> Iterator[str]:
+        """
+        Call the OpenAI LLM, yielding the response as it is generated.
+
+        Closing the iterator closes the connection, which stops the
+        generation.
+
+        Args:
+            instruction (BasePrompt): A prompt object with instruction for LLM.
+            context (AgentState): context to pass.
+
+        Yields:
+            str: Chunks of the response.
+        """
+        self.last_prompt = instruction.to_string()
+
+        memory = get_prompt_memory(context)
+
+        if self._is_chat_model:
+            params = self._chat_completion_params(self.last_prompt, memory)
+        else:
+            self.last_prompt = self.prepend_system_prompt(self.last_prompt, memory)
+            params = self._completion_params(self.last_prompt)
+
+        response = self.client.create(**params, stream=True)
+        try:
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                text = choice.delta.content if self._is_chat_model else choice.text
+                if text:
+                    yield text
+        finally:
+            response.close()
@@ -45,6 +45,7 @@ class OpenAI(BaseOpenAI):
     _supported_completion_models = ["gpt-3.5-turbo-instruct"]
 
     model: str = "gpt-4o-mini"
+    _async_client_class = openai.AsyncOpenAI
 
     def __init__(
         self,
@@ -76,10 +77,10 @@ class OpenAI(BaseOpenAI):
         model_name = self.model.split(":")[1] if "ft:" in self.model else self.model
         if model_name in self._supported_chat_models:
             self._is_chat_model = True
-            self.client = openai.OpenAI(**self._client_params).chat.completions
+            self.client = self._get_client(openai.OpenAI).chat.completions
         elif model_name in self._supported_completion_models:
             self._is_chat_model = False
-            self.client = openai.OpenAI(**self._client_params).completions
+            self.client = self._get_client(openai.OpenAI).completions
         else:
             raise UnsupportedModelError(self.model)
 
@@ -138,3 +138,65 @@ class TestOpenAILLM:
 
         result = openai.call(instruction=prompt)
         assert result == "response"
+
+    def test_stream_chat_model(self, mocker, prompt):
+        openai = OpenAI(api_token="test", model="gpt-4", streaming=True)
+        chunks = [
+            OpenAIObject({"choices": []}),
+            *(
+                OpenAIObject(
+                    {
+                        "choices": [
+                            OpenAIObject({"delta": OpenAIObject({"content": text})})
+                        ]
+                    }
+                )
+                for text in ["```python\n", "result = 1\n", "```", "\nDone."]
+            ),
+        ]
+        stream = mocker.MagicMock()
+        stream.__iter__.return_value = iter(chunks)
+        create = mocker.patch.object(openai.client, "create", return_value=stream)
+
+        assert openai.streaming is True
+        assert openai.generate_code(prompt, None) == "result = 1"
+        assert create.call_args.kwargs["stream"] is True
+        stream.close.assert_called_once()
+
+    def test_generate_code_candidates(self, mocker, prompt):
+        openai = OpenAI(api_token="test", model="gpt-4")
+        response = OpenAIObject(
+            {
+                "choices": [
+                    OpenAIObject({"message": OpenAIObject({"content": content})})
+                    for content in [
+                        "```python\nresult = 1\n```",
+                        "I cannot answer that.",
+                        "```python\nresult = 2\n```",
+                    ]
+                ]
+            }
+        )
+        create = mocker.patch.object(openai.client, "create", return_value=response)
+
+        candidates = list(openai.generate_code_candidates(prompt, None, 3))
+
+        assert candidates == ["result = 1", "result = 2"]
+        create.assert_called_once()
+        assert create.call_args.kwargs["n"] == 3
+
+    def test_shares_clients(self):
+        first = OpenAI(api_token="test", model="gpt-4o")
+        second = OpenAI(api_token="test", model="gpt-4o-mini")
+
+        assert first.client is second.client
+        assert OpenAI(api_token="other").client is not first.client
+
+    def test_custom_http_client_is_not_shared(self, mocker):
+        http_client = mocker.MagicMock()
+        openai_client = mocker.patch("openai.OpenAI")
+
+        OpenAI(api_token="test", http_client=http_client)
+        OpenAI(api_token="test", http_client=http_client)
+
+        assert openai_client.call_count == 2
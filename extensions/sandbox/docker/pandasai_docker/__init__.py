@@ -1,3 +1,4 @@
 from .docker_sandbox import DockerSandbox
+from .docker_sandbox_pool import DockerSandboxPool
 
-__all__ = ["DockerSandbox"]
+__all__ = ["DockerSandbox", "DockerSandboxPool"]
@@ -4,18 +4,22 @@ import os
 import re
 import subprocess
 import tarfile
-import uuid
-from typing import Optional
+from typing import Dict, Optional
 
 import docker
 
 from pandasai.sandbox import Sandbox
 
-from .serializer import ResponseSerializer
+from .serializer import ResponseSerializer, dataframe_to_arrow
+from .server_connection import SERVER_DIRECTORY, ServerConnection
 
 logger = logging.getLogger(__name__)
 
 
+class SandboxServerError(RuntimeError):
+    """Raised when the execution server of a container stops responding."""
+
+
 class DockerSandbox(Sandbox):
     def __init__(self, image_name="pandasai-sandbox", dockerfile_path=None):
         super().__init__()
@@ -30,9 +34,13 @@ class DockerSandbox(Sandbox):
         if not self._image_exists():
             self._build_image()
 
-        self._helper_code: str = self._read_start_code(
-            os.path.join(os.path.dirname(__file__), "serializer.py")
-        )
+        self._server_files: Dict[str, str] = {
+            filename: self._read_start_code(
+                os.path.join(os.path.dirname(__file__), filename)
+            )
+            for filename in ("server.py", "serializer.py")
+        }
+        self._servers: Dict[str, ServerConnection] = {}
 
     def _image_exists(self) -> bool:
         try:
@@ -68,29 +76,70 @@ class DockerSandbox(Sandbox):
 
     def start(self):
         if not self._started:
-            logger.info(
-                f"Starting a Docker container from the image '{self._image_name}'"
-            )
-            self._container = self._client.containers.run(
-                self._image_name,
-                command="sleep infinity",
-                network_disabled=True,
-                detach=True,
-                tty=True,
-            )
-            logger.info(
-                f"Started a Docker container with id '{self._container.id}' from the image '{self._image_name}'"
-            )
+            self._container = self._start_container()
             self._started = True
 
     def stop(self) -> None:
         if self._started and self._container:
-            logger.info(f"Stopping a Docker container with id '{self._container.id}''")
-            self._container.stop()
-            self._container.remove()
+            self._stop_container(self._container)
             self._container = None
             self._started = False
 
+    def _start_container(self) -> docker.models.containers.Container:
+        logger.info(f"Starting a Docker container from the image '{self._image_name}'")
+        container = self._client.containers.run(
+            self._image_name,
+            command="sleep infinity",
+            network_disabled=True,
+            detach=True,
+            tty=True,
+        )
+        logger.info(
+            f"Started a Docker container with id '{container.id}' from the image '{self._image_name}'"
+        )
+        return container
+
+    def _stop_container(self, container: docker.models.containers.Container) -> None:
+        logger.info(f"Stopping a Docker container with id '{container.id}'")
+        if server := self._servers.pop(container.id, None):
+            server.close()
+        container.stop()
+        container.remove()
+
+    def _get_server(
+        self, container: docker.models.containers.Container
+    ) -> ServerConnection:
+        """Return the execution server of a container, starting it if needed."""
+        server = self._servers.get(container.id)
+        if server is None or server.closed:
+            logger.info(f"Starting the execution server in container '{container.id}'")
+            self._put_files(container, self._server_files, SERVER_DIRECTORY)
+            server = ServerConnection(self._client, container)
+            self._servers[container.id] = server
+        return server
+
+    def _put_files(
+        self,
+        container: docker.models.containers.Container,
+        files: Dict[str, str],
+        directory: str,
+    ) -> None:
+        tar_stream = io.BytesIO()
+        with tarfile.open(fileobj=tar_stream, mode="w") as tar:
+            dir_info = tarfile.TarInfo(name=os.path.basename(directory))
+            dir_info.type = tarfile.DIRTYPE
+            dir_info.mode = 0o755
+            tar.addfile(dir_info)
+            for filename, content in files.items():
+                data = content.encode("utf-8")
+                file_info = tarfile.TarInfo(
+                    name=f"{os.path.basename(directory)}/{filename}"
+                )
+                file_info.size = len(data)
+                tar.addfile(file_info, io.BytesIO(data))
+        tar_stream.seek(0)
+        container.put_archive(os.path.dirname(directory), tar_stream)
+
     def _read_start_code(self, file_path: str) -> str:
         """Read helper start code from a file as a string.
 
@@ -116,8 +165,24 @@ class DockerSandbox(Sandbox):
         if not self._container:
             raise RuntimeError("Container is not running.")
 
-        sql_queries = self._extract_sql_queries_from_code(code)
+        return self._exec_code_in_container(self._container, code, environment)
+
+    def _exec_code_in_container(
+        self,
+        container: docker.models.containers.Container,
+        code: str,
+        environment: dict,
+    ) -> dict:
+        """Execute Python code in the given Docker container.
+
+        Args:
+            container (Container): Container to execute the code in.
+            code (str): Code to execute.
+            environment (dict): Environment variables to pass to the container.
 
+        Returns:
+            dict: Result of the code execution.
+        """
         # Temporary chart storage path
         chart_path = "/tmp/temp_chart.png"
         # actual chart path
@@ -133,79 +198,58 @@ class DockerSandbox(Sandbox):
             code,
         )
 
-        # Execute SQL queries, save the query results to CSV files
-        datasets_map = {}
-        for sql_query in sql_queries:
-            execute_sql_query_func = environment.get("execute_sql_query")
-            if execute_sql_query_func is None:
-                raise RuntimeError(
-                    "execute_sql_query function is not defined in the environment."
-                )
-
-            query_df = execute_sql_query_func(sql_query)
-            filename = f"{uuid.uuid4().hex}.csv"
-            # Pass the files to the container for further processing
-            self.transfer_file(query_df, filename=filename)
-            datasets_map[sql_query] = filename
-
-        # Add the datasets_map variable to the code
-        dataset_map = f"""
-datasets_map = {datasets_map}
-
-def execute_sql_query(sql_query):
-    filename = datasets_map[sql_query]
-    filepath = os.path.join("/tmp", filename)
-    return pd.read_csv(filepath)
-
-"""
-        # serialization code to get output from docker
-        end_code = """
-print(parser.serialize(result))
-"""
-        # Concatenate code and helper code
-        code = self._helper_code + dataset_map + code + end_code
-
         # Compile the code for errors
         self._compile_code(code)
 
-        # Replace double quotes with escaped double quotes for command line code arguments
-        code = code.replace('"', '\\"')
-
         logger.info(f"Submitting code to docker container {code}")
 
-        exit_code, output = self._container.exec_run(
-            cmd=f'python -c "{code}"', demux=True
-        )
+        try:
+            response = self._get_server(container).execute(
+                code, lambda query: self._run_sql_query(query, environment)
+            )
+        except EOFError as e:
+            raise SandboxServerError(f"Error executing code: {e}") from e
+
+        if response["status"] != "ok":
+            raise RuntimeError(f"Error executing code: {response['error']}")
 
-        if exit_code != 0:
-            raise RuntimeError(f"Error executing code: {output[1].decode()}")
+        return ResponseSerializer.deserialize(response["result"], original_chart_path)
 
-        response = output[0].decode()
-        return ResponseSerializer.deserialize(response, original_chart_path)
+    def _run_sql_query(self, query: str, environment: dict) -> bytes:
+        """Run a SQL query requested by the code running in the container.
+
+        Returns:
+            bytes: Result of the query encoded as an Arrow IPC file.
+        """
+        execute_sql_query_func = environment.get("execute_sql_query")
+        if execute_sql_query_func is None:
+            raise RuntimeError(
+                "execute_sql_query function is not defined in the environment."
+            )
+
+        return dataframe_to_arrow(execute_sql_query_func(query))
 
     def transfer_file(self, csv_data, filename="file.csv") -> None:
+        """Write a dataframe as a CSV file in the /tmp directory of the container.
+
+        Dataframes are not transferred to run the code, the code fetches the
+        results of its queries on demand.
+        """
         if not self._container:
             raise RuntimeError("Container is not running.")
 
-        # Convert the DataFrame to a CSV string
-        csv_string = csv_data.to_csv(index=False)
-
-        # Create a tar archive in memory
+        data = csv_data.to_csv(index=False).encode("utf-8")
         tar_stream = io.BytesIO()
         with tarfile.open(fileobj=tar_stream, mode="w") as tar:
-            # Add the CSV string as a file in the tar archive
-            csv_bytes = csv_string.encode("utf-8")
             tarinfo = tarfile.TarInfo(name=filename)
-            tarinfo.size = len(csv_bytes)
-            tar.addfile(tarinfo, io.BytesIO(csv_bytes))
-
-        # Seek to the beginning of the stream
+            tarinfo.size = len(data)
+            tar.addfile(tarinfo, io.BytesIO(data))
         tar_stream.seek(0)
-
-        # Transfer the tar archive to the container
         self._container.put_archive("/tmp", tar_stream)
 
     def __del__(self) -> None:
+        for server in getattr(self, "_servers", {}).values():
+            server.close()
         if self._container:
             self._container.stop()
             self._container.remove()
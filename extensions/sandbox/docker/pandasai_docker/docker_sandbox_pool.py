@@ -0,0 +1,182 @@
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import docker
+
+from .docker_sandbox import DockerSandbox, SandboxServerError
+
+logger = logging.getLogger(__name__)
+
+
+class PooledContainer:
+    """A container of the pool along with the number of executions it served."""
+
+    def __init__(self, container: docker.models.containers.Container):
+        self.container = container
+        self.executions = 0
+
+
+class DockerSandboxPool(DockerSandbox):
+    """Docker sandbox backed by a pool of pre-started containers.
+
+    Containers are started up front, checked out for a single execution at a
+    time and checked back in afterwards, so that concurrent executions run in
+    parallel across containers. A container is recycled when it fails its
+    health check, when its execution server or the Docker API fails during an
+    execution, or after serving `max_executions_per_container` executions.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 2,
+        max_executions_per_container: Optional[int] = 100,
+        checkout_timeout: Optional[float] = None,
+        image_name="pandasai-sandbox",
+        dockerfile_path=None,
+    ):
+        """
+        Args:
+            pool_size (int): Number of containers kept running.
+            max_executions_per_container (Optional[int]): Number of executions
+                after which a container is replaced. None disables recycling.
+            checkout_timeout (Optional[float]): Seconds to wait for an idle
+                container before giving up. None waits forever.
+            image_name (str): Name of the Docker image.
+            dockerfile_path (str): Path to the Dockerfile used to build the image.
+        """
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+
+        super().__init__(image_name=image_name, dockerfile_path=dockerfile_path)
+        self._pool_size = pool_size
+        self._max_executions_per_container = max_executions_per_container
+        self._checkout_timeout = checkout_timeout
+        self._pool: List[PooledContainer] = []
+        self._idle: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+
+            with ThreadPoolExecutor(max_workers=self._pool_size) as executor:
+                containers = list(
+                    executor.map(
+                        lambda _: self._start_container(), range(self._pool_size)
+                    )
+                )
+
+            for container in containers:
+                pooled = PooledContainer(container)
+                self._pool.append(pooled)
+                self._idle.put(pooled)
+            self._started = True
+
+    def stop(self) -> None:
+        with self._lock:
+            if not self._started:
+                return
+
+            for pooled in self._pool:
+                self._safe_stop_container(pooled.container)
+            self._pool = []
+            self._idle = queue.Queue()
+            self._started = False
+
+    @property
+    def size(self) -> int:
+        return len(self._pool)
+
+    def _safe_stop_container(self, container) -> None:
+        try:
+            self._stop_container(container)
+        except docker.errors.APIError as e:
+            logger.warning(f"Failed to stop container '{container.id}': {e}")
+
+    def _is_healthy(self, container) -> bool:
+        try:
+            container.reload()
+        except docker.errors.APIError:
+            return False
+        return container.status == "running"
+
+    def _recycle(self, pooled: PooledContainer) -> PooledContainer:
+        logger.info(f"Recycling Docker container with id '{pooled.container.id}'")
+        self._safe_stop_container(pooled.container)
+        new_pooled = PooledContainer(self._start_container())
+        with self._lock:
+            if pooled in self._pool:
+                self._pool.remove(pooled)
+            self._pool.append(new_pooled)
+        return new_pooled
+
+    def checkout(self) -> PooledContainer:
+        """Take a healthy container out of the pool.
+
+        Raises:
+            RuntimeError: If no container becomes available before the timeout.
+        """
+        try:
+            pooled = self._idle.get(timeout=self._checkout_timeout)
+        except queue.Empty:
+            raise RuntimeError("No sandbox container available.")
+
+        if not self._is_healthy(pooled.container):
+            try:
+                pooled = self._recycle(pooled)
+            except Exception:
+                self._idle.put(pooled)
+                raise
+        return pooled
+
+    def checkin(self, pooled: PooledContainer, failed: bool = False) -> None:
+        """Give a container back to the pool, recycling it if needed."""
+        pooled.executions += 1
+        exhausted = (
+            self._max_executions_per_container is not None
+            and pooled.executions >= self._max_executions_per_container
+        )
+        if failed or exhausted:
+            try:
+                pooled = self._recycle(pooled)
+            except Exception as e:
+                # Keep the slot, the health check will retry on next checkout
+                logger.error(f"Failed to recycle Docker container: {e}")
+        self._idle.put(pooled)
+
+    def _exec_code(self, code: str, environment: dict) -> dict:
+        """Execute Python code in an idle container of the pool.
+
+        Args:
+            code (str): Code to execute.
+            environment (dict): Environment variables to pass to the container.
+
+        Returns:
+            dict: Result of the code execution.
+        """
+        if not self._started:
+            raise RuntimeError("Container is not running.")
+
+        pooled = self.checkout()
+        failed = False
+        try:
+            return self._exec_code_in_container(pooled.container, code, environment)
+        except (SandboxServerError, docker.errors.APIError, OSError):
+            # Only a broken container is replaced, errors of the code itself
+            # leave it usable
+            failed = True
+            raise
+        finally:
+            self.checkin(pooled, failed=failed)
+
+    def __del__(self) -> None:
+        for pooled in getattr(self, "_pool", []):
+            try:
+                pooled.container.stop()
+                pooled.container.remove()
+            except Exception:
+                pass
@@ -1,20 +1,51 @@
 import base64
 import datetime
 import json
-import os  # important to import
-import tarfile  # important to import
 from json import JSONEncoder
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+
+ARROW_FORMAT = "arrow"
+
+
+def dataframe_to_arrow(df: pd.DataFrame, compression: str = "zstd") -> bytes:
+    """Encode a dataframe, dtypes and index included, as a compressed Arrow IPC file."""
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def dataframe_from_arrow(data: bytes) -> pd.DataFrame:
+    """Decode a dataframe encoded as an Arrow IPC file."""
+    return pa.ipc.open_file(data).read_all().to_pandas()
 
 
 class ResponseSerializer:
     @staticmethod
     def serialize_dataframe(df: pd.DataFrame) -> dict:
-        if df.empty:
-            return {"columns": [], "data": [], "index": []}
-        return df.to_dict(orient="split")
+        try:
+            data = dataframe_to_arrow(df)
+        except (pa.ArrowException, TypeError, ValueError):
+            # Mixed-type object columns can't be represented in Arrow
+            if df.empty:
+                return {"columns": [], "data": [], "index": []}
+            return df.to_dict(orient="split")
+        return {"format": ARROW_FORMAT, "data": base64.b64encode(data).decode()}
+
+    @staticmethod
+    def deserialize_dataframe(value: dict) -> pd.DataFrame:
+        if value.get("format") == ARROW_FORMAT:
+            return dataframe_from_arrow(base64.b64decode(value["data"]))
+        return pd.DataFrame(
+            data=value["data"],
+            index=value["index"],
+            columns=value["columns"],
+        )
 
     @staticmethod
     def serialize(result: dict) -> str:
@@ -34,12 +65,7 @@ class ResponseSerializer:
     def deserialize(response: str, chart_path: str = None) -> dict:
         result = json.loads(response)
         if result["type"] == "dataframe":
-            json_data = result["value"]
-            result["value"] = pd.DataFrame(
-                data=json_data["data"],
-                index=json_data["index"],
-                columns=json_data["columns"],
-            )
+            result["value"] = ResponseSerializer.deserialize_dataframe(result["value"])
 
         elif result["type"] == "plot" and chart_path:
             image_data = base64.b64decode(result["value"])
@@ -0,0 +1,116 @@
+"""Execution server running inside the sandbox container.
+
+The server is started once per container and keeps the interpreter and its
+imports warm between executions. Messages are JSON documents framed by a
+4-byte big-endian length prefix, exchanged over stdin and stdout.
+
+While a request is executing, every `execute_sql_query` call sends a
+"sql_query" message to the host and waits for its answer: a status message
+followed, on success, by a binary frame holding the result as an Arrow IPC
+file. Only the queries actually reached by the code are executed.
+"""
+
+import json
+import os
+import struct
+import sys
+import traceback
+
+try:
+    from serializer import ResponseSerializer, dataframe_from_arrow
+except ImportError:
+    from .serializer import ResponseSerializer, dataframe_from_arrow
+
+HEADER = struct.Struct(">I")
+
+
+def write_frame(stream, payload: bytes) -> None:
+    """Write a length-prefixed frame to a binary stream."""
+    stream.write(HEADER.pack(len(payload)) + payload)
+    stream.flush()
+
+
+def read_frame(stream) -> bytes:
+    """Read a length-prefixed frame from a binary stream.
+
+    Raises:
+        EOFError: If the stream is closed before a full frame is read.
+    """
+    header = _read_exactly(stream, HEADER.size)
+    (size,) = HEADER.unpack(header)
+    return _read_exactly(stream, size)
+
+
+def _read_exactly(stream, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            raise EOFError("Stream closed while reading a frame")
+        data += chunk
+    return data
+
+
+def send_message(stream, message: dict) -> None:
+    write_frame(stream, json.dumps(message).encode("utf-8"))
+
+
+def receive_message(stream) -> dict:
+    return json.loads(read_frame(stream).decode("utf-8"))
+
+
+def serve(stdin, stdout) -> None:
+    """Serve execution requests until stdin is closed."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+    import matplotlib.pyplot as plt
+    import numpy as np
+    import pandas as pd
+
+    def execute_sql_query(sql_query: str) -> pd.DataFrame:
+        send_message(stdout, {"type": "sql_query", "query": sql_query})
+        reply = receive_message(stdin)
+        if reply["status"] != "ok":
+            raise RuntimeError(reply["error"])
+        return dataframe_from_arrow(read_frame(stdin))
+
+    while True:
+        try:
+            request = receive_message(stdin)
+        except EOFError:
+            break
+
+        environment = {
+            "pd": pd,
+            "np": np,
+            "plt": plt,
+            "os": os,
+            "execute_sql_query": execute_sql_query,
+        }
+
+        try:
+            exec(request["code"], environment)
+            response = {
+                "type": "response",
+                "status": "ok",
+                "result": ResponseSerializer.serialize(environment["result"]),
+            }
+        except BaseException:
+            response = {
+                "type": "response",
+                "status": "error",
+                "error": traceback.format_exc(),
+            }
+        finally:
+            plt.close("all")
+
+        send_message(stdout, response)
+
+
+if __name__ == "__main__":
+    protocol_out = sys.stdout.buffer
+    # Anything printed by the executed code must not corrupt the protocol
+    sys.stdout = sys.stderr
+    serve(sys.stdin.buffer, protocol_out)
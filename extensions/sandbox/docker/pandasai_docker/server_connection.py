@@ -0,0 +1,104 @@
+import threading
+from typing import Callable
+
+import docker
+from docker.utils.socket import STDOUT, frames_iter
+
+from .server import receive_message, send_message, write_frame
+
+SERVER_DIRECTORY = "/tmp/pandasai"
+
+
+class ServerConnection:
+    """Connection to the execution server running inside a container.
+
+    The server is started with `docker exec` and the attached socket is used
+    as a duplex channel: requests are written to the server stdin and
+    responses are read back from its multiplexed stdout.
+    """
+
+    def __init__(
+        self,
+        client: docker.DockerClient,
+        container: docker.models.containers.Container,
+    ):
+        exec_id = client.api.exec_create(
+            container.id,
+            cmd=["python", "-u", f"{SERVER_DIRECTORY}/server.py"],
+            stdin=True,
+            stdout=True,
+            stderr=False,
+            tty=False,
+            workdir=SERVER_DIRECTORY,
+        )["Id"]
+        self._socket = client.api.exec_start(exec_id, socket=True)
+        self._frames = frames_iter(self._socket, tty=False)
+        self._buffer = b""
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def read(self, size: int) -> bytes:
+        while not self._buffer:
+            try:
+                stream, data = next(self._frames)
+            except StopIteration:
+                return b""
+            if stream == STDOUT:
+                self._buffer = data
+
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def write(self, data: bytes) -> None:
+        getattr(self._socket, "_sock", self._socket).sendall(data)
+
+    def flush(self) -> None:
+        pass
+
+    def execute(self, code: str, query_handler: Callable[[str], bytes]) -> dict:
+        """Send an execution request and wait for its response.
+
+        SQL queries issued by the code while it runs are answered on demand
+        with `query_handler`.
+
+        Args:
+            code (str): Code to execute.
+            query_handler (Callable[[str], bytes]): Runs a SQL query and returns
+                its result encoded as an Arrow IPC file.
+
+        Returns:
+            dict: Response of the server, with either a serialized "result"
+            or an "error" traceback depending on its "status".
+
+        Raises:
+            EOFError: If the server exited before answering.
+        """
+        with self._lock:
+            try:
+                send_message(self, {"code": code})
+                while True:
+                    message = receive_message(self)
+                    if message.get("type") != "sql_query":
+                        return message
+                    self._answer_query(message["query"], query_handler)
+            except (EOFError, OSError):
+                self.close()
+                raise EOFError("The sandbox execution server exited unexpectedly")
+
+    def _answer_query(self, query: str, query_handler: Callable[[str], bytes]):
+        try:
+            payload = query_handler(query)
+        except Exception as e:
+            send_message(self, {"status": "error", "error": str(e)})
+            return
+
+        send_message(self, {"status": "ok"})
+        write_frame(self, payload)
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            try:
+                self._socket.close()
+            except OSError:
+                pass
@@ -1,10 +1,11 @@
 import unittest
 from io import BytesIO
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import MagicMock, patch
 
 import pandas as pd
 from docker.errors import ImageNotFound
 from pandasai_docker import DockerSandbox
+from pandasai_docker.serializer import ResponseSerializer, dataframe_from_arrow
 
 
 class TestDockerSandbox(unittest.TestCase):
@@ -12,6 +13,30 @@ class TestDockerSandbox(unittest.TestCase):
         self.image_name = "test_image"
         self.dfs = [MagicMock()]
 
+    @staticmethod
+    def _fake_server():
+        """Server running the code in process, fetching query results on demand."""
+
+        def execute(code, query_handler):
+            environment = {
+                "execute_sql_query": lambda query: dataframe_from_arrow(
+                    query_handler(query)
+                )
+            }
+            try:
+                exec(code, environment)
+            except Exception as e:
+                return {"type": "response", "status": "error", "error": str(e)}
+            return {
+                "type": "response",
+                "status": "ok",
+                "result": ResponseSerializer.serialize(environment["result"]),
+            }
+
+        server = MagicMock()
+        server.execute.side_effect = execute
+        return server
+
     @patch("pandasai_docker.docker_sandbox.docker.from_env")
     def test_destructor(self, mock_docker):
         sandbox = DockerSandbox(image_name=self.image_name)
@@ -98,15 +123,40 @@ result = execute_sql_query(sql_query)
 
         mock_container.put_archive.assert_called()
 
+    @patch("pandasai_docker.docker_sandbox.docker.from_env")
+    def test_exec_code_runs_only_reached_queries(self, mock_docker):
+        sandbox = DockerSandbox(image_name=self.image_name)
+        sandbox._get_server = MagicMock(return_value=self._fake_server())
+        sandbox._container = mock_docker.return_value.containers.run.return_value
+        mock_execute_sql_func = MagicMock(return_value=pd.DataFrame({"x": [1]}))
+        env = {"execute_sql_query": mock_execute_sql_func}
+
+        code = """
+df = execute_sql_query('SELECT * FROM a')
+if df.empty:
+    execute_sql_query('SELECT * FROM never_reached')
+table = 't_' + str(len(df) + 1)
+execute_sql_query(f'SELECT * FROM {table}')
+result = {'type': 'number', 'value': 1}
+"""
+        sandbox._exec_code(code, env)
+
+        self.assertEqual(
+            [c.args[0] for c in mock_execute_sql_func.call_args_list],
+            ["SELECT * FROM a", "SELECT * FROM t_2"],
+        )
+
     @patch("pandasai_docker.docker_sandbox.docker.from_env")
     def test_exec_code(self, mock_docker):
         sandbox = DockerSandbox(image_name=self.image_name)
         mock_client = mock_docker.return_value
         mock_container = mock_client.containers.run.return_value
-        mock_container.exec_run.return_value = (
-            0,
-            (b'{"type": "number", "value": 42}', b""),
-        )
+        mock_server = MagicMock()
+        mock_server.execute.return_value = {
+            "status": "ok",
+            "result": '{"type": "number", "value": 42}',
+        }
+        sandbox._get_server = MagicMock(return_value=mock_server)
         sandbox._container = mock_container
 
         mock_execute_sql_func = MagicMock()
@@ -115,27 +165,68 @@ result = execute_sql_query(sql_query)
         code = 'result = {"type": "number", "value": 42}'
         result = sandbox._exec_code(code, env)
         self.assertEqual(result, {"type": "number", "value": 42})
+        mock_server.execute.assert_called_once()
+        self.assertEqual(mock_server.execute.call_args[0][0], code)
+        mock_execute_sql_func.assert_not_called()
+
+    @patch("pandasai_docker.docker_sandbox.docker.from_env")
+    def test_exec_code_raises_on_error_response(self, mock_docker):
+        sandbox = DockerSandbox(image_name=self.image_name)
+        mock_server = MagicMock()
+        mock_server.execute.return_value = {
+            "status": "error",
+            "error": "ZeroDivisionError: division by zero",
+        }
+        sandbox._get_server = MagicMock(return_value=mock_server)
+        sandbox._container = mock_docker.return_value.containers.run.return_value
+
+        with self.assertRaises(RuntimeError) as context:
+            sandbox._exec_code("result = 1 / 0", {})
+        self.assertIn("ZeroDivisionError", str(context.exception))
 
     @patch("pandasai_docker.docker_sandbox.docker.from_env")
-    @patch("pandasai_docker.docker_sandbox.DockerSandbox.transfer_file")
-    def test_exec_code_with_sql_queries(self, mock_transfer_file, mock_docker):
+    def test_exec_code_raises_when_server_exits(self, mock_docker):
+        sandbox = DockerSandbox(image_name=self.image_name)
+        mock_server = MagicMock()
+        mock_server.execute.side_effect = EOFError("server exited")
+        sandbox._get_server = MagicMock(return_value=mock_server)
+        sandbox._container = mock_docker.return_value.containers.run.return_value
+
+        with self.assertRaises(RuntimeError):
+            sandbox._exec_code("raise SystemExit", {})
+
+    @patch("pandasai_docker.docker_sandbox.docker.from_env")
+    @patch("pandasai_docker.docker_sandbox.ServerConnection")
+    def test_get_server_starts_server_once(self, mock_connection, mock_docker):
+        sandbox = DockerSandbox(image_name=self.image_name)
+        mock_container = mock_docker.return_value.containers.run.return_value
+        mock_connection.return_value.closed = False
+
+        server = sandbox._get_server(mock_container)
+        self.assertIs(sandbox._get_server(mock_container), server)
+
+        mock_connection.assert_called_once_with(sandbox._client, mock_container)
+        mock_container.put_archive.assert_called_once()
+        self.assertEqual(mock_container.put_archive.call_args[0][0], "/tmp")
+
+    @patch("pandasai_docker.docker_sandbox.docker.from_env")
+    def test_exec_code_with_sql_queries(self, mock_docker):
         sandbox = DockerSandbox(image_name=self.image_name)
         mock_client = mock_docker.return_value
         mock_container = mock_client.containers.run.return_value
-        mock_container.exec_run.return_value = (
-            0,
-            (b'{"type": "number", "value": 42}', b""),
-        )
+        sandbox._get_server = MagicMock(return_value=self._fake_server())
         sandbox._container = mock_container
 
         # Mock SQL execution
-        mock_execute_sql_func = MagicMock()
+        mock_execute_sql_func = MagicMock(
+            return_value=pd.DataFrame({"total_artists": [42]})
+        )
         env = {"execute_sql_query": mock_execute_sql_func}
 
         code = """
 sql_query = 'SELECT COUNT(DISTINCT Artist) AS total_artists FROM artists'
 total_artists_df = execute_sql_query(sql_query)
-total_artists = total_artists_df['total_artists'].iloc[0]
+total_artists = int(total_artists_df['total_artists'].iloc[0])
 result = {'type': 'number', 'value': total_artists}
         """
         result = sandbox._exec_code(code, env)
@@ -145,17 +236,11 @@ result = {'type': 'number', 'value': total_artists}
         )
 
     @patch("pandasai_docker.docker_sandbox.docker.from_env")
-    @patch("pandasai_docker.docker_sandbox.DockerSandbox.transfer_file")
-    def test_exec_code_with_sql_queries_raise_no_env(
-        self, mock_transfer_file, mock_docker
-    ):
+    def test_exec_code_with_sql_queries_raise_no_env(self, mock_docker):
         sandbox = DockerSandbox(image_name=self.image_name)
         mock_client = mock_docker.return_value
         mock_container = mock_client.containers.run.return_value
-        mock_container.exec_run.return_value = (
-            0,
-            (b'{"type": "number", "value": 42}', b""),
-        )
+        sandbox._get_server = MagicMock(return_value=self._fake_server())
         sandbox._container = mock_container
 
         # Mock SQL execution
@@ -171,18 +256,17 @@ result = {'type': 'number', 'value': total_artists}
             sandbox._exec_code(code, env)
 
     @patch("pandasai_docker.docker_sandbox.docker.from_env")
-    @patch("pandasai_docker.docker_sandbox.DockerSandbox.transfer_file")
     @patch("pandasai_docker.docker_sandbox.ResponseSerializer.deserialize")
-    def test_exec_code_with_sql_queries_with_plot(
-        self, mock_deserialize, mock_transfer_file, mock_docker
-    ):
+    def test_exec_code_with_sql_queries_with_plot(self, mock_deserialize, mock_docker):
         sandbox = DockerSandbox(image_name=self.image_name)
         mock_client = mock_docker.return_value
         mock_container = mock_client.containers.run.return_value
-        mock_container.exec_run.return_value = (
-            0,
-            (b'{"type": "plot", "value": "base64img"}', b""),
-        )
+        mock_server = MagicMock()
+        mock_server.execute.return_value = {
+            "status": "ok",
+            "result": '{"type": "plot", "value": "base64img"}',
+        }
+        sandbox._get_server = MagicMock(return_value=mock_server)
         sandbox._container = mock_container
 
         # Mock SQL execution
@@ -217,21 +301,19 @@ result = {'type': 'plot', 'value': '/exports/charts/temp_chart.png'}
         )
 
     @patch("pandasai_docker.docker_sandbox.docker.from_env")
-    @patch("pandasai_docker.docker_sandbox.DockerSandbox.transfer_file")
     @patch("pandasai_docker.docker_sandbox.ResponseSerializer.deserialize")
     def test_exec_code_with_sql_queries_with_dataframe(
-        self, mock_deserialize, mock_transfer_file, mock_docker
+        self, mock_deserialize, mock_docker
     ):
         sandbox = DockerSandbox(image_name=self.image_name)
         mock_client = mock_docker.return_value
         mock_container = mock_client.containers.run.return_value
-        mock_container.exec_run.return_value = (
-            0,
-            (
-                b'{"type": "dataframe", "value": {"columns": [], "data": [], "index": []}}',
-                b"",
-            ),
-        )
+        mock_server = MagicMock()
+        mock_server.execute.return_value = {
+            "status": "ok",
+            "result": '{"type": "dataframe", "value": {"columns": [], "data": [], "index": []}}',
+        }
+        sandbox._get_server = MagicMock(return_value=mock_server)
         sandbox._container = mock_container
 
         # Mock SQL execution
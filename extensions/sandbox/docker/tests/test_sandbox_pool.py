@@ -0,0 +1,198 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from docker.errors import NotFound
+from pandasai_docker import DockerSandboxPool
+from pandasai_docker.docker_sandbox import SandboxServerError
+
+
+class FakeContainer:
+    def __init__(self, container_id, delay=0.0):
+        self.id = container_id
+        self.status = "running"
+        self.delay = delay
+        self.exec_calls = 0
+        self.stopped = False
+        self.removed = False
+
+    def reload(self):
+        if self.removed:
+            raise NotFound("container removed")
+
+    def put_archive(self, path, data):
+        return True
+
+    def stop(self):
+        self.stopped = True
+        self.status = "exited"
+
+    def remove(self):
+        self.removed = True
+
+
+class FakeServer:
+    def __init__(self, client, container):
+        self.container = container
+        self.closed = False
+
+    def execute(self, code, query_handler):
+        self.container.exec_calls += 1
+        time.sleep(self.container.delay)
+        if "crash" in code:
+            raise EOFError("The sandbox execution server exited unexpectedly")
+        if "fail" in code:
+            return {"status": "error", "error": "Traceback: boom"}
+        return {"status": "ok", "result": '{"type": "number", "value": 42}'}
+
+    def close(self):
+        self.closed = True
+
+
+class FakeContainers:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.started = []
+
+    def run(self, image_name, **kwargs):
+        container = FakeContainer(f"container-{len(self.started)}", self.delay)
+        self.started.append(container)
+        return container
+
+
+class FakeDockerClient:
+    def __init__(self, delay=0.0):
+        self.containers = FakeContainers(delay)
+        self.images = MagicMock()
+
+
+class TestDockerSandboxPool(unittest.TestCase):
+    def _create_pool(self, delay=0.0, **kwargs):
+        client = FakeDockerClient(delay)
+        with patch(
+            "pandasai_docker.docker_sandbox.docker.from_env", return_value=client
+        ):
+            pool = DockerSandboxPool(image_name="test_image", **kwargs)
+
+        server_patcher = patch(
+            "pandasai_docker.docker_sandbox.ServerConnection", FakeServer
+        )
+        server_patcher.start()
+        self.addCleanup(server_patcher.stop)
+        return pool, client
+
+    def test_invalid_pool_size(self):
+        with self.assertRaises(ValueError):
+            self._create_pool(pool_size=0)
+
+    def test_start_prestarts_containers(self):
+        pool, client = self._create_pool(pool_size=3)
+        pool.start()
+
+        self.assertEqual(pool.size, 3)
+        self.assertEqual(len(client.containers.started), 3)
+        self.assertEqual(pool._idle.qsize(), 3)
+
+        pool.stop()
+        self.assertEqual(pool.size, 0)
+        self.assertTrue(all(c.removed for c in client.containers.started))
+
+    def test_execute_checks_out_and_in(self):
+        pool, client = self._create_pool(pool_size=1)
+
+        result = pool.execute('result = {"type": "number", "value": 42}', {})
+
+        self.assertEqual(result, {"type": "number", "value": 42})
+        self.assertEqual(pool._idle.qsize(), 1)
+        self.assertEqual(pool._pool[0].executions, 1)
+        pool.stop()
+
+    def test_recycles_after_max_executions(self):
+        pool, client = self._create_pool(pool_size=1, max_executions_per_container=2)
+        pool.start()
+        code = 'result = {"type": "number", "value": 42}'
+
+        pool.execute(code, {})
+        self.assertEqual(len(client.containers.started), 1)
+        pool.execute(code, {})
+
+        self.assertEqual(len(client.containers.started), 2)
+        self.assertTrue(client.containers.started[0].removed)
+        self.assertEqual(pool._pool[0].container.id, "container-1")
+        self.assertEqual(pool._pool[0].executions, 0)
+        pool.stop()
+
+    def test_keeps_the_container_on_code_errors(self):
+        pool, client = self._create_pool(pool_size=1)
+        pool.start()
+
+        with self.assertRaises(RuntimeError):
+            pool.execute('result = "fail"', {})
+        with self.assertRaises(SyntaxError):
+            pool.execute("result = (", {})
+
+        self.assertEqual(len(client.containers.started), 1)
+        self.assertEqual(pool._idle.qsize(), 1)
+        pool.stop()
+
+    def test_recycles_on_server_failure(self):
+        pool, client = self._create_pool(pool_size=1)
+        pool.start()
+
+        with self.assertRaises(SandboxServerError):
+            pool.execute('result = "crash"', {})
+
+        self.assertEqual(len(client.containers.started), 2)
+        self.assertTrue(client.containers.started[0].removed)
+        self.assertEqual(pool._idle.qsize(), 1)
+        self.assertNotIn("container-0", pool._servers)
+        pool.stop()
+
+    def test_recycles_unhealthy_container_on_checkout(self):
+        pool, client = self._create_pool(pool_size=1)
+        pool.start()
+        client.containers.started[0].status = "exited"
+
+        result = pool.execute('result = {"type": "number", "value": 42}', {})
+
+        self.assertEqual(result["value"], 42)
+        self.assertEqual(client.containers.started[0].exec_calls, 0)
+        self.assertEqual(client.containers.started[1].exec_calls, 1)
+        pool.stop()
+
+    def test_checkout_timeout(self):
+        pool, client = self._create_pool(pool_size=1, checkout_timeout=0.01)
+        pool.start()
+        pooled = pool.checkout()
+
+        with self.assertRaises(RuntimeError):
+            pool.checkout()
+
+        pool.checkin(pooled)
+        pool.stop()
+
+    def test_concurrent_executions_use_all_containers(self):
+        pool, client = self._create_pool(delay=0.2, pool_size=3)
+        pool.start()
+        results = []
+
+        def run():
+            results.append(pool.execute('result = {"type": "number", "value": 42}', {}))
+
+        threads = [threading.Thread(target=run) for _ in range(3)]
+        started_at = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started_at
+
+        self.assertEqual(len(results), 3)
+        self.assertLess(elapsed, 0.5)
+        self.assertTrue(all(c.exec_calls == 1 for c in client.containers.started))
+        pool.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,20 +7,53 @@ from unittest.mock import mock_open, patch
 
 import numpy as np
 import pandas as pd
-from pandasai_docker.serializer import CustomEncoder, ResponseSerializer
+from pandasai_docker.serializer import (
+    CustomEncoder,
+    ResponseSerializer,
+    dataframe_from_arrow,
+    dataframe_to_arrow,
+)
 
 
 class TestResponseSerializer(unittest.TestCase):
     def test_serialize_dataframe_empty(self):
         df = pd.DataFrame()
         result = ResponseSerializer.serialize_dataframe(df)
-        self.assertEqual(result, {"columns": [], "data": [], "index": []})
+        self.assertEqual(result["format"], "arrow")
+        self.assertTrue(ResponseSerializer.deserialize_dataframe(result).empty)
 
     def test_serialize_dataframe_non_empty(self):
         df = pd.DataFrame({"A": [1, 2], "B": [3, 4]})
         result = ResponseSerializer.serialize_dataframe(df)
-        expected = {"columns": ["A", "B"], "data": [[1, 3], [2, 4]], "index": [0, 1]}
-        self.assertEqual(result, expected)
+        self.assertEqual(result["format"], "arrow")
+        pd.testing.assert_frame_equal(
+            ResponseSerializer.deserialize_dataframe(result), df
+        )
+
+    def test_serialize_dataframe_preserves_dtypes_and_index(self):
+        df = pd.DataFrame(
+            {
+                "when": pd.to_datetime(["2024-01-01", "2024-02-01"]),
+                "category": pd.Categorical(["a", "b"]),
+                "amount": [1.5, None],
+            },
+            index=pd.Index([10, 20], name="id"),
+        )
+        result = ResponseSerializer.serialize_dataframe(df)
+        pd.testing.assert_frame_equal(
+            ResponseSerializer.deserialize_dataframe(result), df
+        )
+
+    def test_serialize_dataframe_falls_back_to_split_for_mixed_types(self):
+        df = pd.DataFrame({"A": [1, "a"]})
+        result = ResponseSerializer.serialize_dataframe(df)
+        self.assertEqual(
+            result, {"columns": ["A"], "data": [[1], ["a"]], "index": [0, 1]}
+        )
+
+    def test_dataframe_arrow_round_trip(self):
+        df = pd.DataFrame({"A": [1, 2]})
+        pd.testing.assert_frame_equal(dataframe_from_arrow(dataframe_to_arrow(df)), df)
 
     @patch("builtins.open", new_callable=mock_open, read_data=b"image_data")
     @patch("base64.b64encode", return_value=b"encoded_image")
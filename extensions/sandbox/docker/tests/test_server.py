@@ -0,0 +1,125 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import pandas as pd
+from pandasai_docker import server
+from pandasai_docker.serializer import dataframe_to_arrow
+from pandasai_docker.server import (
+    read_frame,
+    receive_message,
+    send_message,
+    write_frame,
+)
+
+SERVER_PATH = os.path.join(os.path.dirname(server.__file__), "server.py")
+
+
+class TestFraming(unittest.TestCase):
+    def test_frame_round_trip(self):
+        stream = io.BytesIO()
+        write_frame(stream, b"hello")
+        write_frame(stream, b"")
+        stream.seek(0)
+
+        self.assertEqual(read_frame(stream), b"hello")
+        self.assertEqual(read_frame(stream), b"")
+
+    def test_read_frame_raises_on_truncated_stream(self):
+        stream = io.BytesIO(b"\x00\x00\x00\x05abc")
+        with self.assertRaises(EOFError):
+            read_frame(stream)
+
+    def test_message_round_trip(self):
+        stream = io.BytesIO()
+        send_message(stream, {"code": "result = 1"})
+        stream.seek(0)
+        self.assertEqual(receive_message(stream), {"code": "result = 1"})
+
+
+class TestServerProcess(unittest.TestCase):
+    def setUp(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", SERVER_PATH],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=os.path.dirname(SERVER_PATH),
+        )
+
+    def tearDown(self):
+        self.process.stdin.close()
+        self.process.wait(timeout=10)
+        self.process.stdout.close()
+
+    def _execute(self, code, tables=None):
+        """Send code and answer its SQL queries with the given tables."""
+        send_message(self.process.stdin, {"code": code})
+        while True:
+            message = receive_message(self.process.stdout)
+            if message["type"] != "sql_query":
+                return message
+
+            table = (tables or {}).get(message["query"])
+            if table is None:
+                send_message(
+                    self.process.stdin, {"status": "error", "error": "Unknown table"}
+                )
+            else:
+                send_message(self.process.stdin, {"status": "ok"})
+                write_frame(self.process.stdin, dataframe_to_arrow(table))
+
+    def test_serves_multiple_requests_in_the_same_interpreter(self):
+        first = self._execute(
+            "import os\n"
+            "pid = os.getpid()\n"
+            "print('ignored output')\n"
+            "result = {'type': 'number', 'value': pid}"
+        )
+        second = self._execute(
+            "import os\nresult = {'type': 'number', 'value': os.getpid()}"
+        )
+
+        self.assertEqual(first["type"], "response")
+        self.assertEqual(first["status"], "ok")
+        self.assertEqual(
+            json.loads(first["result"])["value"], json.loads(second["result"])["value"]
+        )
+
+    def test_returns_errors_and_keeps_serving(self):
+        error = self._execute("result = 1 / 0")
+        self.assertEqual(error["status"], "error")
+        self.assertIn("ZeroDivisionError", error["error"])
+
+        response = self._execute("result = {'type': 'string', 'value': 'ok'}")
+        self.assertEqual(json.loads(response["result"])["value"], "ok")
+
+    def test_fetches_query_results_on_demand(self):
+        tables = {
+            "SELECT * FROM a": pd.DataFrame({"x": [1, 2, 3]}),
+            "SELECT * FROM b_3": pd.DataFrame({"x": [10]}),
+        }
+        response = self._execute(
+            "df = execute_sql_query('SELECT * FROM a')\n"
+            "other = execute_sql_query(f'SELECT * FROM b_{len(df)}')\n"
+            "result = {'type': 'number', 'value': int(df.x.sum() + other.x.sum())}",
+            tables,
+        )
+
+        self.assertEqual(response["status"], "ok")
+        self.assertEqual(json.loads(response["result"])["value"], 16)
+
+    def test_query_errors_are_raised_in_the_executed_code(self):
+        response = self._execute("df = execute_sql_query('SELECT * FROM missing')")
+
+        self.assertEqual(response["status"], "error")
+        self.assertIn("Unknown table", response["error"])
+
+        response = self._execute("result = {'type': 'string', 'value': 'ok'}")
+        self.assertEqual(json.loads(response["result"])["value"], "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
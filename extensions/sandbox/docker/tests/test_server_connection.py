@@ -0,0 +1,103 @@
+import io
+import socket
+import struct
+import unittest
+from unittest.mock import MagicMock
+
+from pandasai_docker.server import read_frame, receive_message, send_message
+from pandasai_docker.server_connection import ServerConnection
+
+
+def docker_frame(stream_type: int, data: bytes) -> bytes:
+    return struct.pack(">BxxxL", stream_type, len(data)) + data
+
+
+class TestServerConnection(unittest.TestCase):
+    def setUp(self):
+        self.host_socket, self.container_socket = socket.socketpair()
+        self.client = MagicMock()
+        self.client.api.exec_create.return_value = {"Id": "exec-id"}
+        self.client.api.exec_start.return_value = self.host_socket
+        self.container = MagicMock(id="container-id")
+
+    def tearDown(self):
+        self.host_socket.close()
+        self.container_socket.close()
+
+    def test_starts_server_with_docker_exec(self):
+        ServerConnection(self.client, self.container)
+
+        args, kwargs = self.client.api.exec_create.call_args
+        self.assertEqual(args[0], "container-id")
+        self.assertTrue(kwargs["stdin"])
+        self.assertFalse(kwargs["tty"])
+        self.client.api.exec_start.assert_called_once_with("exec-id", socket=True)
+
+    def test_execute_round_trip_over_multiplexed_stream(self):
+        connection = ServerConnection(self.client, self.container)
+
+        response = io.BytesIO()
+        send_message(response, {"status": "ok", "result": "{}"})
+        payload = response.getvalue()
+        # Split the response across several docker frames and interleave stderr
+        self.container_socket.sendall(
+            docker_frame(1, payload[:3])
+            + docker_frame(2, b"warning")
+            + docker_frame(1, payload[3:])
+        )
+
+        result = connection.execute("result = 1", MagicMock())
+
+        self.assertEqual(result, {"status": "ok", "result": "{}"})
+        request = receive_message(self.container_socket.makefile("rb"))
+        self.assertEqual(request, {"code": "result = 1"})
+
+    def _send_from_container(self, *messages):
+        stream = io.BytesIO()
+        for message in messages:
+            send_message(stream, message)
+        self.container_socket.sendall(docker_frame(1, stream.getvalue()))
+
+    def test_execute_answers_sql_queries(self):
+        connection = ServerConnection(self.client, self.container)
+        self._send_from_container(
+            {"type": "sql_query", "query": "SELECT 1"},
+            {"type": "response", "status": "ok", "result": "{}"},
+        )
+        query_handler = MagicMock(return_value=b"arrow-data")
+
+        result = connection.execute("result = 1", query_handler)
+
+        self.assertEqual(result["status"], "ok")
+        query_handler.assert_called_once_with("SELECT 1")
+        container_input = self.container_socket.makefile("rb")
+        self.assertEqual(receive_message(container_input), {"code": "result = 1"})
+        self.assertEqual(receive_message(container_input), {"status": "ok"})
+        self.assertEqual(read_frame(container_input), b"arrow-data")
+
+    def test_execute_forwards_sql_query_errors(self):
+        connection = ServerConnection(self.client, self.container)
+        self._send_from_container(
+            {"type": "sql_query", "query": "SELECT 1"},
+            {"type": "response", "status": "error", "error": "boom"},
+        )
+
+        connection.execute("result = 1", MagicMock(side_effect=ValueError("boom")))
+
+        container_input = self.container_socket.makefile("rb")
+        receive_message(container_input)
+        self.assertEqual(
+            receive_message(container_input), {"status": "error", "error": "boom"}
+        )
+
+    def test_execute_raises_eof_when_server_exits(self):
+        connection = ServerConnection(self.client, self.container)
+        self.container_socket.close()
+
+        with self.assertRaises(EOFError):
+            connection.execute("result = 1", MagicMock())
+        self.assertTrue(connection.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,54 +3,115 @@
 PandaAI is a wrapper around a LLM to make dataframes conversational
 """
 
+import importlib
 import os
-from io import BytesIO
-from typing import List, Optional, Union
-from zipfile import ZipFile
-
-import pandas as pd
-
-from pandasai.config import APIKeyManager, ConfigManager
-from pandasai.constants import DEFAULT_API_URL
-from pandasai.data_loader.semantic_layer_schema import (
-    Column,
-    Relation,
-    SemanticLayerSchema,
-    Source,
-)
-from pandasai.exceptions import DatasetNotFound, InvalidConfigError, PandaAIApiKeyError
-from pandasai.helpers.path import (
-    find_project_root,
-    get_validated_dataset_path,
-    transform_dash_to_underscore,
-)
-from pandasai.helpers.session import get_pandaai_session
-from pandasai.query_builders import SqlQueryBuilder
-from pandasai.sandbox.sandbox import Sandbox
-
-from .agent import Agent
-from .constants import LOCAL_SOURCE_TYPES, SQL_SOURCE_TYPES
-from .core.cache import Cache
-from .data_loader.loader import DatasetLoader
-from .data_loader.semantic_layer_schema import (
-    Column,
-)
-from .dataframe import DataFrame, VirtualDataFrame
-from .helpers.sql_sanitizer import sanitize_file_name, sanitize_sql_table_name
-from .smart_dataframe import SmartDataframe
-from .smart_datalake import SmartDatalake
+from typing import TYPE_CHECKING, List, Optional, Union
+
+# Public names resolved by `__getattr__`, imported here for the type checkers
+if TYPE_CHECKING:
+    from .agent import Agent
+    from .config import APIKeyManager, ConfigManager  # noqa: F401
+    from .constants import (  # noqa: F401
+        DEFAULT_API_URL,
+        LOCAL_SOURCE_TYPES,
+        SQL_SOURCE_TYPES,
+    )
+    from .core.cache import Cache  # noqa: F401
+    from .data_loader.loader import DatasetLoader  # noqa: F401
+    from .data_loader.semantic_layer_schema import (  # noqa: F401
+        Column,
+        Relation,
+        SemanticLayerSchema,
+        Source,
+    )
+    from .dataframe import DataFrame, VirtualDataFrame
+    from .exceptions import (  # noqa: F401
+        DatasetNotFound,
+        InvalidConfigError,
+        PandaAIApiKeyError,
+    )
+    from .helpers.dataset_transfer import download_zip  # noqa: F401
+    from .helpers.path import (  # noqa: F401
+        find_project_root,
+        get_validated_dataset_path,
+        transform_dash_to_underscore,
+    )
+    from .helpers.session import get_pandaai_session  # noqa: F401
+    from .helpers.sql_sanitizer import (  # noqa: F401
+        sanitize_file_name,
+        sanitize_sql_table_name,
+    )
+    from .query_builders import SqlQueryBuilder  # noqa: F401
+    from .sandbox.sandbox import Sandbox
+    from .smart_dataframe import SmartDataframe
+    from .smart_datalake import SmartDatalake
+
+# Public names are imported on first access, so that `import pandasai` does not
+# load pandas, duckdb, sqlglot and the other heavy dependencies of the package.
+_LAZY_IMPORTS = {
+    "Agent": ".agent",
+    "APIKeyManager": ".config",
+    "ConfigManager": ".config",
+    "DEFAULT_API_URL": ".constants",
+    "LOCAL_SOURCE_TYPES": ".constants",
+    "SQL_SOURCE_TYPES": ".constants",
+    "Cache": ".core.cache",
+    "DatasetLoader": ".data_loader.loader",
+    "Column": ".data_loader.semantic_layer_schema",
+    "Relation": ".data_loader.semantic_layer_schema",
+    "SemanticLayerSchema": ".data_loader.semantic_layer_schema",
+    "Source": ".data_loader.semantic_layer_schema",
+    "DataFrame": ".dataframe",
+    "VirtualDataFrame": ".dataframe",
+    "DatasetNotFound": ".exceptions",
+    "InvalidConfigError": ".exceptions",
+    "PandaAIApiKeyError": ".exceptions",
+    "download_zip": ".helpers.dataset_transfer",
+    "find_project_root": ".helpers.path",
+    "get_validated_dataset_path": ".helpers.path",
+    "transform_dash_to_underscore": ".helpers.path",
+    "get_pandaai_session": ".helpers.session",
+    "sanitize_file_name": ".helpers.sql_sanitizer",
+    "sanitize_sql_table_name": ".helpers.sql_sanitizer",
+    "SqlQueryBuilder": ".query_builders",
+    "Sandbox": ".sandbox.sandbox",
+    "SmartDataframe": ".smart_dataframe",
+    "SmartDatalake": ".smart_datalake",
+}
+
+
+def __getattr__(name: str):
+    if name == "config":
+        # The submodule, which exposes the methods of `ConfigManager`
+        value = importlib.import_module(".config", __name__)
+    elif name == "api_key":
+        from .config import APIKeyManager
+
+        value = APIKeyManager()
+    elif name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *_LAZY_IMPORTS, "config", "api_key"})
 
 
 def create(
     path: str,
-    df: Optional[DataFrame] = None,
+    df: Optional["DataFrame"] = None,
     description: Optional[str] = None,
     columns: Optional[List[dict]] = None,
     source: Optional[dict] = None,
     relations: Optional[List[dict]] = None,
     view: bool = False,
     group_by: Optional[List[str]] = None,
-) -> Union[DataFrame, VirtualDataFrame]:
+) -> Union["DataFrame", "VirtualDataFrame"]:
     """
     Creates a new dataset at the specified path with optional metadata, schema,
     and data source configurations.
@@ -119,6 +180,18 @@ def create(
         ... )
         Dataset saved successfully to path: datasets/my-org/sales
     """
+    from .data_loader.loader import DatasetLoader
+    from .data_loader.semantic_layer_schema import (
+        Column,
+        Relation,
+        SemanticLayerSchema,
+        Source,
+    )
+    from .dataframe import DataFrame
+    from .exceptions import InvalidConfigError
+    from .helpers.path import get_validated_dataset_path, transform_dash_to_underscore
+    from .helpers.sql_sanitizer import sanitize_sql_table_name
+
     if df is not None and not isinstance(df, DataFrame):
         raise ValueError("df must be a PandaAI DataFrame")
 
@@ -129,7 +202,9 @@ def create(
     schema_path = os.path.join(dataset_directory, "schema.yaml")
     parquet_file_path = os.path.join(dataset_directory, "data.parquet")
 
-    file_manager = config.get().file_manager
+    from .config import ConfigManager
+
+    file_manager = ConfigManager.get().file_manager
     # Check if dataset already exists
     if file_manager.exists(dataset_directory) and file_manager.exists(schema_path):
         raise ValueError(f"Dataset already exists at path: {path}")
@@ -188,18 +263,16 @@ def create(
 # Global variable to store the current agent
 _current_agent = None
 
-config = ConfigManager()
-
-api_key = APIKeyManager()
-
 
 def clear_cache(filename: str = None):
     """Clear the cache"""
+    from .core.cache import Cache
+
     cache = Cache(filename) if filename else Cache()
     cache.clear()
 
 
-def chat(query: str, *dataframes: DataFrame, sandbox: Optional[Sandbox] = None):
+def chat(query: str, *dataframes: "DataFrame", sandbox: Optional["Sandbox"] = None):
     """
     Start a new chat interaction with the assistant on Dataframe(s).
 
@@ -211,6 +284,8 @@ def chat(query: str, *dataframes: DataFrame, sandbox: Optional[Sandbox] = None):
     Returns:
         The result of the query.
     """
+    from .agent import Agent
+
     global _current_agent
     if not dataframes:
         raise ValueError("At least one dataframe must be provided.")
@@ -239,7 +314,7 @@ def follow_up(query: str):
     return _current_agent.follow_up(query)
 
 
-def load(dataset_path: str) -> DataFrame:
+def load(dataset_path: str) -> "DataFrame":
     """
     Load data based on the provided dataset path.
 
@@ -250,6 +325,13 @@ def load(dataset_path: str) -> DataFrame:
         DataFrame: A new PandaAI DataFrame instance with loaded data.
     """
 
+    from .constants import DEFAULT_API_URL
+    from .data_loader.loader import DatasetLoader
+    from .exceptions import DatasetNotFound, PandaAIApiKeyError
+    from .helpers.dataset_transfer import download_zip
+    from .helpers.path import find_project_root, get_validated_dataset_path
+    from .helpers.session import get_pandaai_session
+
     # Validate the dataset path
     get_validated_dataset_path(dataset_path)
 
@@ -270,13 +352,14 @@ def load(dataset_path: str) -> DataFrame:
 
         headers = {"accept": "application/json", "x-authorization": f"Bearer {api_key}"}
 
-        file_data = request_session.get(
-            "/datasets/pull", headers=headers, params={"path": dataset_path}
-        )
-        if file_data.status_code != 200:
-            raise DatasetNotFound("Dataset not found!")
-
-        with ZipFile(BytesIO(file_data.content)) as zip_file:
+        with download_zip(
+            request_session,
+            "/datasets/pull",
+            headers=headers,
+            params={"path": dataset_path},
+        ) as zip_file:
+            if zip_file is None:
+                raise DatasetNotFound("Dataset not found!")
             zip_file.extractall(dataset_full_path)
 
     loader = DatasetLoader.create_loader_from_path(dataset_path)
@@ -293,7 +376,12 @@ def load(dataset_path: str) -> DataFrame:
     return df
 
 
-def read_csv(filepath: str) -> DataFrame:
+def read_csv(filepath: str) -> "DataFrame":
+    import pandas as pd
+
+    from .dataframe import DataFrame
+    from .helpers.sql_sanitizer import sanitize_file_name
+
     data = pd.read_csv(filepath)
     table = f"table_{sanitize_file_name(filepath)}"
     return DataFrame(data, _table_name=table)
@@ -1,18 +1,23 @@
+import hashlib
+import threading
 import traceback
 import warnings
-from typing import Any, List, Optional, Union
+from typing import Any, List, Optional, Tuple, Union
 
-import duckdb
 import pandas as pd
 
 from pandasai.core.cache import Cache
 from pandasai.core.code_execution.code_executor import CodeExecutor
+from pandasai.core.code_execution.code_repair import CodeRepairer
+from pandasai.core.code_execution.speculative import execute_first_valid
 from pandasai.core.code_generation.base import CodeGenerator
 from pandasai.core.prompts import (
     get_chat_prompt_for_sql,
     get_correct_error_prompt_for_sql,
     get_correct_output_type_error_prompt,
 )
+from pandasai.core.prompts.base import BasePrompt
+from pandasai.core.response.base import BaseResponse
 from pandasai.core.response.error import ErrorResponse
 from pandasai.core.response.parser import ResponseParser
 from pandasai.core.user_query import UserQuery
@@ -22,11 +27,13 @@ from pandasai.exceptions import (
     CodeExecutionError,
     InvalidLLMOutputType,
     MissingVectorStoreError,
+    NoCodeFoundError,
 )
+from pandasai.helpers.telemetry import scarf_analytics
+from pandasai.helpers.tracing import tracer
 from pandasai.sandbox import Sandbox
 from pandasai.vectorstores.vectorstore import VectorStore
 
-from .. import SqlQueryBuilder
 from ..config import Config
 from ..constants import LOCAL_SOURCE_TYPES
 from ..data_loader.duck_db_connection_manager import DuckDBConnectionManager
@@ -34,6 +41,8 @@ from ..query_builders.base_query_builder import BaseQueryBuilder
 from ..query_builders.sql_parser import SQLParser
 from .state import AgentState
 
+_PYPLOT_LOCK = threading.Lock()
+
 
 class Agent:
     """
@@ -76,12 +85,20 @@ class Agent:
                     f"The sources of these datasets: {dfs} are not compatibles"
                 )
 
+        scarf_analytics()
+
         self.description = description
         self._state = AgentState()
         self._state.initialize(dfs, config, memory_size, vectorstore, description)
 
         self._code_generator = CodeGenerator(self._state)
         self._response_parser = ResponseParser()
+        # Late bound, so that the executor and parser can be replaced
+        self._code_repairer = CodeRepairer(
+            self._state,
+            execute_code=lambda code: self.execute_code(code),
+            parse=lambda result, code: self._response_parser.parse(result, code),
+        )
         self._sandbox = sandbox
 
     def chat(self, query: str, output_type: Optional[str] = None):
@@ -99,7 +116,19 @@ class Agent:
 
     def generate_code(self, query: Union[UserQuery, str]) -> str:
         """Generate code using the LLM."""
+        cached_code = self._add_query_and_get_cached_code(query)
+        if cached_code is not None:
+            return cached_code
+
+        prompt = self._build_prompt()
+        code = self._code_generator.generate_code(prompt)
+        self._state.last_prompt_used = prompt
+        return code
 
+    def _add_query_and_get_cached_code(
+        self, query: Union[UserQuery, str]
+    ) -> Optional[str]:
+        """Add the query to the memory and return its cached code, if any."""
         self._state.memory.add(str(query), is_user=True)
         if self._state.config.enable_cache:
             cached_code = self._state.cache.get(
@@ -107,18 +136,78 @@ class Agent:
             )
             if cached_code:
                 self._state.logger.log("Using cached code.")
+                tracer.current_span().set_attribute("cache_hit", True)
                 return self._code_generator.validate_and_clean_code(cached_code)
+        return None
 
+    def _build_prompt(self) -> BasePrompt:
         self._state.logger.log("Generating new code...")
-        prompt = get_chat_prompt_for_sql(self._state)
+        with tracer.span("retrieve_documents"):
+            self._state.retrieve_documents()
+        with tracer.span("prompt"):
+            return get_chat_prompt_for_sql(self._state)
+
+    def _execute_code_candidates(
+        self, query: UserQuery
+    ) -> Tuple[str, Any, Optional[Exception]]:
+        """
+        Generate several code candidates and execute them concurrently.
 
-        code = self._code_generator.generate_code(prompt)
+        Returns:
+            Tuple[str, Any, Optional[Exception]]: The code of the first
+            candidate with a valid response and its response. When all
+            candidates fail, the first candidate, None and its error, so that
+            it goes through the error correction without being executed again.
+        """
+        cached_code = self._add_query_and_get_cached_code(query)
+        if cached_code is not None:
+            return cached_code, None, None
+
+        n = self._state.config.code_candidates
+        prompt = self._build_prompt()
         self._state.last_prompt_used = prompt
-        return code
+        with tracer.span("speculative_execution") as span:
+            outcome = execute_first_valid(
+                self._code_generator.generate_code_candidates(prompt, n),
+                self._execute_code_candidate,
+                max_workers=n,
+            )
+            if span.is_recording:
+                span.set_attributes(
+                    {
+                        "candidates": len(outcome.candidates),
+                        "failed_candidates": len(outcome.errors),
+                    }
+                )
+
+        if not outcome.candidates:
+            raise NoCodeFoundError("No code candidate was generated")
+
+        if outcome.code is None:
+            self._state.logger.log(
+                "No code candidate produced a valid response, correcting the first one"
+            )
+            # The generator may have recorded another candidate meanwhile
+            self._state.last_code_generated = outcome.candidates[0]
+            return outcome.candidates[0], None, outcome.errors[0]
+
+        self._state.logger.log(
+            f"Code candidate selected after {len(outcome.errors)} failure(s)"
+        )
+        self._state.last_code_generated = outcome.code
+        return outcome.code, outcome.response, None
+
+    def _execute_code_candidate(self, code: str) -> BaseResponse:
+        if self._sandbox is None and "plt" in code:
+            # pyplot keeps the current figure in a global state, charts are
+            # drawn one at a time within the process
+            with _PYPLOT_LOCK:
+                return self._code_repairer.execute(code)
+        return self._code_repairer.execute(code)
 
     def execute_code(self, code: str) -> dict:
         """Execute the generated code."""
-        self._state.logger.log(f"Executing code: {code}")
+        self._state.logger.log("Executing code: %s", code)
 
         code_executor = CodeExecutor(self._state.config)
         code_executor.add_to_env("execute_sql_query", self._execute_sql_query)
@@ -137,11 +226,14 @@ class Agent:
         return SQLParser.replace_table_and_column_names(query, table_mapping)
 
     def _execute_local_sql_query(self, query: str) -> pd.DataFrame:
+        import duckdb
+
         try:
             db_manager = DuckDBConnectionManager()
-            for df in self._state.dfs:
-                db_manager.register(df.schema.name, df)
-            return db_manager.sql(query).df()
+            with db_manager.lock:
+                for df in self._state.dfs:
+                    db_manager.register(df.schema.name, df)
+                return db_manager.sql(query).df()
         except duckdb.Error as e:
             raise RuntimeError(f"SQL execution failed: {e}") from e
 
@@ -161,30 +253,56 @@ class Agent:
         df0 = self._state.dfs[0]
         source = df0.schema.source or None
 
-        if source and source.type in LOCAL_SOURCE_TYPES:
-            return self._execute_local_sql_query(query)
-        else:
-            query = self._parse_correct_table_name(query, self._state.dfs)
-            return df0.execute_sql_query(query)
+        with tracer.span("sql_query") as span:
+            if source and source.type in LOCAL_SOURCE_TYPES:
+                result = self._execute_local_sql_query(query)
+            else:
+                query = self._parse_correct_table_name(query, self._state.dfs)
+                result = df0.execute_sql_query(query)
 
-    def execute_with_retries(self, code: str) -> Any:
-        """Execute the code with retry logic."""
+            if span.is_recording:
+                span.set_attributes(
+                    {"source": source.type if source else None, "rows": len(result)}
+                )
+            return result
+
+    def execute_with_retries(
+        self, code: str, initial_error: Optional[Exception] = None
+    ) -> Any:
+        """
+        Execute the code with retry logic.
+
+        Args:
+            code (str): Code to execute.
+            initial_error (Exception, optional): Error the code already failed
+                with, the code is corrected without being executed again.
+        """
         max_retries = self._state.config.max_retries
         attempts = 0
 
         while attempts <= max_retries:
             try:
-                result = self.execute_code(code)
-                return self._response_parser.parse(result, code)
+                if initial_error is not None:
+                    error, initial_error = initial_error, None
+                    raise error
+                # Mechanical failures are repaired locally, without the LLM
+                return self._code_repairer.execute(code)
             except CodeExecutionError as e:
                 attempts += 1
+                tracer.current_span().set_attribute("retries", attempts)
                 if attempts > max_retries:
-                    self._state.logger.log(f"Max retries reached. Error: {e}")
+                    self._state.logger.log("Max retries reached. Error: %s", e)
                     raise
                 self._state.logger.log(
                     f"Retrying execution ({attempts}/{max_retries})..."
                 )
-                code = self._regenerate_code_after_error(code, e)
+                # Lets the LLM tell the correction prompts apart, for instance
+                # to route them to a faster model
+                self._state.retry_count = attempts
+                try:
+                    code = self._regenerate_code_after_error(code, e)
+                finally:
+                    self._state.retry_count = 0
 
     def train(
         self,
@@ -242,12 +360,28 @@ class Agent:
     def _process_query(self, query: str, output_type: Optional[str] = None):
         """Process a user query and return the result."""
         query = UserQuery(query)
-        self._state.logger.log(f"Question: {query}")
+        self._state.logger.log("Question: %s", query)
         self._state.logger.log(
             f"Running PandaAI with {self._state.config.llm.type} LLM..."
         )
 
         self._state.output_type = output_type
+        with tracer.start_trace(
+            "query",
+            {
+                "query_hash": hashlib.sha256(str(query).encode()).hexdigest()[:16],
+                "output_type": output_type,
+                "retries": 0,
+            },
+            enabled=self._state.config.enable_tracing,
+        ) as span:
+            response = self._run_query(query)
+
+        if span.is_recording and isinstance(response, BaseResponse):
+            response.timings = span.timings()
+        return response
+
+    def _run_query(self, query: UserQuery):
         try:
             self._state.assign_prompt_id()
 
@@ -255,16 +389,25 @@ class Agent:
             if self._state.config.enable_cache and self._state.cache is None:
                 self._state.cache = Cache()
 
-            # Generate code
-            code = self.generate_code(query)
+            error = None
+            if self._state.config.code_candidates > 1:
+                # Execute several candidates and keep the first valid one
+                code, result, error = self._execute_code_candidates(query)
+            else:
+                # Generate code
+                code = self.generate_code(query)
+                result = None
 
             # Execute code with retries
-            result = self.execute_with_retries(code)
+            if result is None:
+                result = self.execute_with_retries(code, initial_error=error)
 
-            # Cache the result if caching is enabled
+            # Cache the code that produced the result, once repaired or
+            # regenerated, if caching is enabled
             if self._state.config.enable_cache:
                 self._state.cache.set(
-                    self._state.cache.get_cache_key(self._state), code
+                    self._state.cache.get_cache_key(self._state),
+                    getattr(result, "last_code_executed", None) or code,
                 )
 
             self._state.logger.log("Response generated successfully.")
@@ -277,7 +420,7 @@ class Agent:
     def _regenerate_code_after_error(self, code: str, error: Exception) -> str:
         """Generate a new code snippet based on the error."""
         error_trace = traceback.format_exc()
-        self._state.logger.log(f"Execution failed with error: {error_trace}")
+        self._state.logger.log("Execution failed with error: %s", error_trace)
 
         if isinstance(error, InvalidLLMOutputType):
             prompt = get_correct_output_type_error_prompt(
@@ -291,7 +434,7 @@ class Agent:
     def _handle_exception(self, code: str) -> str:
         """Handle exceptions and return an error message."""
         error_message = traceback.format_exc()
-        self._state.logger.log(f"Processing failed with error: {error_message}")
+        self._state.logger.log("Processing failed with error: %s", error_message)
 
         return ErrorResponse(last_code_executed=code, error=error_message)
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from importlib.util import find_spec
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
@@ -33,6 +34,8 @@ class AgentState:
     memory: Memory = field(default_factory=Memory)
     cache: Optional[Cache] = None
     vectorstore: Optional[VectorStore] = None
+    relevant_qa_documents: List[str] = field(default_factory=list)
+    relevant_docs_documents: List[str] = field(default_factory=list)
     intermediate_values: Dict[str, Any] = field(default_factory=dict)
     logger: Optional[Logger] = None
     last_code_generated: Optional[str] = None
@@ -40,6 +43,10 @@ class AgentState:
     last_prompt_id: str = None
     last_prompt_used: str = None
     output_type: Optional[str] = None
+    retry_count: int = 0
+    # Number of messages of the conversation rendered in the prompt, set when
+    # the prompt is fitted to the token budget
+    conversation_limit: Optional[int] = None
 
     def __post_init__(self):
         if isinstance(self.config, dict):
@@ -64,7 +71,13 @@ class AgentState:
         self.config = self._get_config(config)
         if config:
             self.config.llm = self._get_llm(self.config.llm)
-        self.memory = Memory(memory_size, agent_description=description)
+        # Only the messages rendered in the prompts are kept
+        self.memory = Memory(
+            memory_size,
+            agent_description=description,
+            max_messages=memory_size,
+            tokenizer=self.config.tokenizer,
+        )
         self.logger = Logger(
             save_logs=self.config.save_logs, verbose=self.config.verbose
         )
@@ -123,7 +136,28 @@ class AgentState:
         self.last_prompt_id = uuid.uuid4()
 
         if self.logger:
-            self.logger.log(f"Prompt ID: {self.last_prompt_id}")
+            self.logger.log("Prompt ID: %s", self.last_prompt_id)
+
+    def retrieve_documents(self):
+        """
+        Retrieve the examples and the documents relevant to the last message
+        from the vectorstore, so that every prompt of the query reuses them.
+        """
+        if self.vectorstore is None:
+            self.relevant_qa_documents = []
+            self.relevant_docs_documents = []
+            return
+
+        question = self.memory.get_last_message()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            qa_documents = executor.submit(
+                self.vectorstore.get_relevant_qa_documents, question
+            )
+            docs_documents = executor.submit(
+                self.vectorstore.get_relevant_docs_documents, question
+            )
+            self.relevant_qa_documents = qa_documents.result()
+            self.relevant_docs_documents = docs_documents.result()
 
     def reset_intermediate_values(self):
         """Resets the intermediate values dictionary."""
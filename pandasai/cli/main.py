@@ -3,7 +3,7 @@ import re
 
 import click
 
-from pandasai import DatasetLoader
+from pandasai.data_loader.loader import DatasetLoader
 from pandasai.data_loader.semantic_layer_schema import (
     SemanticLayerSchema,
     Source,
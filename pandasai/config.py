@@ -4,7 +4,9 @@ from typing import Any, Dict, Optional
 
 from pydantic import BaseModel, ConfigDict
 
+from pandasai.core.prompts.table_retrieval import TableRetriever
 from pandasai.helpers.filemanager import DefaultFileManager, FileManager
+from pandasai.helpers.tokenizer import Tokenizer
 from pandasai.llm.base import LLM
 
 
@@ -15,6 +17,12 @@ class Config(BaseModel):
     max_retries: int = 3
     llm: Optional[LLM] = None
     file_manager: FileManager = DefaultFileManager()
+    max_prompt_tokens: Optional[int] = None
+    tokenizer: Optional[Tokenizer] = None
+    max_tables: Optional[int] = None
+    table_retriever: Optional[TableRetriever] = None
+    enable_tracing: bool = False
+    code_candidates: int = 1
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -84,3 +92,12 @@ class APIKeyManager:
     @classmethod
     def get(cls) -> Optional[str]:
         return cls._api_key
+
+
+def __getattr__(name: str):
+    # `pandasai.config` is both this module and the global configuration of
+    # the package, `pai.config.set(...)`: the package imports this module
+    # lazily, so the methods of the configuration manager are resolved on it.
+    if name in ("get", "set", "update", "validate_llm"):
+        return getattr(ConfigManager, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,8 +2,6 @@ import glob
 import os
 from typing import Any
 
-import duckdb
-
 from pandasai.constants import CACHE_TOKEN, DEFAULT_FILE_PERMISSIONS
 from pandasai.helpers.path import find_project_root
 
@@ -29,6 +27,9 @@ class Cache:
         os.makedirs(cache_dir, mode=DEFAULT_FILE_PERMISSIONS, exist_ok=True)
 
         self.filepath = os.path.join(cache_dir, f"{filename}.db")
+
+        import duckdb
+
         self.connection = duckdb.connect(self.filepath)
         self.connection.execute(
             "CREATE TABLE IF NOT EXISTS cache (key STRING, value STRING)"
@@ -3,6 +3,7 @@ from typing import Any
 from pandasai.config import Config
 from pandasai.core.code_execution.environment import get_environment
 from pandasai.exceptions import CodeExecutionError, NoResultFoundError
+from pandasai.helpers.tracing import tracer
 
 
 class CodeExecutor:
@@ -25,10 +26,11 @@ class CodeExecutor:
         self._environment[key] = value
 
     def execute(self, code: str) -> dict:
-        try:
-            exec(code, self._environment)
-        except Exception as e:
-            raise CodeExecutionError("Code execution failed") from e
+        with tracer.span("execute_code"):
+            try:
+                exec(code, self._environment)
+            except Exception as e:
+                raise CodeExecutionError("Code execution failed") from e
         return self._environment
 
     def execute_and_return_result(self, code: str) -> Any:
@@ -0,0 +1,273 @@
+"""
+Deterministic repairs of the generated code and of its result.
+
+Many failures of the generated code are mechanical: a table name with the
+wrong casing, a missing `result` variable, a numpy scalar where a number is
+expected, a single value wrapped in a Series. Repairing them locally costs
+milliseconds, while asking the LLM to correct the code costs a round-trip.
+`CodeRepairer` tries these repairs before the agent falls back to the LLM.
+"""
+
+from __future__ import annotations
+
+import ast
+import re
+import threading
+from collections import Counter
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple
+
+import astor
+import numpy as np
+import pandas as pd
+
+from pandasai.exceptions import (
+    CodeExecutionError,
+    InvalidOutputValueMismatch,
+    NoResultFoundError,
+)
+from pandasai.helpers.tracing import tracer
+from pandasai.query_builders.sql_parser import SQLParser
+
+if TYPE_CHECKING:
+    from pandasai.agent.state import AgentState
+    from pandasai.core.response.base import BaseResponse
+
+# Output types written by the LLMs instead of the expected ones
+TYPE_ALIASES = {
+    "int": "number",
+    "integer": "number",
+    "float": "number",
+    "numeric": "number",
+    "str": "string",
+    "text": "string",
+    "df": "dataframe",
+    "table": "dataframe",
+    "chart": "plot",
+    "image": "plot",
+}
+
+
+def _infer_type(value: Any) -> Optional[str]:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return "dataframe"
+    if isinstance(value, (int, float, np.number, Decimal)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    return None
+
+
+def _to_number(value: Any) -> Any:
+    if isinstance(value, (pd.DataFrame, pd.Series)) and value.size == 1:
+        value = value.to_numpy().item()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, Decimal):
+        value = float(value)
+    if isinstance(value, str):
+        try:
+            value = float(value.replace(",", ""))
+        except ValueError:
+            return None
+        if value.is_integer():
+            value = int(value)
+    return value if isinstance(value, (int, float)) else None
+
+
+def coerce_result(result: Any) -> Optional[dict]:
+    """
+    Coerce a result to the format expected by the response parser.
+
+    Returns:
+        dict: The coerced result, None if it cannot be coerced.
+    """
+    if isinstance(result, dict) and "value" in result:
+        value = result["value"]
+        type_ = result.get("type")
+        type_ = TYPE_ALIASES.get(type_, type_) if isinstance(type_, str) else None
+        type_ = type_ or _infer_type(value)
+    else:
+        # The value itself was assigned to `result`
+        value = result
+        type_ = _infer_type(value)
+
+    if type_ == "number":
+        value = _to_number(value)
+    elif type_ == "string" and not isinstance(value, str):
+        value = _to_number(value)
+        value = None if value is None else str(value)
+    elif type_ == "dataframe" and isinstance(value, (list, np.ndarray)):
+        value = pd.DataFrame(value)
+    elif type_ not in ("dataframe", "plot", "string"):
+        return None
+
+    if value is None:
+        return None
+    return {"type": type_, "value": value}
+
+
+class CodeRepairer:
+    """
+    Execute the code and parse its result, repairing the common mechanical
+    failures locally before they are reported.
+
+    The repairer can execute several codes concurrently.
+
+    Args:
+        context (AgentState): State of the agent, for the table names.
+        execute_code (Callable): Function executing the code and returning
+            its result.
+        parse (Callable): Function parsing the result of the code into a
+            response.
+
+    Attributes:
+        successes (Counter): Number of successful repairs, by name.
+    """
+
+    def __init__(
+        self,
+        context: AgentState,
+        execute_code: Callable[[str], Any],
+        parse: Callable[[Any, str], BaseResponse],
+    ):
+        self._context = context
+        self._execute_code = execute_code
+        self._parse = parse
+        self.successes: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def execute(self, code: str) -> BaseResponse:
+        """
+        Execute the code and return its parsed response.
+
+        Raises:
+            The error of the original code when no repair works.
+        """
+        response, _ = self.repair(code)
+        return response
+
+    def repair(self, code: str) -> Tuple[BaseResponse, List[str]]:
+        """
+        Execute the code and return its parsed response, along with the names
+        of the repairs applied.
+
+        Raises:
+            The error of the original code when no repair works.
+        """
+        repairs: List[str] = []
+        try:
+            return self._execute_and_parse(code, repairs), repairs
+        except (
+            CodeExecutionError,
+            NoResultFoundError,
+            InvalidOutputValueMismatch,
+        ) as error:
+            with tracer.span("repair_code") as span:
+                response = self._repair_code(code, error, repairs)
+                if span.is_recording:
+                    span.set_attribute("repairs", ",".join(repairs))
+            if response is None:
+                raise
+            return response, repairs
+
+    def _execute_and_parse(self, code: str, repairs: List[str]) -> BaseResponse:
+        result = self._execute_code(code)
+        try:
+            return self._parse(result, code)
+        except InvalidOutputValueMismatch:
+            coerced = coerce_result(result)
+            if coerced is None:
+                raise
+            response = self._parse(coerced, code)
+            self._record("coerce_result", repairs)
+            return response
+
+    def _repair_code(
+        self, code: str, error: Exception, repairs: List[str]
+    ) -> Optional[BaseResponse]:
+        candidates = [
+            ("table_name_case", self._fix_table_name_case),
+            ("assign_result", self._assign_result),
+        ]
+        for name, repair in candidates:
+            try:
+                repaired = repair(code, error)
+            except Exception:
+                continue
+            if repaired is None or repaired == code:
+                continue
+
+            try:
+                response = self._execute_and_parse(repaired, repairs)
+            except Exception:
+                continue
+            self._record(name, repairs)
+            return response
+        return None
+
+    def _record(self, name: str, repairs: List[str]) -> None:
+        with self._lock:
+            self.successes[name] += 1
+        repairs.append(name)
+        if self._context.logger:
+            self._context.logger.log("Code repaired locally: %s", name)
+
+    def _fix_table_name_case(self, code: str, error: Exception) -> Optional[str]:
+        """Use the exact name of the tables referenced with another casing."""
+        if not isinstance(error, CodeExecutionError):
+            return None
+
+        table_names = {
+            df.schema.name.lower(): df.schema.name for df in self._context.dfs
+        }
+        tree = ast.parse(code)
+        fixed = False
+        for node in ast.walk(tree):
+            if not (isinstance(node, ast.Constant) and isinstance(node.value, str)):
+                continue
+            try:
+                names = SQLParser.extract_table_names(node.value)
+            except Exception:
+                continue
+
+            sql = node.value
+            for name in set(names):
+                exact = table_names.get(name.lower())
+                if exact is not None and exact != name:
+                    sql = re.sub(r"\b" + re.escape(name) + r"\b", exact, sql)
+            if sql != node.value:
+                node.value = sql
+                fixed = True
+
+        return astor.to_source(tree) if fixed else None
+
+    def _assign_result(self, code: str, error: Exception) -> Optional[str]:
+        """Assign the value computed last to `result` when it is missing."""
+        if not isinstance(error, NoResultFoundError):
+            return None
+
+        tree = ast.parse(code)
+        if not tree.body:
+            return None
+
+        last = tree.body[-1]
+        if isinstance(last, ast.Expr):
+            tree.body[-1] = ast.Assign(
+                targets=[ast.Name(id="result", ctx=ast.Store())], value=last.value
+            )
+        elif (
+            isinstance(last, ast.Assign)
+            and len(last.targets) == 1
+            and isinstance(last.targets[0], ast.Name)
+        ):
+            tree.body.append(
+                ast.Assign(
+                    targets=[ast.Name(id="result", ctx=ast.Store())],
+                    value=ast.Name(id=last.targets[0].id, ctx=ast.Load()),
+                )
+            )
+        else:
+            return None
+
+        return astor.to_source(ast.fix_missing_locations(tree))
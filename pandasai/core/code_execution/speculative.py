@@ -0,0 +1,142 @@
+"""
+Speculative execution of several candidate codes.
+
+The candidates are executed concurrently as soon as they are generated, and
+the first one producing a valid response wins. This trades LLM tokens and
+compute for latency: a failing candidate no longer costs a sequential round
+of correction when another candidate succeeds.
+"""
+
+import contextvars
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Optional
+
+
+class SpeculativeResult:
+    """
+    Outcome of the execution of the candidates.
+
+    Attributes:
+        response: Response of the winning candidate, None if all failed.
+        code (str, optional): Code of the winning candidate.
+        candidates (List[str]): Candidates executed, in generation order.
+        errors (List[Exception]): Errors of the failed candidates, in
+            generation order.
+    """
+
+    def __init__(self):
+        self.response: Any = None
+        self.code: Optional[str] = None
+        self.candidates: List[str] = []
+        self.errors: List[Exception] = []
+
+
+_DONE = object()
+
+
+def execute_first_valid(
+    candidates: Iterator[str],
+    execute: Callable[[str], Any],
+    max_workers: int,
+) -> SpeculativeResult:
+    """
+    Execute the candidates concurrently and return the first valid response.
+
+    The candidates are consumed in a background thread, so that a candidate
+    can win while the others are still being generated. Once a candidate
+    wins, no further candidates are generated or started. Candidates already
+    running cannot be interrupted, they finish in the background and their
+    results are discarded.
+
+    Args:
+        candidates (Iterator[str]): Candidate codes, yielded as generated.
+        execute (Callable): Function executing a code and returning its
+            response, raising an error if the response is not valid.
+        max_workers (int): Maximum number of candidates executed at once.
+
+    Raises:
+        The error raised while generating the candidates, if no candidate
+        was generated.
+    """
+    result = SpeculativeResult()
+    events: queue.Queue = queue.Queue()
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="pandasai-candidate"
+    )
+    futures: List[Future] = []
+    # Candidates are not submitted once the winner has cancelled the others
+    futures_lock = threading.Lock()
+
+    def run(index: int, code: str) -> None:
+        try:
+            events.put((index, code, execute(code), None))
+        except Exception as e:
+            events.put((index, code, None, e))
+
+    def produce() -> None:
+        submitted = 0
+        seen = set()
+        try:
+            for code in candidates:
+                if code in seen:
+                    continue
+                seen.add(code)
+                # Spans of the execution belong to the trace of the query
+                context = contextvars.copy_context()
+                with futures_lock:
+                    if stop.is_set():
+                        break
+                    futures.append(executor.submit(context.run, run, submitted, code))
+                submitted += 1
+        except Exception as e:
+            events.put((None, None, None, e))
+        finally:
+            close = getattr(candidates, "close", None)
+            if close is not None:
+                close()
+            events.put((_DONE, submitted, None, None))
+
+    producer = threading.Thread(
+        target=contextvars.copy_context().run,
+        args=(produce,),
+        name="pandasai-candidates",
+        daemon=True,
+    )
+    producer.start()
+
+    outcomes = {}
+    generation_error = None
+    submitted = None
+    try:
+        while submitted is None or len(outcomes) < submitted:
+            index, code, response, error = events.get()
+            if index is _DONE:
+                submitted = code
+            elif index is None:
+                generation_error = error
+            elif error is None:
+                result.response = response
+                result.code = code
+                outcomes[index] = (code, None)
+                break
+            else:
+                outcomes[index] = (code, error)
+    finally:
+        with futures_lock:
+            stop.set()
+            for future in futures:
+                future.cancel()
+        executor.shutdown(wait=False)
+
+    for index in sorted(outcomes):
+        code, error = outcomes[index]
+        result.candidates.append(code)
+        if error is not None:
+            result.errors.append(error)
+
+    if not outcomes and generation_error is not None:
+        raise generation_error
+    return result
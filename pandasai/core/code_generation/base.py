@@ -1,11 +1,18 @@
+from __future__ import annotations
+
 import traceback
+from typing import TYPE_CHECKING, Iterator
 
-from pandasai.agent.state import AgentState
 from pandasai.core.prompts.base import BasePrompt
+from pandasai.helpers.tokenizer import ApproximateTokenizer
+from pandasai.helpers.tracing import tracer
 
 from .code_cleaning import CodeCleaner
 from .code_validation import CodeRequirementValidator
 
+if TYPE_CHECKING:
+    from pandasai.agent.state import AgentState
+
 
 class CodeGenerator:
     def __init__(self, context: AgentState):
@@ -28,31 +35,88 @@ class CodeGenerator:
             Exception: If any step fails during the process.
         """
         try:
-            self._context.logger.log(f"Using Prompt: {prompt}")
+            self._context.logger.log("Using Prompt: %s", prompt)
 
-            # Generate the code
-            code = self._context.config.llm.generate_code(prompt, self._context)
-            self._context.last_code_generated = code
-            self._context.logger.log(f"Code Generated:\n{code}")
+            with tracer.span("generate_code"):
+                # Generate the code
+                with tracer.span("llm") as span:
+                    code = self._context.config.llm.generate_code(prompt, self._context)
+                    if span.is_recording:
+                        tokenizer = (
+                            self._context.config.tokenizer or ApproximateTokenizer()
+                        )
+                        span.set_attributes(
+                            {
+                                "prompt_tokens": tokenizer.count_tokens(
+                                    prompt.to_string()
+                                ),
+                                "completion_tokens": tokenizer.count_tokens(code),
+                            }
+                        )
+                self._context.last_code_generated = code
+                self._context.logger.log("Code Generated:\n%s", code)
 
-            return self.validate_and_clean_code(code)
+                return self.validate_and_clean_code(code)
 
         except Exception as e:
             error_message = f"An error occurred during code generation: {e}"
             stack_trace = traceback.format_exc()
 
             self._context.logger.log(error_message)
-            self._context.logger.log(f"Stack Trace:\n{stack_trace}")
+            self._context.logger.log("Stack Trace:\n%s", stack_trace)
 
             raise e
 
+    def generate_code_candidates(self, prompt: BasePrompt, n: int) -> Iterator[str]:
+        """
+        Generate several candidate codes, yielding each one once validated and
+        cleaned. Invalid candidates are discarded.
+
+        Args:
+            prompt (BasePrompt): The prompt to guide code generation.
+            n (int): Number of candidates requested from the LLM.
+
+        Returns:
+            Iterator[str]: The cleaned and validated candidates.
+
+        Raises:
+            The error of the last candidate when no candidate is valid.
+        """
+        self._context.logger.log("Using Prompt: %s", prompt)
+
+        candidates = self._context.config.llm.generate_code_candidates(
+            prompt, self._context, n
+        )
+        error = None
+        generated = False
+        try:
+            for code in candidates:
+                self._context.last_code_generated = code
+                self._context.logger.log("Code Candidate Generated:\n%s", code)
+                try:
+                    code = self.validate_and_clean_code(code)
+                except Exception as e:
+                    self._context.logger.log("Discarding code candidate: %s", e)
+                    error = e
+                    continue
+                generated = True
+                yield code
+        finally:
+            close = getattr(candidates, "close", None)
+            if close is not None:
+                close()
+
+        if not generated and error is not None:
+            raise error
+
     def validate_and_clean_code(self, code: str) -> str:
-        # Validate code requirements
-        self._context.logger.log("Validating code requirements...")
-        if not self._code_validator.validate(code):
-            raise ValueError("Code validation failed due to unmet requirements.")
-        self._context.logger.log("Code validation successful.")
-
-        # Clean the code
-        self._context.logger.log("Cleaning the generated code...")
-        return self._code_cleaner.clean_code(code)
+        with tracer.span("clean_code"):
+            # Validate code requirements
+            self._context.logger.log("Validating code requirements...")
+            if not self._code_validator.validate(code):
+                raise ValueError("Code validation failed due to unmet requirements.")
+            self._context.logger.log("Code validation successful.")
+
+            # Clean the code
+            self._context.logger.log("Cleaning the generated code...")
+            return self._code_cleaner.clean_code(code)
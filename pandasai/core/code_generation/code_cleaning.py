@@ -1,16 +1,21 @@
+from __future__ import annotations
+
 import ast
 import re
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import astor
 
-from pandasai.agent.state import AgentState
 from pandasai.constants import DEFAULT_CHART_DIRECTORY
 from pandasai.core.code_execution.code_executor import CodeExecutor
 from pandasai.query_builders.sql_parser import SQLParser
 
 from ...exceptions import MaliciousQueryError
 
+if TYPE_CHECKING:
+    from pandasai.agent.state import AgentState
+
 
 class CodeCleaner:
     def __init__(self, context: AgentState):
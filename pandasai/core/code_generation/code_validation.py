@@ -1,8 +1,13 @@
+from __future__ import annotations
+
 import ast
+from typing import TYPE_CHECKING
 
-from pandasai.agent.state import AgentState
 from pandasai.exceptions import ExecuteSQLQueryNotUsed
 
+if TYPE_CHECKING:
+    from pandasai.agent.state import AgentState
+
 
 class CodeRequirementValidator:
     """
@@ -10,6 +10,7 @@ from pandasai.core.prompts.correct_output_type_error_prompt import (
 )
 
 from .base import BasePrompt
+from .budget import build_prompt
 from .generate_python_code_with_sql import GeneratePythonCodeWithSQLPrompt
 
 if TYPE_CHECKING:
@@ -17,8 +18,9 @@ if TYPE_CHECKING:
 
 
 def get_chat_prompt_for_sql(context: AgentState) -> BasePrompt:
-    return GeneratePythonCodeWithSQLPrompt(
-        context=context,
+    return build_prompt(
+        GeneratePythonCodeWithSQLPrompt,
+        context,
         last_code_generated=context.get("last_code_generated"),
         output_type=context.output_type,
     )
@@ -27,16 +29,20 @@ def get_chat_prompt_for_sql(context: AgentState) -> BasePrompt:
 def get_correct_error_prompt_for_sql(
     context: AgentState, code: str, traceback_error: str
 ) -> BasePrompt:
-    return CorrectExecuteSQLQueryUsageErrorPrompt(
-        context=context, code=code, error=traceback_error
+    return build_prompt(
+        CorrectExecuteSQLQueryUsageErrorPrompt,
+        context,
+        code=code,
+        error=traceback_error,
     )
 
 
 def get_correct_output_type_error_prompt(
     context: AgentState, code: str, traceback_error: str
 ) -> BasePrompt:
-    return CorrectOutputTypeErrorPrompt(
-        context=context,
+    return build_prompt(
+        CorrectOutputTypeErrorPrompt,
+        context,
         code=code,
         error=traceback_error,
         output_type=context.output_type,
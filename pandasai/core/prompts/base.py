@@ -2,13 +2,59 @@
 In order to better handle the instructions, this prompt module is written.
 """
 
-import os
 import re
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from jinja2 import Environment, FileSystemLoader
+from pandasai.helpers.memory import get_prompt_memory
+
+if TYPE_CHECKING:
+    from jinja2 import Environment, FileSystemBytecodeCache, Template
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+
+def _create_bytecode_cache() -> Optional["FileSystemBytecodeCache"]:
+    from jinja2 import FileSystemBytecodeCache
+
+    try:
+        return FileSystemBytecodeCache()
+    except (OSError, RuntimeError):
+        # No writable temporary directory, templates are still cached in memory
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_environment() -> "Environment":
+    """Return the environment compiling the templates, created on first use.
+
+    Templates ship with the package and never change at runtime: a single
+    environment keeps them compiled in memory and skips the up-to-date checks,
+    while the bytecode cache saves the compilation in new processes.
+    """
+    from jinja2 import Environment, FileSystemLoader
+
+    environment = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        bytecode_cache=_create_bytecode_cache(),
+        auto_reload=False,
+    )
+    environment.globals["get_prompt_memory"] = get_prompt_memory
+    return environment
+
+
+def get_template(template_path: str) -> "Template":
+    """Return the compiled template stored at `template_path` in the templates
+    directory, compiling it on first use."""
+    return get_environment().get_template(template_path)
+
+
+@lru_cache(maxsize=128)
+def get_string_template(template: str) -> "Template":
+    """Return the compiled version of an inline template."""
+    return get_environment().from_string(template)
 
 
 class BasePrompt:
@@ -25,14 +71,9 @@ class BasePrompt:
         self.props = kwargs
 
         if self.template:
-            env = Environment()
-            self.prompt = env.from_string(self.template)
+            self.prompt = get_string_template(self.template)
         elif self.template_path:
-            # find path to template file
-            current_dir_path = Path(__file__).parent
-            path_to_template = os.path.join(current_dir_path, "templates")
-            env = Environment(loader=FileSystemLoader(path_to_template))
-            self.prompt = env.get_template(self.template_path)
+            self.prompt = get_template(self.template_path)
 
         self._resolved_prompt = None
 
@@ -66,7 +107,7 @@ class BasePrompt:
             return {"prompt": self.to_string()}
 
         context = self.props["context"]
-        memory = context.memory
+        memory = get_prompt_memory(context)
         conversations = memory.to_json()
         system_prompt = memory.agent_description
         return {
@@ -0,0 +1,155 @@
+"""
+Fit prompts into a token budget.
+
+Prompts embed a sample of every dataframe and the conversation, so they grow
+with the number and the width of the tables. When a budget is configured, the
+prompt is shrunk step by step until it fits: irrelevant tables are dropped,
+the columns of each table are capped, the sample rows are reduced and finally
+the oldest messages of the conversation are left out of the prompt.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterator, List, Optional, Type
+
+from pandasai.core.prompts.base import BasePrompt
+from pandasai.core.prompts.generate_system_message import GenerateSystemMessagePrompt
+from pandasai.core.prompts.table_retrieval import (
+    default_retriever,
+    get_question,
+    select_tables,
+    tokenize,
+)
+from pandasai.helpers.dataframe_serializer import DataframeSerializer
+from pandasai.helpers.memory import get_prompt_memory
+from pandasai.helpers.tokenizer import ApproximateTokenizer, Tokenizer
+
+if TYPE_CHECKING:
+    from pandasai.agent.state import AgentState
+    from pandasai.dataframe.base import DataFrame
+
+
+class TableView:
+    """Dataframe serialized with a subset of its columns and sample rows."""
+
+    def __init__(self, df: DataFrame):
+        self.df = df
+        self.columns: Optional[List[str]] = None
+        self.rows: Optional[int] = None
+
+    def serialize_dataframe(self) -> str:
+        if self.columns is None and self.rows is None:
+            return self.df.serialize_dataframe()
+        return DataframeSerializer.serialize(
+            self.df, columns=self.columns, rows=self.rows
+        )
+
+
+class PromptBudget:
+    """
+    Render prompts within a maximum number of tokens.
+
+    Args:
+        max_tokens (int): Maximum number of tokens of the prompt, including the
+            system message holding the previous conversation.
+        tokenizer (Tokenizer, optional): Tokenizer used to measure the prompt.
+            Defaults to an approximation based on the number of characters.
+    """
+
+    column_caps = (50, 20, 10)
+    sample_rows = (3, 1, 0)
+
+    def __init__(self, max_tokens: int, tokenizer: Optional[Tokenizer] = None):
+        self.max_tokens = max_tokens
+        self.tokenizer = tokenizer or ApproximateTokenizer()
+
+    def count_tokens(self, prompt: BasePrompt, context: AgentState) -> int:
+        system_prompt = GenerateSystemMessagePrompt(memory=get_prompt_memory(context))
+        return self.tokenizer.count_tokens(
+            prompt.to_string()
+        ) + self.tokenizer.count_tokens(system_prompt.to_string())
+
+    def fit(
+        self, prompt_class: Type[BasePrompt], context: AgentState, **kwargs
+    ) -> BasePrompt:
+        """
+        Render a prompt, shrinking its content until it fits the budget.
+
+        The number of messages of the conversation fitting the budget is set
+        on the context, the memory itself is left untouched. If the prompt still exceeds the budget once
+        everything has been shrunk, the smallest prompt is returned.
+        """
+        context.conversation_limit = None
+        views = [TableView(df) for df in select_tables(context)]
+        steps = self._shrink(views, context)
+
+        prompt = prompt_class(context=context, dfs=views, **kwargs)
+        while self.count_tokens(prompt, context) > self.max_tokens:
+            if not next(steps, False):
+                if context.logger:
+                    context.logger.log(
+                        f"The prompt exceeds the budget of {self.max_tokens} tokens"
+                    )
+                break
+            prompt = prompt_class(context=context, dfs=views, **kwargs)
+
+        return prompt
+
+    def _shrink(self, views: List[TableView], context: AgentState) -> Iterator[bool]:
+        """Shrink the content of the prompt one step at a time."""
+        question = get_question(context)
+        if len(views) > 1:
+            retriever = context.config.table_retriever or default_retriever
+            scores = retriever.score(question, [view.df for view in views])
+            relevant = [view for view, score in zip(views, scores) if score > 0]
+            if not relevant:
+                relevant = [views[scores.index(max(scores))]]
+            if len(relevant) < len(views):
+                views[:] = relevant
+                yield True
+
+        for cap in self.column_caps:
+            capped = False
+            for view in views:
+                columns = view.columns or self._rank_columns(view.df, question)
+                if len(columns) > cap:
+                    view.columns = columns[:cap]
+                    capped = True
+            if capped:
+                yield True
+
+        for rows in self.sample_rows:
+            for view in views:
+                view.rows = rows
+            yield True
+
+        for limit in range(context.memory.count() - 1, 0, -1):
+            context.conversation_limit = limit
+            yield True
+
+    @staticmethod
+    def _rank_columns(df: DataFrame, question: str) -> List[str]:
+        """Return the columns of a dataframe, the ones named in the question first."""
+        question_terms = set(tokenize(question))
+        columns = list(df.head().columns)
+        return sorted(
+            columns, key=lambda column: -len(set(tokenize(column)) & question_terms)
+        )
+
+
+def build_prompt(
+    prompt_class: Type[BasePrompt], context: AgentState, **kwargs
+) -> BasePrompt:
+    """
+    Build a prompt with the tables relevant to the question, fitting it to the
+    token budget of the config if any.
+    """
+    max_tokens = context.config.max_prompt_tokens
+    if max_tokens is None:
+        context.conversation_limit = None
+        if context.config.max_tables is not None:
+            kwargs["dfs"] = select_tables(context)
+        return prompt_class(context=context, **kwargs)
+
+    budget = PromptBudget(max_tokens, context.config.tokenizer)
+    return budget.fit(prompt_class, context, **kwargs)
@@ -1,4 +1,5 @@
 from pandasai.core.prompts.base import BasePrompt
+from pandasai.helpers.memory import get_prompt_memory
 
 
 class CorrectExecuteSQLQueryUsageErrorPrompt(BasePrompt):
@@ -10,7 +11,7 @@ class CorrectExecuteSQLQueryUsageErrorPrompt(BasePrompt):
         context = self.props["context"]
         code = self.props["code"]
         error = self.props["error"]
-        memory = context.memory
+        memory = get_prompt_memory(context)
         conversations = memory.to_json()
 
         system_prompt = memory.agent_description
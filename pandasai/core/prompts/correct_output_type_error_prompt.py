@@ -1,3 +1,5 @@
+from pandasai.helpers.memory import get_prompt_memory
+
 from .base import BasePrompt
 
 
@@ -11,7 +13,7 @@ class CorrectOutputTypeErrorPrompt(BasePrompt):
         code = self.props["code"]
         error = self.props["error"]
         output_type = self.props["output_type"]
-        memory = context.memory
+        memory = get_prompt_memory(context)
         conversations = memory.to_json()
 
         system_prompt = memory.agent_description
@@ -1,3 +1,5 @@
+from pandasai.helpers.memory import get_prompt_memory
+
 from .base import BasePrompt
 
 
@@ -9,7 +11,7 @@ class GeneratePythonCodeWithSQLPrompt(BasePrompt):
     def to_json(self):
         context = self.props["context"]
         output_type = self.props["output_type"]
-        memory = context.memory
+        memory = get_prompt_memory(context)
         conversations = memory.to_json()
 
         system_prompt = memory.agent_description
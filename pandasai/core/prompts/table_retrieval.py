@@ -0,0 +1,176 @@
+"""
+Select the tables relevant to a question.
+
+Every dataframe of an agent is indexed by the name, description and columns
+of its semantic layer schema, and only the top-k tables for the question are
+included in the prompt, so that prompts stay the same size as the catalog
+grows.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from pandasai.agent.state import AgentState
+    from pandasai.dataframe.base import DataFrame
+
+STOP_WORDS = {
+    "a",
+    "an",
+    "and",
+    "are",
+    "by",
+    "for",
+    "from",
+    "how",
+    "in",
+    "is",
+    "of",
+    "on",
+    "or",
+    "per",
+    "the",
+    "to",
+    "what",
+    "which",
+    "with",
+}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split a text into lowercase terms, splitting identifiers on underscores
+    and dropping the plural of words so that "orders" matches "order_id".
+    """
+    tokens = []
+    for word in re.findall(r"[a-z0-9]+", (text or "").lower()):
+        if word in STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def get_question(context: AgentState) -> str:
+    """Return the last question of the user."""
+    for message in reversed(context.memory.all()):
+        if message["is_user"]:
+            return message["message"]
+    return ""
+
+
+def schema_document(df: DataFrame) -> List[str]:
+    """Return the terms describing a dataframe in the index."""
+    schema = df.schema
+    tokens = tokenize(schema.name) + tokenize(schema.description)
+    for column in schema.columns or []:
+        tokens += tokenize(column.name) + tokenize(column.description)
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 index over tokenized documents."""
+
+    def __init__(self, documents: List[List[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_frequencies = [Counter(document) for document in documents]
+        self.lengths = [len(document) for document in documents]
+        self.average_length = sum(self.lengths) / len(documents) if documents else 0
+
+        document_frequencies = Counter(
+            term for frequencies in self.term_frequencies for term in frequencies
+        )
+        count = len(documents)
+        self.idf = {
+            term: math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in document_frequencies.items()
+        }
+
+    def scores(self, query: Iterable[str]) -> List[float]:
+        """Return the score of every document for the query terms."""
+        query_terms = set(query)
+        scores = []
+        for frequencies, length in zip(self.term_frequencies, self.lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / (self.average_length or 1))
+            for term in query_terms:
+                frequency = frequencies.get(term)
+                if frequency:
+                    score += (
+                        self.idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+                    )
+            scores.append(score)
+        return scores
+
+
+class TableRetriever(ABC):
+    """Base class to implement a new strategy to select the relevant tables."""
+
+    @abstractmethod
+    def score(self, question: str, dfs: List[DataFrame]) -> List[float]:
+        """
+        Score the relevance of each dataframe for a question.
+
+        Returns:
+            List[float]: One score per dataframe, 0 for unrelated dataframes.
+        """
+
+    def retrieve(self, question: str, dfs: List[DataFrame], k: int) -> List[DataFrame]:
+        """
+        Return the `k` most relevant dataframes for a question, in their
+        original order.
+        """
+        if len(dfs) <= k:
+            return list(dfs)
+
+        scores = self.score(question, dfs)
+        ranking = sorted(range(len(dfs)), key=lambda index: -scores[index])
+        return [dfs[index] for index in sorted(ranking[:k])]
+
+
+class BM25TableRetriever(TableRetriever):
+    """
+    Rank tables with BM25 over the terms of their schema.
+
+    The index of the last list of dataframes is kept and only rebuilt when the
+    schemas of the dataframes change. The retriever can be shared by the
+    agents of several threads.
+    """
+
+    def __init__(self):
+        self._key: Optional[Tuple[Tuple[str, ...], ...]] = None
+        self._index: Optional[BM25Index] = None
+        self._lock = threading.Lock()
+
+    def score(self, question: str, dfs: List[DataFrame]) -> List[float]:
+        documents = [schema_document(df) for df in dfs]
+        # Keyed on the content of the schemas, the ids of dataframes collected
+        # by the garbage collector can be reused by new ones
+        key = tuple(tuple(document) for document in documents)
+        with self._lock:
+            if key != self._key:
+                self._index = BM25Index(documents)
+                self._key = key
+            index = self._index
+        return index.scores(tokenize(question))
+
+
+default_retriever = BM25TableRetriever()
+
+
+def select_tables(context: AgentState) -> List[DataFrame]:
+    """Return the dataframes to include in the prompts of the context."""
+    max_tables = context.config.max_tables
+    if max_tables is None:
+        return context.dfs
+
+    retriever = context.config.table_retriever or default_retriever
+    return retriever.retrieve(get_question(context), context.dfs, max_tables)
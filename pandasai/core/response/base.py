@@ -1,5 +1,5 @@
 import json
-from typing import Any
+from typing import Any, Dict, Optional
 
 from pandasai.helpers.json_encoder import CustomJsonEncoder
 
@@ -9,6 +9,9 @@ class BaseResponse:
     Base class for different types of response values.
     """
 
+    # Time spent in each stage of the query, in seconds, when tracing is enabled
+    timings: Optional[Dict[str, float]] = None
+
     def __init__(
         self,
         value: Any = None,
@@ -1,17 +1,20 @@
 import base64
 import io
-from typing import Any
-
-from PIL import Image
+from typing import TYPE_CHECKING, Any
 
 from .base import BaseResponse
 
+if TYPE_CHECKING:
+    from PIL import Image
+
 
 class ChartResponse(BaseResponse):
     def __init__(self, value: Any, last_code_executed: str):
         super().__init__(value, "chart", last_code_executed)
 
-    def _get_image(self) -> Image.Image:
+    def _get_image(self) -> "Image.Image":
+        from PIL import Image
+
         if not self.value.startswith("data:image"):
             return Image.open(self.value)
 
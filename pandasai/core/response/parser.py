@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 
 from pandasai.exceptions import InvalidOutputValueMismatch
+from pandasai.helpers.tracing import tracer
 
 from .base import BaseResponse
 from .chart import ChartResponse
@@ -14,8 +15,9 @@ from .string import StringResponse
 
 class ResponseParser:
     def parse(self, result: dict, last_code_executed: str = None) -> BaseResponse:
-        self._validate_response(result)
-        return self._generate_response(result, last_code_executed)
+        with tracer.span("parse_response"):
+            self._validate_response(result)
+            return self._generate_response(result, last_code_executed)
 
     def _generate_response(self, result: dict, last_code_executed: str = None):
         if result["type"] == "number":
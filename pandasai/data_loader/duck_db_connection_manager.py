@@ -1,7 +1,6 @@
+import threading
 import weakref
 
-import duckdb
-
 from pandasai.query_builders.sql_parser import SQLParser
 
 
@@ -17,8 +16,13 @@ class DuckDBConnectionManager:
 
     def _init_connection(self):
         """Initialize a DuckDB connection."""
+        import duckdb
+
         self.connection = duckdb.connect()
         self._registered_tables = set()
+        # The connection is shared by the threads of the process, and DuckDB
+        # connections must not be used concurrently
+        self.lock = threading.RLock()
 
     @classmethod
     def _close_connection(cls):
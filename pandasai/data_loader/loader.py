@@ -12,7 +12,7 @@ from pandasai.helpers.path import (
 )
 from pandasai.helpers.sql_sanitizer import sanitize_sql_table_name
 
-from .. import ConfigManager
+from ..config import ConfigManager
 from ..constants import (
     LOCAL_SOURCE_TYPES,
 )
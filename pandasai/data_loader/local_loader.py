@@ -1,6 +1,5 @@
 import os
 
-import duckdb
 import pandas as pd
 
 from pandasai.dataframe.base import DataFrame
@@ -14,6 +13,7 @@ from ..constants import (
 from ..helpers.sql_sanitizer import is_sql_query_safe
 from .duck_db_connection_manager import DuckDBConnectionManager
 from .loader import DatasetLoader
+from .row_count import get_row_count
 from .semantic_layer_schema import SemanticLayerSchema
 
 
@@ -44,7 +44,12 @@ class LocalDatasetLoader(DatasetLoader):
             path=self.dataset_path,
         )
 
+    def get_row_count(self) -> int:
+        return get_row_count(self)
+
     def execute_query(self, query: str) -> pd.DataFrame:
+        import duckdb
+
         try:
             db_manager = DuckDBConnectionManager()
 
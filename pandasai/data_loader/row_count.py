@@ -0,0 +1,184 @@
+"""
+Strategies used to count the rows of a dataset.
+
+The row count only feeds the dimensions of the dataset shown in the prompt, so
+an estimate read from the table metadata or computed on a sample is usually
+good enough, and much cheaper than an exact `COUNT(*)` on large warehouse
+tables. The strategy is configured per dataset in the `row_count` section of
+its schema:
+
+    row_count:
+      strategy: metadata
+
+Strategies that do not apply to a dataset fall back to the next, cheaper to
+more expensive: metadata, then sample, then exact.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .semantic_layer_schema import RowCount
+
+if TYPE_CHECKING:
+    from .loader import DatasetLoader
+
+logger = logging.getLogger(__name__)
+
+
+class RowCountStrategy(ABC):
+    @abstractmethod
+    def get_row_count(self, loader: DatasetLoader) -> Optional[int]:
+        """
+        Count the rows of the dataset of a loader.
+
+        Returns:
+            Optional[int]: Number of rows, None if the strategy does not apply
+            to the dataset.
+        """
+
+
+class ExactRowCount(RowCountStrategy):
+    """Count the rows with a `COUNT(*)` query."""
+
+    def get_row_count(self, loader: DatasetLoader) -> Optional[int]:
+        result = loader.execute_query(loader.query_builder.get_row_count())
+        return int(result.iloc[0, 0])
+
+
+class MetadataRowCount(RowCountStrategy):
+    """Read the row count from the parquet footer or the table statistics."""
+
+    def get_row_count(self, loader: DatasetLoader) -> Optional[int]:
+        source = loader.schema.source
+        if source is None:
+            return None
+
+        if source.type == "parquet":
+            import pyarrow.parquet as pq
+
+            return pq.read_metadata(loader.query_builder.file_path).num_rows
+
+        query = loader.query_builder.get_metadata_row_count()
+        if query is None:
+            return None
+
+        return _first_positive_value(loader.execute_query(query))
+
+
+class SampledRowCount(RowCountStrategy):
+    """Estimate the row count by counting the rows of a `TABLESAMPLE`."""
+
+    def __init__(self, percent: float = 1.0):
+        self.percent = percent
+
+    def get_row_count(self, loader: DatasetLoader) -> Optional[int]:
+        query = loader.query_builder.get_sampled_row_count(self.percent)
+        if query is None:
+            return None
+
+        count = _first_positive_value(loader.execute_query(query))
+        if count is None:
+            return None
+        return round(count * 100 / self.percent)
+
+
+def _first_positive_value(result: pd.DataFrame) -> Optional[int]:
+    # Statistics of tables that were never analyzed are reported as 0 or -1
+    if result.empty or pd.isna(result.iloc[0, 0]):
+        return None
+    count = int(result.iloc[0, 0])
+    return count if count > 0 else None
+
+
+ROW_COUNT_STRATEGIES: Dict[str, Callable[[RowCount], List[RowCountStrategy]]] = {
+    "exact": lambda config: [ExactRowCount()],
+    "sample": lambda config: [
+        SampledRowCount(config.sample_percent),
+        ExactRowCount(),
+    ],
+    "metadata": lambda config: [
+        MetadataRowCount(),
+        SampledRowCount(config.sample_percent),
+        ExactRowCount(),
+    ],
+}
+
+
+def register_row_count_strategy(
+    name: str, factory: Callable[[RowCount], List[RowCountStrategy]]
+) -> None:
+    """
+    Register a row count strategy usable in the `row_count` section of schemas.
+
+    Args:
+        name (str): Name of the strategy.
+        factory (Callable): Builds, from the `row_count` configuration, the
+            strategies to try in order until one of them applies.
+    """
+    ROW_COUNT_STRATEGIES[name] = factory
+
+
+_cache: Dict[Tuple[str, str], Tuple[float, int]] = {}
+_cache_lock = threading.Lock()
+
+
+def get_row_count(loader: DatasetLoader) -> int:
+    """
+    Count the rows of the dataset of a loader with the strategy configured in
+    its schema, caching the result for `row_count.cache_ttl` seconds.
+    """
+    config = loader.schema.row_count or RowCount()
+    key = _cache_key(loader)
+
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    count = _count_rows(loader, config)
+
+    if config.cache_ttl:
+        with _cache_lock:
+            _cache[key] = (time.monotonic() + config.cache_ttl, count)
+    return count
+
+
+def _cache_key(loader: DatasetLoader) -> Tuple[str, str]:
+    return loader.dataset_path, loader.schema.model_dump_json()
+
+
+def _count_rows(loader: DatasetLoader, config: RowCount) -> int:
+    strategies = ROW_COUNT_STRATEGIES[config.strategy](config)
+    for strategy in strategies[:-1]:
+        try:
+            count = strategy.get_row_count(loader)
+        except Exception as e:
+            # Drivers raise their own errors, any failure falls back to the
+            # next strategy
+            logger.warning(
+                f"{type(strategy).__name__} failed for '{loader.dataset_path}', falling back: {e}"
+            )
+            continue
+        if count is not None:
+            return count
+
+    # The last strategy is the fallback of all the others and must apply
+    return strategies[-1].get_row_count(loader)
+
+
+def invalidate_row_count(loader: DatasetLoader) -> None:
+    """Drop the cached row count of the dataset of a loader."""
+    with _cache_lock:
+        _cache.pop(_cache_key(loader), None)
+
+
+def clear_row_count_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
@@ -9,7 +9,6 @@ from pydantic import (
     field_validator,
     model_validator,
 )
-from sqlglot import ParseError, parse_one
 
 from pandasai.constants import (
     LOCAL_SOURCE_TYPES,
@@ -67,6 +66,8 @@ class Column(BaseModel):
         if not expr:
             return None
 
+        from sqlglot import ParseError, parse_one
+
         try:
             parse_one(expr)
             return expr
@@ -267,6 +268,33 @@ class Destination(BaseModel):
         return format
 
 
+class RowCount(BaseModel):
+    strategy: str = Field(
+        "exact",
+        description="Strategy used to count the rows: exact, metadata or sample.",
+    )
+    sample_percent: float = Field(
+        1.0,
+        gt=0,
+        le=100,
+        description="Percentage of the table scanned by the sample strategy.",
+    )
+    cache_ttl: int = Field(
+        300, ge=0, description="Number of seconds the row count is cached for."
+    )
+
+    @field_validator("strategy")
+    @classmethod
+    def is_strategy_supported(cls, strategy: str) -> str:
+        from pandasai.data_loader.row_count import ROW_COUNT_STRATEGIES
+
+        if strategy not in ROW_COUNT_STRATEGIES:
+            raise ValueError(
+                f"Unsupported row count strategy: {strategy}. Supported strategies are: {list(ROW_COUNT_STRATEGIES)}"
+            )
+        return strategy
+
+
 class SemanticLayerSchema(BaseModel):
     name: str = Field(..., description="Dataset name.")
     source: Optional[Source] = Field(None, description="Data source for your dataset.")
@@ -299,6 +327,9 @@ class SemanticLayerSchema(BaseModel):
         None,
         description="List of columns to group by. Every non-aggregated column must be included in group_by.",
     )
+    row_count: Optional[RowCount] = Field(
+        None, description="How the rows of the dataset are counted."
+    )
 
     @model_validator(mode="after")
     def validate_schema(self) -> "SemanticLayerSchema":
@@ -13,6 +13,7 @@ from ..constants import (
 )
 from ..query_builders.sql_parser import SQLParser
 from .loader import DatasetLoader
+from .row_count import get_row_count
 from .semantic_layer_schema import SemanticLayerSchema
 
 
@@ -79,6 +80,4 @@ class SQLDatasetLoader(DatasetLoader):
         return self.execute_query(query)
 
     def get_row_count(self) -> int:
-        query = self.query_builder.get_row_count()
-        result = self.execute_query(query)
-        return result.iloc[0, 0]
+        return get_row_count(self)
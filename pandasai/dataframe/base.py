@@ -2,15 +2,12 @@ from __future__ import annotations
 
 import hashlib
 import os
-from io import BytesIO
+from contextlib import ExitStack
 from typing import TYPE_CHECKING, Optional, Union
-from zipfile import ZipFile
 
 import pandas as pd
 from pandas._typing import Axes, Dtype
 
-import pandasai as pai
-from pandasai import get_validated_dataset_path
 from pandasai.config import Config, ConfigManager
 from pandasai.core.response import BaseResponse
 from pandasai.data_loader.semantic_layer_schema import (
@@ -20,6 +17,8 @@ from pandasai.data_loader.semantic_layer_schema import (
 )
 from pandasai.exceptions import DatasetNotFound, PandaAIApiKeyError
 from pandasai.helpers.dataframe_serializer import DataframeSerializer
+from pandasai.helpers.dataset_transfer import MultipartStream, download_zip
+from pandasai.helpers.path import get_validated_dataset_path
 from pandasai.helpers.session import get_pandaai_session
 from pandasai.sandbox.sandbox import Sandbox
 
@@ -46,6 +45,10 @@ class DataFrame(pd.DataFrame):
         "path",
         "schema",
     ]
+    # Internal names are not copied to the frames derived with head(), filters
+    # or copy(), which must not serve the serialization of their parent
+    _internal_names = pd.DataFrame._internal_names + ["_serialized"]
+    _internal_names_set = set(_internal_names)
 
     def __init__(
         self,
@@ -135,10 +138,33 @@ class DataFrame(pd.DataFrame):
         """
         Serialize DataFrame to string representation.
 
+        The serialization is cached and reused as long as the version returned
+        by `_serialization_version` does not change.
+
         Returns:
             str: Serialized string representation of the DataFrame
         """
-        return DataframeSerializer.serialize(self)
+        version = self._serialization_version()
+        if version is None:
+            return DataframeSerializer.serialize(self)
+
+        cached = getattr(self, "_serialized", None)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        serialized = DataframeSerializer.serialize(self)
+        self._serialized = (version, serialized)
+        return serialized
+
+    def _serialization_version(self) -> Optional[tuple]:
+        """
+        Return a key identifying the data and schema version the serialization
+        depends on, or None when it cannot be tracked and must not be cached.
+
+        In-memory data can be modified in place without any cheap way to detect
+        it, and serializing it is cheap, so plain dataframes are never cached.
+        """
+        return None
 
     def get_head(self):
         return self.head()
@@ -168,25 +194,31 @@ class DataFrame(pd.DataFrame):
         schema_file_path = os.path.join(self.path, "schema.yaml")
         data_file_path = os.path.join(self.path, "data.parquet")
 
-        # Open schema.yaml
-        schema_file = file_manager.load_binary(schema_file_path)
-
-        files = [("files", ("schema.yaml", schema_file, "application/x-yaml"))]
-
-        # Check if data.parquet exists and open it
-        if file_manager.exists(data_file_path):
-            data_file = file_manager.load_binary(data_file_path)
-            files.append(
-                ("files", ("data.parquet", data_file, "application/octet-stream"))
+        # The files are streamed while the request is sent
+        with ExitStack() as stack:
+            schema_file = stack.enter_context(
+                file_manager.open_binary(schema_file_path)
+            )
+            files = [("files", ("schema.yaml", schema_file, "application/x-yaml"))]
+
+            # Check if data.parquet exists and open it
+            if file_manager.exists(data_file_path):
+                data_file = stack.enter_context(
+                    file_manager.open_binary(data_file_path)
+                )
+                files.append(
+                    ("files", ("data.parquet", data_file, "application/octet-stream"))
+                )
+
+            body = MultipartStream(files)
+
+            # Send the POST request
+            request_session.post(
+                "/datasets/push",
+                data=body,
+                params=params,
+                headers={**headers, "Content-Type": body.content_type},
             )
-
-        # Send the POST request
-        request_session.post(
-            "/datasets/push",
-            files=files,
-            params=params,
-            headers=headers,
-        )
 
         print("Your dataset was successfully pushed to the remote server!")
         print(f"🔗 URL: https://app.pandabi.ai/datasets/{self.path}")
@@ -201,17 +233,19 @@ class DataFrame(pd.DataFrame):
 
         headers = {"accept": "application/json", "x-authorization": f"Bearer {api_key}"}
 
-        file_data = request_session.get(
-            "/datasets/pull", headers=headers, params={"path": self.path}
-        )
-        if file_data.status_code != 200:
-            raise DatasetNotFound("Remote dataset not found to pull!")
+        with download_zip(
+            request_session,
+            "/datasets/pull",
+            headers=headers,
+            params={"path": self.path},
+        ) as zip_file:
+            if zip_file is None:
+                raise DatasetNotFound("Remote dataset not found to pull!")
 
-        with ZipFile(BytesIO(file_data.content)) as zip_file:
+            file_manager = ConfigManager.get().file_manager
             for file_name in zip_file.namelist():
                 target_path = os.path.join(self.path, file_name)
 
-                file_manager = ConfigManager.get().file_manager
                 # Check if the file already exists
                 if file_manager.exists(target_path):
                     print(f"Replacing existing file: {target_path}")
@@ -220,7 +254,8 @@ class DataFrame(pd.DataFrame):
                 file_manager.mkdir(os.path.dirname(target_path))
 
                 # Extract the file
-                file_manager.write_binary(target_path, zip_file.read(file_name))
+                with zip_file.open(file_name) as member:
+                    file_manager.write_stream(target_path, member)
 
         # Reloads the Dataframe
         from pandasai import DatasetLoader
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Optional
 
 import pandas as pd
 
+from pandasai.data_loader.row_count import invalidate_row_count
 from pandasai.dataframe.base import DataFrame
 from pandasai.exceptions import VirtualizationError
 
@@ -28,6 +29,7 @@ class VirtualDataFrame(DataFrame):
         if not self._loader:
             raise VirtualizationError("Data loader is required for virtualization!")
         self._head = None
+        self._serialized = None
 
         super().__init__(
             *args,
@@ -41,8 +43,20 @@ class VirtualDataFrame(DataFrame):
 
     @property
     def rows_count(self) -> int:
+        # Cached by the loader for the `row_count.cache_ttl` of the schema
         return self._loader.get_row_count()
 
+    def invalidate_cache(self) -> None:
+        """Drop the cached head, row count and serialization."""
+        self._head = None
+        invalidate_row_count(self._loader)
+        self._serialized = None
+
+    def _serialization_version(self) -> Optional[tuple]:
+        # The head is loaded once, so the data version is tracked through the
+        # row count, which is refreshed once its cache expires
+        return self.schema.model_dump_json(), self.rows_count
+
     @property
     def query_builder(self):
         return self._loader.query_builder
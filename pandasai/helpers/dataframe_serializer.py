@@ -1,4 +1,5 @@
 import typing
+from typing import List, Optional
 
 if typing.TYPE_CHECKING:
     from ..dataframe.base import DataFrame
@@ -9,11 +10,19 @@ class DataframeSerializer:
         pass
 
     @staticmethod
-    def serialize(df: "DataFrame", dialect: str = "postgres") -> str:
+    def serialize(
+        df: "DataFrame",
+        dialect: str = "postgres",
+        columns: Optional[List[str]] = None,
+        rows: Optional[int] = None,
+    ) -> str:
         """
         Convert df to csv like format where csv is wrapped inside <dataframe></dataframe>
         Args:
             df (pd.DataFrame): PandaAI dataframe or dataframe
+            columns (Optional[List[str]]): Columns of the sample rows, all by default
+            rows (Optional[int]): Maximum number of sample rows, all the rows of
+                the head by default
 
         Returns:
             str: dataframe stringify
@@ -27,7 +36,12 @@ class DataframeSerializer:
         dataframe_info += f' dimensions="{df.rows_count}x{df.columns_count}">'
 
         # Add dataframe details
-        dataframe_info += f"\n{df.head().to_csv(index=False)}"
+        head = df.head()
+        if columns is not None:
+            head = head[columns]
+        if rows is not None:
+            head = head.iloc[:rows]
+        dataframe_info += f"\n{head.to_csv(index=False)}"
 
         # Close the dataframe tag
         dataframe_info += "</table>\n"
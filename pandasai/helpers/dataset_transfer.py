@@ -0,0 +1,233 @@
+"""
+Streaming transfers of datasets to and from the PandaBI API.
+
+Datasets can be several gigabytes, so they are never held in memory: pulled
+archives are streamed to a file, resuming with range requests when the
+connection drops, and pushed files are read part by part while the request
+body is sent.
+"""
+
+import base64
+import hashlib
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+from zipfile import ZipFile
+
+from pandasai.exceptions import PandaAIApiCallError
+from pandasai.helpers.session import Session
+
+if TYPE_CHECKING:
+    import requests
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def download(
+    session: Session,
+    path: str,
+    file: BinaryIO,
+    headers: Optional[Dict[str, str]] = None,
+    params: Optional[dict] = None,
+    max_resumes: int = 3,
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """
+    Stream the body of a GET request into a file.
+
+    If the connection drops and the server accepts range requests, the
+    download resumes where it stopped. The size of the body is checked
+    against its `Content-Length` header, and its hash against its `Digest`
+    header if the server sends one.
+
+    Args:
+        session (Session): Session of the API.
+        path (str): Path of the endpoint.
+        file (BinaryIO): File the body is written to.
+        headers (dict, optional): Headers of the request.
+        params (dict, optional): Query parameters of the request.
+        max_resumes (int): Maximum number of times the download is resumed.
+        chunk_size (int): Size of the chunks written to the file.
+
+    Returns:
+        int: Status code of the response. Nothing is written to the file if
+        it is not 200.
+
+    Raises:
+        PandaAIApiCallError: If the download fails or is corrupted.
+    """
+    import requests
+
+    headers = dict(headers or {})
+    response = session.get(path, headers=headers, params=params, raw=True, stream=True)
+    try:
+        if response.status_code != 200:
+            return response.status_code
+
+        expected_size = _content_length(response)
+        expected_digest = _sha256_digest(response)
+        etag = response.headers.get("ETag")
+        resumable = response.headers.get("Accept-Ranges") == "bytes"
+
+        hasher = hashlib.sha256()
+        received = 0
+        resumes = 0
+        while True:
+            try:
+                for chunk in response.iter_content(chunk_size):
+                    file.write(chunk)
+                    hasher.update(chunk)
+                    received += len(chunk)
+                if expected_size is None or received >= expected_size:
+                    break
+                error = f"connection closed after {received} of {expected_size} bytes"
+            except requests.exceptions.RequestException as e:
+                error = str(e)
+
+            if not resumable or resumes >= max_resumes:
+                raise PandaAIApiCallError(f"Download failed: {error}")
+            resumes += 1
+
+            range_headers = {**headers, "Range": f"bytes={received}-"}
+            if etag:
+                range_headers["If-Range"] = etag
+            # Release the connection of the interrupted response
+            response.close()
+            response = session.get(
+                path, headers=range_headers, params=params, raw=True, stream=True
+            )
+            if response.status_code == 200:
+                # The dataset changed or the range was ignored: start over
+                file.seek(0)
+                file.truncate()
+                hasher = hashlib.sha256()
+                received = 0
+                expected_size = _content_length(response)
+                expected_digest = _sha256_digest(response)
+            elif response.status_code != 206:
+                raise PandaAIApiCallError(
+                    f"Download failed: resuming returned status {response.status_code}"
+                )
+    finally:
+        response.close()
+
+    if expected_size is not None and received != expected_size:
+        raise PandaAIApiCallError(
+            f"Download corrupted: received {received} of {expected_size} bytes"
+        )
+    if expected_digest is not None and hasher.digest() != expected_digest:
+        raise PandaAIApiCallError("Download corrupted: checksum mismatch")
+
+    return 200
+
+
+@contextmanager
+def download_zip(
+    session: Session,
+    path: str,
+    headers: Optional[Dict[str, str]] = None,
+    params: Optional[dict] = None,
+) -> Iterator[Optional[ZipFile]]:
+    """
+    Download a zip archive to a temporary file.
+
+    The CRC of each member is checked when it is read from the archive.
+
+    Yields:
+        Optional[ZipFile]: The archive, None if the response status is not 200.
+    """
+    with tempfile.TemporaryFile() as file:
+        if download(session, path, file, headers=headers, params=params) != 200:
+            yield None
+            return
+
+        file.seek(0)
+        with ZipFile(file) as zip_file:
+            yield zip_file
+
+
+def _content_length(response: "requests.Response") -> Optional[int]:
+    # The length of compressed bodies does not match the decoded content
+    if response.headers.get("Content-Encoding") not in (None, "identity"):
+        return None
+    length = response.headers.get("Content-Length")
+    return int(length) if length is not None else None
+
+
+def _sha256_digest(response: "requests.Response") -> Optional[bytes]:
+    for digest in response.headers.get("Digest", "").split(","):
+        algorithm, _, value = digest.strip().partition("=")
+        if algorithm.lower() == "sha-256" and value:
+            return base64.b64decode(value)
+    return None
+
+
+class MultipartStream:
+    """
+    `multipart/form-data` body read part by part.
+
+    The files are only read while the body is sent, and the length of the
+    body is known upfront, so it is sent with a `Content-Length` header
+    rather than chunked.
+
+    Args:
+        files (list): `(field, (filename, content, content_type))` tuples, like
+            the `files` argument of requests. The content is either bytes or a
+            binary file opened for reading.
+    """
+
+    def __init__(
+        self, files: List[Tuple[str, Tuple[str, Union[bytes, BinaryIO], str]]]
+    ):
+        self.boundary = uuid.uuid4().hex
+        self._parts: List[Union[bytes, BinaryIO]] = []
+        self._length = 0
+
+        for field, (filename, content, content_type) in files:
+            header = (
+                f"--{self.boundary}\r\n"
+                f'Content-Disposition: form-data; name="{field}"; '
+                f'filename="{filename}"\r\n'
+                f"Content-Type: {content_type}\r\n\r\n"
+            ).encode("utf-8")
+            self._add(header)
+            self._add(content)
+            self._add(b"\r\n")
+        self._add(f"--{self.boundary}--\r\n".encode("utf-8"))
+
+    def _add(self, part: Union[bytes, BinaryIO]) -> None:
+        if isinstance(part, (bytes, bytearray)):
+            self._length += len(part)
+        else:
+            position = part.tell()
+            self._length += part.seek(0, os.SEEK_END) - position
+            part.seek(position)
+        self._parts.append(part)
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: int = -1) -> bytes:
+        data = b""
+        while self._parts and (size < 0 or len(data) < size):
+            part = self._parts[0]
+            wanted = -1 if size < 0 else size - len(data)
+            if isinstance(part, (bytes, bytearray)):
+                chunk = part if wanted < 0 else part[:wanted]
+                rest = part[len(chunk) :]
+                if rest:
+                    self._parts[0] = rest
+                else:
+                    self._parts.pop(0)
+            else:
+                chunk = part.read(wanted)
+                if not chunk or wanted < 0:
+                    self._parts.pop(0)
+            data += chunk
+        return data
@@ -1,5 +1,8 @@
 import os
+import shutil
 from abc import ABC, abstractmethod
+from io import BytesIO
+from typing import BinaryIO
 
 from pandasai.helpers.path import find_project_root
 
@@ -42,6 +45,14 @@ class FileManager(ABC):
         """Returns the absolute path of {file_path}"""
         pass
 
+    def open_binary(self, file_path: str) -> BinaryIO:
+        """Opens a file for reading as bytes."""
+        return BytesIO(self.load_binary(file_path))
+
+    def write_stream(self, file_path: str, stream: BinaryIO) -> None:
+        """Writes the content of a binary stream to a file."""
+        self.write_binary(file_path, stream.read())
+
 
 class DefaultFileManager(FileManager):
     """Local file system implementation of FileLoader."""
@@ -73,3 +84,10 @@ class DefaultFileManager(FileManager):
 
     def abs_path(self, file_path: str) -> str:
         return os.path.join(self.base_path, file_path)
+
+    def open_binary(self, file_path: str) -> BinaryIO:
+        return open(self.abs_path(file_path), "rb")
+
+    def write_stream(self, file_path: str, stream: BinaryIO) -> None:
+        with open(self.abs_path(file_path), "wb") as f:
+            shutil.copyfileobj(stream, f)
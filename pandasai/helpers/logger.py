@@ -14,18 +14,26 @@ Example:
     logger.logs
     #["Hello, world!"]
     ```
+
+Messages are only formatted when they are emitted or read from `logs`: pass
+format arguments, or a callable for expensive messages, instead of a
+pre-formatted string.
+
+    ```python
+    logger.log("Prompt: %s", prompt)
+    logger.log("Request failed: %s", error, level=logging.ERROR)
+    logger.log(lambda: f"Prompt: {prompt.to_string()}")
+    ```
 """
 
-import inspect
 import logging
 import sys
 import time
-from typing import List
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional, Tuple, Union
 
 from pydantic import BaseModel
 
-from pandasai.helpers.telemetry import scarf_analytics
-
 from .path import find_closest
 
 
@@ -36,18 +44,51 @@ class Log(BaseModel):
     level: int
 
 
-class Logger:
-    """Logger class"""
+class _LazyMessage:
+    """Message formatted the first time it is converted to a string."""
 
-    _logs: List[Log]
+    __slots__ = ("_message", "_args", "_text")
+
+    def __init__(self, message: Union[str, Callable[[], str]], args: tuple):
+        self._message = message
+        self._args = args
+        self._text: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            message = self._message() if callable(self._message) else self._message
+            self._text = message % self._args if self._args else str(message)
+        return self._text
+
+
+class Logger:
+    """
+    Logger class
+
+    Args:
+        save_logs (bool): Write the logs to the `pandasai.log` file.
+        verbose (bool): Print the logs to the standard output.
+        level (int): Minimum level of the logged messages.
+        max_logs (int): Number of messages kept in `logs`, the oldest are
+            dropped first.
+    """
+
+    _logs: Deque[Tuple[_LazyMessage, int, float, Optional[str]]]
     _logger: logging.Logger
     _verbose: bool
     _last_time: float
 
-    def __init__(self, save_logs: bool = True, verbose: bool = False):
+    def __init__(
+        self,
+        save_logs: bool = True,
+        verbose: bool = False,
+        level: int = logging.INFO,
+        max_logs: int = 1000,
+    ):
         """Initialize the logger"""
-        self._logs = []
+        self._logs = deque(maxlen=max_logs)
         self._verbose = verbose
+        self._level = level
         self._last_time = time.time()
 
         if save_logs:
@@ -70,51 +111,65 @@ class Logger:
         )
         self._logger = logging.getLogger(__name__)
 
-    def log(self, message: str, level: int = logging.INFO):
-        """Log a message"""
-
-        if level == logging.INFO:
-            self._logger.info(message)
-        elif level == logging.WARNING:
-            self._logger.warning(message)
-        elif level == logging.ERROR:
-            self._logger.error(message)
-        elif level == logging.CRITICAL:
-            self._logger.critical(message)
+    def log(
+        self,
+        message: Union[str, Callable[[], str]],
+        *args: Any,
+        level: int = logging.INFO,
+    ):
+        """
+        Log a message
+
+        Args:
+            message (str | Callable): Message, or %-style format string of the
+                message, or function returning the message.
+            *args: Arguments of the format string.
+            level (int): Level of the message.
+        """
+        if level < self._level:
+            return
+
+        lazy_message = _LazyMessage(message, args)
+        if level >= logging.INFO:
+            self._logger.log(level, lazy_message)
 
         self._logs.append(
-            {
-                "msg": message,
-                "level": logging.getLevelName(level),
-                "time": self._calculate_time_diff(),
-                "source": self._invoked_from(),
-            }
+            (lazy_message, level, self._calculate_time_diff(), self._invoked_from())
         )
 
-    def _invoked_from(self, level: int = 5) -> str:
+    def _invoked_from(self, level: int = 5) -> Optional[str]:
         """Return the name of the class that invoked the logger"""
-        calling_class = None
-        for frame_info in inspect.stack()[1:]:
-            frame_locals = frame_info[0].f_locals
-            calling_instance = frame_locals.get("self")
-            if calling_instance and calling_instance.__class__ != self.__class__:
-                calling_class = calling_instance.__class__.__name__
-                break
+        # Skip the frames of `_invoked_from` and `log`
+        frame = sys._getframe(2)
+        while frame is not None and level > 0:
+            calling_instance = frame.f_locals.get("self")
+            if calling_instance is not None and not isinstance(
+                calling_instance, Logger
+            ):
+                return calling_instance.__class__.__name__
+            frame = frame.f_back
             level -= 1
-            if level <= 0:
-                break
-        return calling_class
+        return None
 
     def _calculate_time_diff(self):
         """Calculate the time difference since the last log"""
-        time_diff = time.time() - self._last_time
-        self._last_time = time.time()
+        now = time.time()
+        time_diff = now - self._last_time
+        self._last_time = now
         return time_diff
 
     @property
-    def logs(self) -> List[str]:
+    def logs(self) -> List[dict]:
         """Return the logs"""
-        return self._logs
+        return [
+            {
+                "msg": str(message),
+                "level": logging.getLevelName(level),
+                "time": time_diff,
+                "source": source,
+            }
+            for message, level, time_diff, source in self._logs
+        ]
 
     @property
     def verbose(self) -> bool:
@@ -150,6 +205,3 @@ class Logger:
             for handler in self._logger.handlers:
                 if isinstance(handler, logging.FileHandler):
                     self._logger.removeHandler(handler)
-
-
-scarf_analytics()
@@ -1,33 +1,74 @@
 """ Memory class to store the conversations """
-from typing import Union
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, Union
 
+from pandasai.helpers.tokenizer import ApproximateTokenizer, Tokenizer
+
+# Number of messages kept by default, when the conversation window is smaller
+DEFAULT_MAX_MESSAGES = 100
 
-class Memory:
-    """Memory class to store the conversations"""
 
-    _messages: list
+class Memory:
+    """Memory class to store the conversations
+
+    Messages are kept in a ring buffer along with their rendering and their
+    number of tokens, computed once when they are added, so that rendering
+    the conversation does not grow with its length.
+
+    Args:
+        memory_size (int): Number of messages of the conversation rendered
+            in the prompts.
+        agent_description (str, optional): Description of the agent, used as
+            system prompt.
+        max_messages (int, optional): Number of messages kept, the oldest
+            ones are dropped. Defaults to the memory size, and at least 100.
+        tokenizer (Tokenizer, optional): Tokenizer counting the tokens of the
+            messages. Defaults to an approximation based on the number of
+            characters.
+    """
+
+    _messages: Deque[dict]
     _memory_size: int
     agent_description: str
 
     def __init__(
-        self, memory_size: int = 1, agent_description: Union[str, None] = None
+        self,
+        memory_size: int = 1,
+        agent_description: Union[str, None] = None,
+        max_messages: Optional[int] = None,
+        tokenizer: Optional[Tokenizer] = None,
     ):
-        self._messages = []
         self._memory_size = memory_size
+        self._max_messages = max_messages or max(memory_size or 0, DEFAULT_MAX_MESSAGES)
+        self._tokenizer = tokenizer or ApproximateTokenizer()
         self.agent_description = agent_description
+        self.clear()
 
     def add(self, message: str, is_user: bool):
+        role = "user" if is_user else "assistant"
         self._messages.append({"message": message, "is_user": is_user})
+        self._rendered.append(self._render(message, is_user))
+        self._tokens.append(self._tokenizer.count_tokens(str(message)))
+        self._json.append({"role": role, "message": message})
+        self._openai_messages.append({"role": role, "content": message})
+        self._views.clear()
 
     def count(self) -> int:
         return len(self._messages)
 
     def all(self) -> list:
-        return self._messages
+        return list(self._messages)
 
     def last(self) -> dict:
         return self._messages[-1]
 
+    def remove_oldest(self) -> None:
+        """Remove the oldest message of the conversation"""
+        for messages in self._buffers():
+            messages.popleft()
+        self._views.clear()
+
     def _truncate(self, message: Union[str, int], max_length: int = 100) -> str:
         """
         Truncates the message if it is longer than max_length
@@ -36,52 +77,78 @@ class Memory:
             f"{message[:max_length]} ..." if len(str(message)) > max_length else message
         )
 
+    def _render(self, message: Union[str, int], is_user: bool) -> str:
+        if is_user:
+            return f"### QUERY\n {message}"
+        return f"### ANSWER\n {self._truncate(message)}"
+
+    def _window(self, messages: Deque, limit: Optional[int]) -> list:
+        """Return the last `limit` items of a buffer, all of them if 0"""
+        if not limit or limit >= len(messages):
+            return list(messages)
+        return list(islice(reversed(messages), limit))[::-1]
+
+    def _view(self, key: Any, render) -> Any:
+        """Return a rendering of the conversation, cached until it changes"""
+        try:
+            return self._views[key]
+        except KeyError:
+            view = self._views[key] = render()
+            return view
+
     def get_messages(self, limit: int = None) -> list:
         """
         Returns the conversation messages based on limit parameter
         or default memory size
         """
         limit = self._memory_size if limit is None else limit
-
-        return [
-            f"{'### QUERY' if message['is_user'] else '### ANSWER'}\n {message['message'] if message['is_user'] else self._truncate(message['message'])}"
-            for message in self._messages[-limit:]
-        ]
+        return self._window(self._rendered, limit)
 
     def get_conversation(self, limit: int = None) -> str:
         """
         Returns the conversation messages based on limit parameter
         or default memory size
         """
-        return "\n".join(self.get_messages(limit))
+        limit = self._memory_size if limit is None else limit
+        return self._view(
+            ("conversation", limit), lambda: "\n".join(self.get_messages(limit))
+        )
 
     def get_previous_conversation(self) -> str:
         """
         Returns the previous conversation but the last message
         """
-        messages = self.get_messages(self._memory_size)
-        return "" if len(messages) <= 1 else "\n".join(messages[:-1])
+
+        def render() -> str:
+            messages = self.get_messages(self._memory_size)
+            return "" if len(messages) <= 1 else "\n".join(messages[:-1])
+
+        return self._view("previous_conversation", render)
 
     def get_last_message(self) -> str:
         """
         Returns the last message in the conversation
         """
-        messages = self.get_messages(self._memory_size)
-        return "" if len(messages) == 0 else messages[-1]
+        return self._rendered[-1] if self._rendered else ""
+
+    def count_tokens(self, limit: int = None) -> int:
+        """
+        Returns the number of tokens of the conversation messages based on
+        limit parameter or default memory size
+        """
+        limit = self._memory_size if limit is None else limit
+        return sum(self._window(self._tokens, limit))
 
     def to_json(self):
-        messages = []
-        for message in self.all():
-            if message["is_user"]:
-                messages.append({"role": "user", "message": message["message"]})
-            else:
-                messages.append({"role": "assistant", "message": message["message"]})
-        return messages
+        return list(self._json)
 
     def to_openai_messages(self):
         """
         Returns the conversation messages in the format expected by the OpenAI API
         """
+        return self._with_system_message(self._openai_messages)
+
+    def _with_system_message(self, openai_messages) -> list:
         messages = []
         if self.agent_description:
             messages.append(
@@ -90,16 +157,99 @@ class Memory:
                     "content": self.agent_description,
                 }
             )
-        for message in self.all():
-            if message["is_user"]:
-                messages.append({"role": "user", "content": message["message"]})
-            else:
-                messages.append({"role": "assistant", "content": message["message"]})
+        messages.extend(openai_messages)
         return messages
 
+    def window(self, limit: int) -> "MemoryWindow":
+        """
+        Returns a read-only view of the last `limit` messages, rendered like
+        the memory itself. The memory is left untouched.
+        """
+        return MemoryWindow(self, limit)
+
     def clear(self):
-        self._messages = []
+        self._messages = deque(maxlen=self._max_messages)
+        self._rendered: Deque[str] = deque(maxlen=self._max_messages)
+        self._tokens: Deque[int] = deque(maxlen=self._max_messages)
+        self._json: Deque[dict] = deque(maxlen=self._max_messages)
+        self._openai_messages: Deque[dict] = deque(maxlen=self._max_messages)
+        self._views: Dict[Any, Any] = {}
+
+    def _buffers(self) -> List[Deque]:
+        return [
+            self._messages,
+            self._rendered,
+            self._tokens,
+            self._json,
+            self._openai_messages,
+        ]
 
     @property
     def size(self):
         return self._memory_size
+
+
+class MemoryWindow:
+    """Read-only view of the last messages of a memory"""
+
+    def __init__(self, memory: Memory, limit: int):
+        self._memory = memory
+        self._limit = limit
+
+    @property
+    def agent_description(self) -> Optional[str]:
+        return self._memory.agent_description
+
+    @property
+    def size(self):
+        return self._memory.size
+
+    def _bound(self, limit: Optional[int]) -> int:
+        limit = self._memory.size if limit is None else limit
+        return min(limit, self._limit) if limit else self._limit
+
+    def count(self) -> int:
+        return min(self._memory.count(), self._limit)
+
+    def all(self) -> list:
+        return self._memory._window(self._memory._messages, self._limit)
+
+    def last(self) -> dict:
+        return self._memory.last()
+
+    def get_messages(self, limit: int = None) -> list:
+        return self._memory.get_messages(self._bound(limit))
+
+    def get_conversation(self, limit: int = None) -> str:
+        return self._memory.get_conversation(self._bound(limit))
+
+    def get_previous_conversation(self) -> str:
+        messages = self.get_messages()
+        return "" if len(messages) <= 1 else "\n".join(messages[:-1])
+
+    def get_last_message(self) -> str:
+        return self._memory.get_last_message()
+
+    def count_tokens(self, limit: int = None) -> int:
+        return self._memory.count_tokens(self._bound(limit))
+
+    def to_json(self):
+        return self._memory._window(self._memory._json, self._limit)
+
+    def to_openai_messages(self):
+        return self._memory._with_system_message(
+            self._memory._window(self._memory._openai_messages, self._limit)
+        )
+
+
+def get_prompt_memory(context: Any) -> Optional[Union[Memory, MemoryWindow]]:
+    """
+    Returns the conversation of a context rendered in the prompts, limited to
+    the messages fitted into the prompt budget if any
+    """
+    if context is None:
+        return None
+    limit = getattr(context, "conversation_limit", None)
+    if isinstance(limit, int):
+        return context.memory.window(limit)
+    return context.memory
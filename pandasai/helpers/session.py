@@ -2,30 +2,56 @@
 
 import logging
 import os
+import threading
 import traceback
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 from urllib.parse import urljoin
 
-import requests
-
 from pandasai.constants import DEFAULT_API_URL
 from pandasai.exceptions import PandaAIApiCallError, PandaAIApiKeyError
 from pandasai.helpers import load_dotenv
 from pandasai.helpers.logger import Logger
 
+if TYPE_CHECKING:
+    import requests
+
 load_dotenv()
 
 
 class Session:
+    """
+    Client of the PandaBI API.
+
+    Requests go through a pooled `requests.Session`, so that connections are
+    kept alive between calls. Idempotent requests are retried with an
+    exponential backoff on connection errors and on 429 and 5xx responses.
+
+    Args:
+        endpoint_url (str, optional): URL of the API. Defaults to the
+            `PANDABI_API_URL` environment variable.
+        api_key (str, optional): API key. Defaults to the `PANDABI_API_KEY`
+            environment variable.
+        logger (Logger, optional): Logger of the failed requests.
+        pool_size (int): Maximum number of connections kept alive.
+        max_retries (int): Maximum number of retries of idempotent requests.
+        backoff_factor (float): Base delay in seconds between retries, doubled
+            after each retry.
+    """
+
     _api_key: str
     _endpoint_url: str
     _logger: Logger
 
+    retry_status_codes = (429, 500, 502, 503, 504)
+
     def __init__(
         self,
         endpoint_url: Optional[str] = None,
         api_key: Optional[str] = None,
         logger: Optional[Logger] = None,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
     ) -> None:
         if api_key is None:
             api_key = os.environ.get("PANDABI_API_KEY") or None
@@ -39,6 +65,35 @@ class Session:
         self._endpoint_url = endpoint_url
         self._version_path = "/api"
         self._logger = logger or Logger()
+        self._http = self._create_http_session(pool_size, max_retries, backoff_factor)
+
+    def _create_http_session(
+        self, pool_size: int, max_retries: int, backoff_factor: float
+    ) -> "requests.Session":
+        # requests is only imported when the first session is created, to keep
+        # it out of the import time of the package
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.retry_status_codes,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self) -> None:
+        """Close the connections kept alive."""
+        self._http.close()
 
     def get(self, path=None, **kwargs):
         return self.make_request("GET", path, **kwargs)
@@ -64,8 +119,27 @@ class Session:
         data=None,
         json=None,
         timeout=300,
+        raw=False,
         **kwargs,
     ):
+        """
+        Send a request to the API.
+
+        Args:
+            raw (bool): Return the response without parsing its body, for
+                binary downloads. Combine with `stream=True` to read the body
+                in chunks.
+
+        Returns:
+            The JSON body of the response, or the response itself if `raw` is
+            set or if its body is not JSON.
+
+        Raises:
+            PandaAIApiCallError: If the request fails or the API returns an
+                error.
+        """
+        import requests
+
         try:
             url = urljoin(self._endpoint_url, self._version_path + path)
             if headers is None:
@@ -74,7 +148,7 @@ class Session:
                     "Content-Type": "application/json",  # or any other headers you need
                 }
 
-            response = requests.request(
+            response = self._http.request(
                 method,
                 url,
                 headers=headers,
@@ -85,6 +159,9 @@ class Session:
                 **kwargs,
             )
 
+            if raw:
+                return response
+
             try:
                 data = response.json()
             except ValueError:
@@ -100,13 +177,22 @@ class Session:
             return data
 
         except requests.exceptions.RequestException as e:
-            self._logger.log(f"Request failed: {traceback.format_exc()}", logging.ERROR)
+            self._logger.log(
+                "Request failed: %s", traceback.format_exc(), level=logging.ERROR
+            )
             raise PandaAIApiCallError(f"Request failed: {e}") from e
 
 
+_sessions: Dict[Tuple[str, str], Session] = {}
+_sessions_lock = threading.Lock()
+
+
 def get_pandaai_session() -> Session:
     """Get a requests session with the PandaAI API key.
 
+    The session is shared by all the calls made with the same API URL and key,
+    so that they reuse its connections.
+
     Returns:
         requests.Session: Session with API key.
     """
@@ -116,4 +202,9 @@ def get_pandaai_session() -> Session:
     if not api_url or not api_key:
         raise PandaAIApiKeyError()
 
-    return Session(endpoint_url=api_url, api_key=api_key)
+    with _sessions_lock:
+        session = _sessions.get((api_url, api_key))
+        if session is None:
+            session = Session(endpoint_url=api_url, api_key=api_key)
+            _sessions[(api_url, api_key)] = session
+        return session
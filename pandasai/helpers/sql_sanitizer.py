@@ -1,8 +1,6 @@
 import os
 import re
 
-import sqlglot
-
 
 def sanitize_view_column_name(relation_name: str) -> str:
     return ".".join(list(map(sanitize_sql_table_name, relation_name.split("."))))
@@ -26,6 +24,8 @@ def sanitize_file_name(filepath: str) -> str:
 
 
 def is_sql_query_safe(query: str, dialect: str = "postgres") -> bool:
+    import sqlglot
+
     try:
         # List of infected keywords to block (you can add more)
         infected_keywords = [
@@ -1,22 +1,41 @@
 import os
 import platform
-
-import requests
+import threading
 
 from pandasai.__version__ import __version__
 
+_sent = False
+_lock = threading.Lock()
 
-def scarf_analytics():
+
+def _send():
     try:
-        if (
-            os.getenv("SCARF_NO_ANALYTICS") != "true"
-            and os.getenv("DO_NOT_TRACK") != "true"
-        ):
-            requests.get(
-                "https://package.pandabi.ai/pandasai-telemetry?version="
-                + __version__
-                + "&platform="
-                + platform.system()
-            )
+        import requests
+
+        requests.get(
+            "https://package.pandabi.ai/pandasai-telemetry?version="
+            + __version__
+            + "&platform="
+            + platform.system(),
+            timeout=5,
+        )
     except Exception:
         pass
+
+
+def scarf_analytics():
+    """
+    Send the anonymous usage ping once per process, in a background thread so
+    that it never delays the caller.
+    """
+    global _sent
+
+    if os.getenv("SCARF_NO_ANALYTICS") == "true" or os.getenv("DO_NOT_TRACK") == "true":
+        return
+
+    with _lock:
+        if _sent:
+            return
+        _sent = True
+
+    threading.Thread(target=_send, name="pandasai-telemetry", daemon=True).start()
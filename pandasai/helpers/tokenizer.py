@@ -0,0 +1,40 @@
+"""Tokenizers used to measure the size of prompts."""
+
+import math
+from abc import ABC, abstractmethod
+
+
+class Tokenizer(ABC):
+    """Base class to implement a new tokenizer."""
+
+    @abstractmethod
+    def count_tokens(self, text: str) -> int:
+        """Return the number of tokens of a text."""
+
+
+class ApproximateTokenizer(Tokenizer):
+    """Estimate the number of tokens from the length of the text.
+
+    Most LLM tokenizers produce about one token every four characters of
+    English text or code, which is precise enough to keep prompts in budget
+    without depending on the tokenizer of a specific model.
+    """
+
+    def __init__(self, chars_per_token: float = 4.0):
+        self.chars_per_token = chars_per_token
+
+    def count_tokens(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+
+class TiktokenTokenizer(Tokenizer):
+    """Count tokens exactly with the `tiktoken` encodings of OpenAI models."""
+
+    def __init__(self, encoding_name: str = "cl100k_base"):
+        from pandasai.core.code_execution.environment import import_dependency
+
+        tiktoken = import_dependency("tiktoken")
+        self._encoding = tiktoken.get_encoding(encoding_name)
+
+    def count_tokens(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
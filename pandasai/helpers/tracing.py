@@ -0,0 +1,323 @@
+"""
+Latency tracing of the stages of a query.
+
+Every query answered by an agent is a trace made of timed spans: building the
+prompt, calling the LLM, validating and cleaning the code, running SQL
+queries, executing the code and parsing the response. Finished spans are sent
+to the exporters registered on the global `tracer`, and the time spent in each
+stage is attached to the response as `timings`.
+
+Example:
+    ```python
+    from pandasai.helpers.tracing import InMemorySpanExporter, tracer
+
+    exporter = InMemorySpanExporter()
+    tracer.add_exporter(exporter)
+
+    response = df.chat("What is the average salary?")
+    response.timings
+    # {"query": 2.31, "prompt": 0.01, "generate_code": 2.2, "llm": 2.1, ...}
+    ```
+
+Tracing is disabled unless an exporter is registered or `enable_tracing` is
+set in the config, in which case spans cost a context variable lookup.
+"""
+
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar(
+    "pandasai_current_span", default=None
+)
+
+
+class Span:
+    """
+    Timed stage of a query.
+
+    Attributes:
+        name (str): Name of the stage.
+        trace_id (str): Identifier shared by the spans of a query.
+        span_id (str): Identifier of the span.
+        parent_id (str, optional): Identifier of the enclosing span.
+        start_time (int): Start time, in nanoseconds since the epoch.
+        end_time (int, optional): End time, None while the span is running.
+        attributes (dict): Attributes of the stage.
+        error (str, optional): Exception raised in the stage.
+    """
+
+    is_recording = True
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        parent: Optional["Span"] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes or {})
+        self.start_time = 0
+        self.end_time: Optional[int] = None
+        self.error: Optional[str] = None
+
+        self._tracer = tracer
+        self._root = parent._root if parent else self
+        self._finished: List[Span] = []
+        self._start = 0
+        self._duration = 0.0
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def duration(self) -> float:
+        """Duration of the span, in seconds."""
+        return self._duration
+
+    def timings(self) -> Dict[str, float]:
+        """
+        Return the time spent in each stage of the trace, in seconds.
+
+        Stages run several times, for instance when the code is regenerated
+        after an error, are summed.
+        """
+        timings: Dict[str, float] = {}
+        for span in self._root._finished:
+            timings[span.name] = timings.get(span.name, 0.0) + span.duration
+        return timings
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def __enter__(self) -> "Span":
+        self.start_time = time.time_ns()
+        self._start = time.perf_counter()
+        self._token = _current_span.set(self)
+        self._tracer._on_start(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._duration = time.perf_counter() - self._start
+        self.end_time = self.start_time + int(self._duration * 1e9)
+        if exc_value is not None:
+            self.error = f"{exc_type.__name__}: {exc_value}"
+        _current_span.reset(self._token)
+        self._root._finished.append(self)
+        self._tracer._on_end(self)
+
+
+class _NoopSpan:
+    """Span returned when tracing is disabled."""
+
+    is_recording = False
+    attributes: Dict[str, Any] = {}
+    duration = 0.0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def timings(self) -> Dict[str, float]:
+        return {}
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter(ABC):
+    """Base class to implement a new destination for the spans."""
+
+    def on_start(self, span: Span) -> None:
+        """Called when a span starts."""
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        """Called when a span ends."""
+
+    def shutdown(self) -> None:
+        """Release the resources of the exporter."""
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keep the finished spans in memory, mostly for tests and notebooks."""
+
+    def __init__(self):
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class JsonlSpanExporter(SpanExporter):
+    """
+    Append the finished spans to a file, one JSON object per line.
+
+    Args:
+        path (str): Path of the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+
+class OpenTelemetrySpanExporter(SpanExporter):
+    """
+    Mirror the spans as OpenTelemetry spans, so that they are processed by
+    the exporters configured in the OpenTelemetry SDK.
+
+    Args:
+        tracer (opentelemetry.trace.Tracer, optional): Tracer creating the
+            spans. Defaults to the tracer of the global tracer provider.
+    """
+
+    def __init__(self, tracer=None):
+        from pandasai.core.code_execution.environment import import_dependency
+
+        self._trace = import_dependency("opentelemetry.trace")
+        self._tracer = tracer or self._trace.get_tracer("pandasai")
+        self._spans: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span) -> None:
+        with self._lock:
+            parent = self._spans.get(span.parent_id)
+        context = self._trace.set_span_in_context(parent) if parent else None
+        otel_span = self._tracer.start_span(
+            span.name, context=context, start_time=span.start_time
+        )
+        with self._lock:
+            self._spans[span.span_id] = otel_span
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            otel_span = self._spans.pop(span.span_id, None)
+        if otel_span is None:
+            return
+
+        otel_span.set_attributes(
+            {
+                f"pandasai.{key}": value
+                for key, value in span.attributes.items()
+                if isinstance(value, (str, bool, int, float))
+            }
+        )
+        if span.error is not None:
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+            otel_span.set_attribute("exception.message", span.error)
+        otel_span.end(end_time=span.end_time)
+
+
+class Tracer:
+    """Create the spans and send them to the exporters."""
+
+    def __init__(self):
+        self._exporters: List[SpanExporter] = []
+
+    @property
+    def exporters(self) -> List[SpanExporter]:
+        return list(self._exporters)
+
+    def add_exporter(self, exporter: SpanExporter) -> None:
+        self._exporters = [*self._exporters, exporter]
+
+    def remove_exporter(self, exporter: SpanExporter) -> None:
+        self._exporters = [e for e in self._exporters if e is not exporter]
+        exporter.shutdown()
+
+    def start_trace(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        enabled: bool = False,
+    ):
+        """
+        Start the root span of a query.
+
+        Args:
+            name (str): Name of the span.
+            attributes (dict, optional): Attributes of the span.
+            enabled (bool): Record the trace even without exporters, for its
+                timings.
+
+        Returns:
+            Span: Context manager of the span, a no-op span if tracing is
+            disabled.
+        """
+        if not (enabled or self._exporters):
+            return NOOP_SPAN
+        return Span(self, name, _current_span.get(), attributes)
+
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        """
+        Start a span in the current trace.
+
+        Outside of a trace, a new trace is started if exporters are
+        registered, otherwise a no-op span is returned.
+        """
+        parent = _current_span.get()
+        if parent is None and not self._exporters:
+            return NOOP_SPAN
+        return Span(self, name, parent, attributes)
+
+    def current_span(self):
+        """Return the running span, or a no-op span outside of a trace."""
+        return _current_span.get() or NOOP_SPAN
+
+    def _on_start(self, span: Span) -> None:
+        for exporter in self._exporters:
+            exporter.on_start(span)
+
+    def _on_end(self, span: Span) -> None:
+        for exporter in self._exporters:
+            exporter.export(span)
+
+
+tracer = Tracer()
@@ -1,7 +1,11 @@
 from .bamboo_llm import BambooLLM
 from .base import LLM
+from .rate_limited import RateLimitedLLM
+from .router import LLMRouter
 
 __all__ = [
     "LLM",
     "BambooLLM",
+    "RateLimitedLLM",
+    "LLMRouter",
 ]
@@ -3,11 +3,13 @@ from __future__ import annotations
 import ast
 import re
 from abc import abstractmethod
-from typing import TYPE_CHECKING, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Iterator, Optional
 
 from pandasai.core.prompts.base import BasePrompt
 from pandasai.core.prompts.generate_system_message import GenerateSystemMessagePrompt
 from pandasai.helpers.memory import Memory
+from pandasai.llm.streaming import CodeBlockDetector
 
 from ..exceptions import (
     APIKeyNotFoundError,
@@ -20,9 +22,17 @@ if TYPE_CHECKING:
 
 
 class LLM:
-    """Base class to implement a new LLM."""
+    """Base class to implement a new LLM.
+
+    Attributes:
+        last_prompt (str, optional): Last prompt sent to the LLM.
+        streaming (bool): Stream the completions when generating code, and
+            stop them as soon as the code block is closed. Only LLMs that
+            implement `stream` actually stream.
+    """
 
     last_prompt: Optional[str] = None
+    streaming: bool = False
 
     def __init__(self, api_key: Optional[str] = None, **kwargs: Any) -> None:
         """Initialize LLM.
@@ -169,5 +179,95 @@ class LLM:
             str: A string of Python code.
 
         """
+        if self.streaming:
+            return self._generate_code_streaming(instruction, context)
+
         response = self.call(instruction, context)
         return self._extract_code(response)
+
+    def generate_code_candidates(
+        self, instruction: BasePrompt, context: AgentState, n: int
+    ) -> Iterator[str]:
+        """
+        Generate several candidate codes for the instruction, yielding each one
+        as soon as it is generated.
+
+        By default, the LLM is called n times in parallel. Candidates only
+        differ when the LLM samples with a temperature above 0.
+
+        Args:
+            instruction (BasePrompt): Prompt with instruction for LLM.
+            context (AgentState): AgentState.
+            n (int): Number of candidates.
+
+        Yields:
+            str: Python code of a candidate. Responses without valid code are
+            skipped, the last error is raised if no candidate is valid.
+        """
+        executor = ThreadPoolExecutor(max_workers=n, thread_name_prefix="pandasai-llm")
+        futures = [
+            executor.submit(self._generate_candidate, instruction, context)
+            for _ in range(n)
+        ]
+        error = None
+        generated = False
+        try:
+            for future in as_completed(futures):
+                try:
+                    code = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                generated = True
+                yield code
+        finally:
+            # Once a candidate is chosen, the calls not started are cancelled
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        if not generated and error is not None:
+            raise error
+
+    def _generate_candidate(self, instruction: BasePrompt, context: AgentState) -> str:
+        return self.generate_code(instruction, context)
+
+    def stream(
+        self, instruction: BasePrompt, context: AgentState = None
+    ) -> Iterator[str]:
+        """
+        Execute the LLM with given prompt, yielding the response in chunks as
+        it is generated.
+
+        LLMs supporting streaming override this method and stop the request
+        when the iterator is closed. By default, the whole response is
+        yielded at once.
+
+        Args:
+            instruction (BasePrompt): A prompt object with instruction for LLM.
+            context (AgentState, optional): AgentState. Defaults to None.
+
+        Yields:
+            str: Chunks of the response.
+        """
+        yield self.call(instruction, context)
+
+    def _generate_code_streaming(
+        self, instruction: BasePrompt, context: AgentState
+    ) -> str:
+        """
+        Generate the code from a streamed response, stopping the stream once
+        the code block is closed.
+        """
+        detector = CodeBlockDetector()
+        chunks = self.stream(instruction, context)
+        try:
+            for chunk in chunks:
+                if detector.feed(chunk):
+                    break
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+        return self._extract_code(detector.text)
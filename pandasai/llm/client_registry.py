@@ -0,0 +1,214 @@
+"""
+Process-wide registry of the OpenAI SDK clients.
+
+Every client of the OpenAI SDK holds a pool of HTTP connections. LLMs built
+on the SDK, such as the OpenAI, Azure OpenAI and local OpenAI-compatible
+LLMs, get their client from the registry, so that the LLMs created for each
+agent or request share the connections, and their TLS handshakes, instead of
+opening new ones.
+
+Clients are shared between the LLMs with the same client class, base URL,
+credentials and proxy. The size of the pools and the keep-alive of the idle
+connections can be tuned:
+
+Example:
+    ```python
+    from pandasai.llm.client_registry import client_registry
+
+    client_registry.configure(
+        max_connections=50, max_keepalive_connections=20, keepalive_expiry=60
+    )
+    ```
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from pandasai.core.code_execution.environment import import_dependency
+
+# Limits of the default HTTP client of the SDK, for the limits not configured
+DEFAULT_LIMITS = {
+    "max_connections": 1000,
+    "max_keepalive_connections": 100,
+    "keepalive_expiry": 5.0,
+}
+
+
+def _freeze(value: Any) -> Hashable:
+    """Return a hashable representation of a client parameter."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class ClientRegistry:
+    """
+    Cache of the OpenAI SDK clients, shared by the LLMs of the process.
+
+    Args:
+        max_connections (int, optional): Maximum number of connections of
+            each client. Defaults to the limit of the SDK.
+        max_keepalive_connections (int, optional): Maximum number of idle
+            connections kept open by each client.
+        keepalive_expiry (float, optional): Time after which idle connections
+            are closed, in seconds.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+    ):
+        self._limits: Dict[str, Any] = {}
+        self._clients: Dict[Tuple, Any] = {}
+        # Async clients are bound to the event loop they are used in
+        self._async_clients: "weakref.WeakKeyDictionary[Any, Dict[Tuple, Any]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._loopless_async_clients: Dict[Tuple, Any] = {}
+        self._lock = threading.Lock()
+        self.configure(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+
+    def configure(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+    ) -> None:
+        """
+        Set the limits of the connection pools. The LLMs created afterwards
+        get new clients with these limits.
+
+        The clients already created are forgotten by the registry but not
+        closed: the LLMs created before keep using them, and own them from
+        then on. Their connections are released when the LLMs are garbage
+        collected, or right away by calling `close()` before reconfiguring
+        once no LLM uses them anymore.
+        """
+        limits = {
+            "max_connections": max_connections,
+            "max_keepalive_connections": max_keepalive_connections,
+            "keepalive_expiry": keepalive_expiry,
+        }
+        with self._lock:
+            self._limits = {key: val for key, val in limits.items() if val is not None}
+            self._forget()
+
+    def get(self, client_class: type, proxy: Optional[str] = None, **params) -> Any:
+        """
+        Return the shared client for the given parameters, creating it if
+        needed.
+
+        Args:
+            client_class (type): Client class of the SDK, such as
+                `openai.OpenAI`.
+            proxy (str, optional): URL of the proxy the requests go through.
+            **params: Parameters of the client, such as `base_url` and
+                `api_key`.
+        """
+        key = self._key(client_class, proxy, params)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = self._create(
+                    client_class, proxy, params, is_async=False
+                )
+            return client
+
+    def get_async(
+        self, client_class: type, proxy: Optional[str] = None, **params
+    ) -> Any:
+        """
+        Return the shared async client for the given parameters, such as an
+        `openai.AsyncOpenAI` client. Clients are shared within an event loop.
+        """
+        key = self._key(client_class, proxy, params)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        with self._lock:
+            if loop is None:
+                clients = self._loopless_async_clients
+            else:
+                clients = self._async_clients.setdefault(loop, {})
+            client = clients.get(key)
+            if client is None:
+                client = clients[key] = self._create(
+                    client_class, proxy, params, is_async=True
+                )
+            return client
+
+    def close(self) -> None:
+        """
+        Close the connections of the sync clients and forget all clients.
+        Async clients are closed with their event loop.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            self._forget()
+        for client in clients:
+            client.close()
+
+    def _key(self, client_class: type, proxy: Optional[str], params: dict) -> Tuple:
+        return (client_class, proxy, _freeze(params))
+
+    def _create(
+        self, client_class: type, proxy: Optional[str], params: dict, is_async: bool
+    ) -> Any:
+        http_client = self._http_client(proxy, is_async)
+        if http_client is not None:
+            params = {**params, "http_client": http_client}
+        return client_class(**params)
+
+    def _http_client(self, proxy: Optional[str], is_async: bool) -> Any:
+        # Without proxy or limits, the SDK creates its default HTTP client
+        if proxy is None and not self._limits:
+            return None
+
+        openai = import_dependency("openai")
+        factory = getattr(
+            openai,
+            "DefaultAsyncHttpxClient" if is_async else "DefaultHttpxClient",
+            None,
+        )
+        httpx = None
+        if factory is None or self._limits:
+            httpx = import_dependency("httpx")
+        if factory is None:
+            # openai < 1.17
+            factory = httpx.AsyncClient if is_async else httpx.Client
+
+        kwargs: Dict[str, Any] = {}
+        if proxy is not None:
+            kwargs["proxy"] = proxy
+        if self._limits:
+            kwargs["limits"] = httpx.Limits(**{**DEFAULT_LIMITS, **self._limits})
+        return factory(**kwargs)
+
+    def _forget(self) -> None:
+        self._clients = {}
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._loopless_async_clients = {}
+
+
+client_registry = ClientRegistry()
+
+if hasattr(os, "register_at_fork"):
+    # The connections of the parent process must not be used by its children
+    os.register_at_fork(after_in_child=client_registry._forget)
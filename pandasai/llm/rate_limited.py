@@ -0,0 +1,301 @@
+"""
+Coordination of the calls to an LLM shared by several agents.
+
+`RateLimitedLLM` wraps any LLM and, for every agent using it:
+
+- keeps the requests and tokens per minute under the limits of the provider
+  with token buckets,
+- bounds the number of concurrent requests,
+- coalesces identical prompts in flight into a single request, so that the
+  same question asked by many users at once costs one completion,
+- retries rate limited and failed requests with jittered exponential backoff.
+
+Example:
+    ```python
+    from pandasai.llm import RateLimitedLLM
+    from pandasai_openai import OpenAI
+
+    llm = RateLimitedLLM(
+        OpenAI(api_token="..."),
+        requests_per_minute=500,
+        tokens_per_minute=200_000,
+        max_concurrency=8,
+    )
+    pai.config.set({"llm": llm})
+    ```
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, Type
+
+from pandasai.core.prompts.base import BasePrompt
+from pandasai.helpers.memory import get_prompt_memory
+from pandasai.helpers.tokenizer import ApproximateTokenizer, Tokenizer
+
+from .base import LLM
+
+if TYPE_CHECKING:
+    from pandasai.agent.state import AgentState
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a rate per minute.
+
+    Args:
+        rate_per_minute (float): Number of tokens added per minute.
+        capacity (float, optional): Maximum number of tokens, the size of the
+            largest burst. Defaults to the rate per minute.
+        clock (Callable): Monotonic clock, in seconds.
+        sleep (Callable): Function waiting for a number of seconds.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+
+        self.rate = rate_per_minute / 60
+        self.capacity = capacity or rate_per_minute
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def acquire(self, amount: float = 1) -> float:
+        """
+        Take tokens from the bucket, waiting until enough are available.
+
+        Amounts larger than the capacity wait for a full bucket rather than
+        forever.
+
+        Returns:
+            float: Number of seconds waited.
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+    def consume(self, amount: float) -> None:
+        """
+        Take tokens from the bucket without waiting, for usage only known once
+        the request is done. The bucket may go into debt, delaying the next
+        requests.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+
+
+class _Flight:
+    """Request in flight, shared by the callers of an identical prompt."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+class RateLimitedLLM(LLM):
+    """
+    LLM wrapper coordinating the calls made to another LLM.
+
+    Args:
+        llm (LLM): LLM called.
+        requests_per_minute (float, optional): Maximum number of requests per
+            minute.
+        tokens_per_minute (float, optional): Maximum number of prompt and
+            completion tokens per minute.
+        max_concurrency (int, optional): Maximum number of requests in flight.
+        coalesce (bool): Share the response of identical prompts in flight.
+        max_retries (int): Maximum number of retries of a failed request.
+        backoff_factor (float): Base delay of the retries, in seconds. The
+            n-th retry waits a random delay up to `backoff_factor * 2 ** n`.
+        max_backoff (float): Maximum delay between two retries, in seconds.
+        retry_on (tuple, optional): Exceptions retried. By default, errors with
+            a 408, 409, 429 or 5xx status code, timeouts, connection errors
+            and rate limit errors of the provider SDKs are retried.
+        tokenizer (Tokenizer, optional): Tokenizer estimating the tokens of the
+            prompts and completions.
+    """
+
+    def __init__(
+        self,
+        llm: LLM,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        coalesce: bool = True,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        max_backoff: float = 60.0,
+        retry_on: Optional[Tuple[Type[BaseException], ...]] = None,
+        tokenizer: Optional[Tokenizer] = None,
+    ):
+        super().__init__()
+        self.llm = llm
+        self.coalesce = coalesce
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_on = retry_on
+        self.tokenizer = tokenizer or ApproximateTokenizer()
+
+        self._request_bucket = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self._token_bucket = (
+            TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        )
+        self._semaphore = (
+            threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        )
+        self._flights: Dict[str, _Flight] = {}
+        self._flights_lock = threading.Lock()
+
+    @property
+    def type(self) -> str:
+        return self.llm.type
+
+    @property
+    def last_prompt(self) -> Optional[str]:
+        return self.llm.last_prompt
+
+    @last_prompt.setter
+    def last_prompt(self, value: Optional[str]) -> None:
+        self.llm.last_prompt = value
+
+    def is_pandasai_llm(self) -> bool:
+        return self.llm.is_pandasai_llm()
+
+    def _polish_code(self, code: str) -> str:
+        return self.llm._polish_code(code)
+
+    def call(self, instruction: BasePrompt, context: AgentState = None) -> str:
+        if not self.coalesce:
+            return self._call_with_retries(instruction, context)
+
+        key = self._coalescing_key(instruction, context)
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._flights[key] = _Flight()
+
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._call_with_retries(instruction, context)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _generate_candidate(self, instruction: BasePrompt, context: AgentState) -> str:
+        # Candidates of the same prompt are meant to differ, they are not
+        # coalesced
+        return self._extract_code(self._call_with_retries(instruction, context))
+
+    def _coalescing_key(self, instruction: BasePrompt, context: AgentState) -> str:
+        # The response also depends on the conversation sent with the prompt
+        memory = get_prompt_memory(context)
+        conversation = (
+            (memory.agent_description, memory.all()) if memory is not None else None
+        )
+        return hashlib.sha256(
+            repr((instruction.to_string(), conversation)).encode("utf-8")
+        ).hexdigest()
+
+    def _call_with_retries(self, instruction: BasePrompt, context: AgentState) -> str:
+        prompt_tokens = (
+            self.tokenizer.count_tokens(instruction.to_string())
+            if self._token_bucket
+            else 0
+        )
+
+        attempt = 0
+        while True:
+            if self._request_bucket:
+                self._request_bucket.acquire()
+            if self._token_bucket:
+                self._token_bucket.acquire(prompt_tokens)
+
+            try:
+                if self._semaphore:
+                    with self._semaphore:
+                        response = self.llm.call(instruction, context)
+                else:
+                    response = self.llm.call(instruction, context)
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                attempt += 1
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if self._token_bucket:
+                self._token_bucket.consume(self.tokenizer.count_tokens(response))
+            return response
+
+    def _backoff(self, attempt: int) -> float:
+        """Return a random delay before a retry, with full jitter."""
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        )
+
+    def _is_retryable(self, error: Exception) -> bool:
+        if self.retry_on is not None:
+            return isinstance(error, self.retry_on)
+
+        status_code = getattr(error, "status_code", None)
+        if status_code is None:
+            status_code = getattr(getattr(error, "response", None), "status_code", None)
+        if status_code is not None:
+            return status_code in RETRYABLE_STATUS_CODES
+
+        name = type(error).__name__
+        return isinstance(error, (TimeoutError, ConnectionError)) or any(
+            marker in name for marker in ("RateLimit", "Timeout", "Connection")
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        # Expose the attributes of the wrapped LLM, such as its model
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
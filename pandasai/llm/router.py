@@ -0,0 +1,300 @@
+"""
+Routing of the calls between several LLMs by observed latency and errors.
+
+`LLMRouter` wraps several backends, for instance the same model served by
+OpenAI, Azure OpenAI and a local server. Every call goes to the backend with
+the lowest expected latency, the median latency of its recent calls adjusted
+for its error rate, and falls back to the next backends when it fails.
+
+With hedging enabled, a duplicate request is sent to the next backend when
+the first one is slower than usual, after a percentile of its latency, and
+the first valid response is kept. This trims the tail latency set by the
+slowest provider, at the cost of a few duplicate requests.
+
+Example:
+    ```python
+    from pandasai.llm import LLMRouter
+    from pandasai_local import LocalLLM
+    from pandasai_openai import AzureOpenAI, OpenAI
+
+    llm = LLMRouter(
+        [OpenAI(api_token="..."), AzureOpenAI(...)],
+        hedge=True,
+        correction_llm=LocalLLM(api_base="http://localhost:11434/v1"),
+    )
+    pai.config.set({"llm": llm})
+    ```
+"""
+
+from __future__ import annotations
+
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, TypeVar
+
+from pandasai.core.prompts.base import BasePrompt
+from pandasai.helpers.tracing import tracer
+
+from .base import LLM
+
+if TYPE_CHECKING:
+    from pandasai.agent.state import AgentState
+
+T = TypeVar("T")
+
+# Number of calls observed before the latency of a backend is trusted
+MIN_SAMPLES = 5
+
+
+class BackendStats:
+    """
+    Latency and error rate of the recent calls to a backend.
+
+    Args:
+        window (int): Number of latencies kept.
+        error_decay (float): Weight of the last call in the error rate, an
+            exponential moving average.
+    """
+
+    def __init__(self, window: int = 100, error_decay: float = 0.2):
+        self.calls = 0
+        self.errors = 0
+        self.error_rate = 0.0
+        self._error_decay = error_decay
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self._latencies.append(latency)
+            self.error_rate *= 1 - self._error_decay
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.calls += 1
+            self.errors += 1
+            self.error_rate = self.error_rate * (1 - self._error_decay) + (
+                self._error_decay
+            )
+
+    @property
+    def samples(self) -> int:
+        return len(self._latencies)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Return the q-th percentile of the latencies, None without calls."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        rank = max(math.ceil(q / 100 * len(latencies)), 1)
+        return latencies[rank - 1]
+
+    def expected_latency(self) -> float:
+        """
+        Return the median latency divided by the success rate, the expected
+        time to get a response when failed calls are retried.
+        """
+        median = self.percentile(50)
+        if median is None:
+            # Backends never called are tried first
+            return 0.0
+        return median / (1 - min(self.error_rate, 0.99))
+
+
+class LLMRouter(LLM):
+    """
+    LLM routing each call to the fastest of several backends.
+
+    Args:
+        llms (List[LLM]): Backends, in order of preference until their
+            latency is known.
+        hedge (bool): Send a duplicate request to the next backend when the
+            first one does not respond in time, and keep the first valid
+            response.
+        hedge_percentile (float): Percentile of the latency of a backend after
+            which the duplicate request is sent.
+        hedge_after (float, optional): Fixed delay, in seconds, after which the
+            duplicate request is sent, instead of the percentile.
+        correction_llm (LLM, optional): Backend answering the prompts
+            correcting the code after an execution error, typically a faster
+            model. The other backends are its fallbacks.
+        window (int): Number of latencies kept per backend.
+    """
+
+    def __init__(
+        self,
+        llms: List[LLM],
+        hedge: bool = False,
+        hedge_percentile: float = 95,
+        hedge_after: Optional[float] = None,
+        correction_llm: Optional[LLM] = None,
+        window: int = 100,
+    ):
+        if not llms:
+            raise ValueError("LLMRouter requires at least one LLM")
+
+        super().__init__()
+        self.llms = list(llms)
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_after = hedge_after
+        self.correction_llm = correction_llm
+
+        self._stats: Dict[int, BackendStats] = {
+            id(llm): BackendStats(window) for llm in self._backends()
+        }
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def type(self) -> str:
+        return "router"
+
+    @property
+    def stats(self) -> List[Dict[str, Any]]:
+        """Latency and errors observed for each backend."""
+        stats = []
+        for llm in self._backends():
+            backend = self._stats[id(llm)]
+            stats.append(
+                {
+                    "llm": llm.type,
+                    "calls": backend.calls,
+                    "errors": backend.errors,
+                    "error_rate": backend.error_rate,
+                    "p50": backend.percentile(50),
+                    "p95": backend.percentile(95),
+                }
+            )
+        return stats
+
+    def call(self, instruction: BasePrompt, context: AgentState = None) -> str:
+        return self._route(lambda llm: llm.call(instruction, context), context)
+
+    def generate_code(self, instruction: BasePrompt, context: AgentState) -> str:
+        # Each backend extracts its own code, so that a response without
+        # valid code falls back to the next backend
+        return self._route(lambda llm: llm.generate_code(instruction, context), context)
+
+    def _backends(self) -> List[LLM]:
+        backends = [*self.llms]
+        if self.correction_llm is not None and self.correction_llm not in backends:
+            backends.append(self.correction_llm)
+        return backends
+
+    def _candidates(self, context: Optional[AgentState]) -> List[LLM]:
+        """Return the backends to try, the fastest first."""
+        ranked = sorted(
+            self.llms, key=lambda llm: self._stats[id(llm)].expected_latency()
+        )
+        is_correction = getattr(context, "retry_count", 0) > 0
+        if is_correction and self.correction_llm is not None:
+            return [self.correction_llm] + [
+                llm for llm in ranked if llm is not self.correction_llm
+            ]
+        return ranked
+
+    def _hedge_delay(self, llm: LLM) -> Optional[float]:
+        """Return the delay before hedging a call to the backend."""
+        if self.hedge_after is not None:
+            return self.hedge_after
+        stats = self._stats[id(llm)]
+        if stats.samples < MIN_SAMPLES:
+            return None
+        return stats.percentile(self.hedge_percentile)
+
+    def _timed(self, llm: LLM, request: Callable[[LLM], T]) -> T:
+        stats = self._stats[id(llm)]
+        start = time.perf_counter()
+        try:
+            result = request(llm)
+        except Exception:
+            stats.record_error()
+            raise
+        stats.record_success(time.perf_counter() - start)
+        return result
+
+    def _route(self, request: Callable[[LLM], T], context: AgentState) -> T:
+        candidates = self._candidates(context)
+        if self.hedge and len(candidates) > 1:
+            return self._route_hedged(request, candidates)
+
+        error: Optional[Exception] = None
+        for llm in candidates:
+            try:
+                result = self._timed(llm, request)
+            except Exception as e:
+                error = e
+                continue
+            self._on_response(llm, hedged=False)
+            return result
+        raise error
+
+    def _route_hedged(self, request: Callable[[LLM], T], candidates: List[LLM]) -> T:
+        executor = self._get_executor()
+        remaining = iter(candidates)
+        pending: Dict[Future, LLM] = {}
+
+        def submit() -> Optional[LLM]:
+            llm = next(remaining, None)
+            if llm is not None:
+                # Spans and logs of the request belong to the trace of the call
+                context = contextvars.copy_context()
+                future = executor.submit(context.run, self._timed, llm, request)
+                pending[future] = llm
+            return llm
+
+        delay = self._hedge_delay(submit())
+        hedged = False
+        error: Optional[Exception] = None
+        while pending:
+            done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+            if not done:
+                # The first backend is slower than usual, a single duplicate
+                # request is sent
+                hedged = submit() is not None
+                delay = None
+                continue
+
+            for future in done:
+                llm = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+
+                # Requests already sent cannot be interrupted, they finish in
+                # the background and their responses are discarded
+                for other in pending:
+                    other.cancel()
+                self._on_response(llm, hedged=hedged)
+                return result
+
+            if not pending:
+                # Every request failed, the next backend is hedged after its
+                # own latency
+                llm = submit()
+                delay = self._hedge_delay(llm) if llm is not None else None
+        raise error
+
+    def _on_response(self, llm: LLM, hedged: bool) -> None:
+        self.last_prompt = llm.last_prompt
+        span = tracer.current_span()
+        if span.is_recording:
+            span.set_attributes({"llm_backend": llm.type, "hedged": hedged})
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=4 * len(self._stats),
+                    thread_name_prefix="pandasai-llm-router",
+                )
+            return self._executor
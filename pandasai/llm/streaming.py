@@ -0,0 +1,55 @@
+"""
+Detection of the code block of a completion while it is streamed.
+
+The code generated by the LLM is the first fenced block of the completion.
+Anything the model writes after the closing fence is discarded, so a streamed
+completion can be stopped as soon as the block closes, saving the output
+tokens and letting the validation of the code start right away.
+"""
+
+
+class CodeBlockDetector:
+    """
+    Accumulate the chunks of a completion until its first code block closes.
+
+    Only the text received since the previous chunk is searched, so fences
+    split across chunks are found without scanning the completion again.
+
+    Args:
+        separator (str): Fence delimiting the code block.
+    """
+
+    def __init__(self, separator: str = "```"):
+        self.separator = separator
+        self.text = ""
+        self.closed = False
+        self._search_from = 0
+        self._fences = 0
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Add a chunk of the completion.
+
+        Returns:
+            bool: True once the closing fence of the first code block has
+            been received. The text then stops at the closing fence.
+        """
+        if self.closed or not chunk:
+            return self.closed
+
+        self.text += chunk
+        while True:
+            index = self.text.find(self.separator, self._search_from)
+            if index == -1:
+                # The end of the text may be the start of a fence
+                self._search_from = max(
+                    self._search_from, len(self.text) - len(self.separator) + 1
+                )
+                return False
+
+            self._fences += 1
+            self._search_from = index + len(self.separator)
+            if self._fences == 2:
+                self.text = self.text[: self._search_from]
+                self.closed = True
+                return True
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from sqlglot import select
 from sqlglot.optimizer.normalize_identifiers import normalize_identifiers
@@ -44,6 +44,20 @@ class BaseQueryBuilder:
     def get_row_count(self):
         return select("COUNT(*)").from_(self._get_table_expression()).sql(pretty=True)
 
+    def get_metadata_row_count(self) -> Optional[str]:
+        """
+        Return a query reading the row count from the table metadata, or None
+        if the source does not expose it.
+        """
+        return None
+
+    def get_sampled_row_count(self, percent: float) -> Optional[str]:
+        """
+        Return a query counting the rows of a sample of `percent` percent of
+        the table, or None if the source does not support sampling.
+        """
+        return None
+
     def _get_columns(self) -> list[str]:
         if not self.schema.columns:
             return ["*"]
@@ -1,6 +1,6 @@
 import os
 
-from .. import ConfigManager
+from ..config import ConfigManager
 from ..data_loader.semantic_layer_schema import SemanticLayerSchema
 from .base_query_builder import BaseQueryBuilder
 
@@ -10,13 +10,17 @@ class LocalQueryBuilder(BaseQueryBuilder):
         super().__init__(schema)
         self.dataset_path = dataset_path
 
-    def _get_table_expression(self) -> str:
+    @property
+    def file_path(self) -> str:
         filemanager = ConfigManager.get().file_manager
         filepath = os.path.join(
             self.dataset_path,
             self.schema.source.path,
         )
-        abspath = filemanager.abs_path(filepath)
+        return filemanager.abs_path(filepath)
+
+    def _get_table_expression(self) -> str:
+        abspath = self.file_path
         source_type = self.schema.source.type
 
         if source_type == "parquet":
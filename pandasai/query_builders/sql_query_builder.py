@@ -1,8 +1,75 @@
+from typing import Optional
+
 from sqlglot.optimizer.normalize_identifiers import normalize_identifiers
 
 from .base_query_builder import BaseQueryBuilder
 
+TABLESAMPLE_SOURCE_TYPES = ["postgres", "snowflake", "bigquery", "databricks"]
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
 
 class SqlQueryBuilder(BaseQueryBuilder):
     def _get_table_expression(self) -> str:
         return normalize_identifiers(self.schema.source.table.lower()).sql()
+
+    def get_metadata_row_count(self) -> Optional[str]:
+        source = self.schema.source
+        *qualifiers, table = source.table.split(".")
+        namespace = qualifiers[-1] if qualifiers else None
+
+        if source.type == "postgres":
+            query = (
+                "SELECT CAST(c.reltuples AS BIGINT) FROM pg_class AS c "
+                "JOIN pg_namespace AS n ON n.oid = c.relnamespace "
+                f"WHERE c.relname = {_quote(table.lower())}"
+            )
+            if namespace:
+                return f"{query} AND n.nspname = {_quote(namespace.lower())}"
+            return f"{query} AND PG_TABLE_IS_VISIBLE(c.oid)"
+
+        if source.type == "mysql":
+            database = namespace or source.connection.database
+            return (
+                "SELECT table_rows FROM information_schema.tables "
+                f"WHERE table_schema = {_quote(database)} "
+                f"AND table_name = {_quote(table)}"
+            )
+
+        if source.type == "snowflake":
+            query = (
+                "SELECT row_count FROM information_schema.tables "
+                f"WHERE table_name = {_quote(table.upper())}"
+            )
+            if namespace:
+                return f"{query} AND table_schema = {_quote(namespace.upper())}"
+            return query
+
+        if source.type == "bigquery" and namespace:
+            dataset = ".".join(qualifiers)
+            return (
+                f"SELECT row_count FROM {dataset}.__TABLES__ "
+                f"WHERE table_id = {_quote(table)}"
+            )
+
+        if source.type == "oracle":
+            query = (
+                "SELECT num_rows FROM all_tables "
+                f"WHERE table_name = {_quote(table.upper())}"
+            )
+            if namespace:
+                return f"{query} AND owner = {_quote(namespace.upper())}"
+            return query
+
+        return None
+
+    def get_sampled_row_count(self, percent: float) -> Optional[str]:
+        if self.schema.source.type not in TABLESAMPLE_SOURCE_TYPES:
+            return None
+
+        return (
+            f"SELECT COUNT(*) FROM {self._get_table_expression()} "
+            f"TABLESAMPLE SYSTEM ({percent} PERCENT)"
+        )
@@ -1,21 +1,23 @@
 import re
-from typing import Dict
+from typing import TYPE_CHECKING, Dict
 
 from sqlglot import exp, expressions, parse_one, select
 from sqlglot.expressions import Subquery
 from sqlglot.optimizer.normalize_identifiers import normalize_identifiers
 
-from ..data_loader.loader import DatasetLoader
 from ..data_loader.semantic_layer_schema import SemanticLayerSchema
 from ..helpers.sql_sanitizer import sanitize_view_column_name
 from .base_query_builder import BaseQueryBuilder
 
+if TYPE_CHECKING:
+    from ..data_loader.loader import DatasetLoader
+
 
 class ViewQueryBuilder(BaseQueryBuilder):
     def __init__(
         self,
         schema: SemanticLayerSchema,
-        schema_dependencies_dict: Dict[str, DatasetLoader],
+        schema_dependencies_dict: Dict[str, "DatasetLoader"],
     ):
         super().__init__(schema)
         self.schema_dependencies_dict = schema_dependencies_dict
@@ -80,7 +82,7 @@ class ViewQueryBuilder(BaseQueryBuilder):
         query = query.limit(n)
         return query.sql(pretty=True)
 
-    def _get_sub_query_from_loader(self, loader: DatasetLoader) -> Subquery:
+    def _get_sub_query_from_loader(self, loader: "DatasetLoader") -> Subquery:
         sub_query = parse_one(loader.query_builder.build_query())
         return exp.Subquery(this=sub_query, alias=loader.schema.name)
 
@@ -1,3 +1,18 @@
+from typing import TYPE_CHECKING
+
 from .sandbox import Sandbox
 
-__all__ = ["Sandbox"]
+if TYPE_CHECKING:
+    from .process_pool_sandbox import ProcessPoolSandbox
+
+
+def __getattr__(name: str):
+    # The process pool loads pyarrow, it is only imported when used
+    if name == "ProcessPoolSandbox":
+        from .process_pool_sandbox import ProcessPoolSandbox
+
+        return ProcessPoolSandbox
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["Sandbox", "ProcessPoolSandbox"]
@@ -0,0 +1,373 @@
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+import traceback
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from pandasai.exceptions import CodeExecutionError, NoResultFoundError
+
+from .sandbox import Sandbox
+
+try:
+    import resource
+    import signal
+except ImportError:  # pragma: no cover - resource limits are POSIX only
+    resource = None
+    signal = None
+
+logger = logging.getLogger(__name__)
+
+
+def dataframe_to_ipc(df: pd.DataFrame) -> bytes:
+    """Encode a dataframe as an Arrow IPC stream.
+
+    Args:
+        df (pd.DataFrame): Dataframe to encode.
+
+    Returns:
+        bytes: Arrow IPC stream bytes.
+    """
+    table = pa.Table.from_pandas(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def dataframe_from_ipc(data: bytes) -> pd.DataFrame:
+    """Decode an Arrow IPC stream produced by `dataframe_to_ipc`."""
+    return pa.ipc.open_stream(data).read_all().to_pandas()
+
+
+def _encode_result(result):
+    if (
+        isinstance(result, dict)
+        and result.get("type") == "dataframe"
+        and isinstance(result.get("value"), (pd.DataFrame, pd.Series))
+    ):
+        value = result["value"]
+        if isinstance(value, pd.Series):
+            value = value.to_frame()
+        try:
+            return {**result, "value": dataframe_to_ipc(value)}, True
+        except (pa.ArrowException, TypeError, ValueError):
+            # Fall back to pickling for frames Arrow cannot represent
+            return result, False
+    return result, False
+
+
+def _decode_result(result, is_ipc: bool):
+    if is_ipc:
+        return {**result, "value": dataframe_from_ipc(result["value"])}
+    return result
+
+
+class _CPUTimeLimitExceeded(Exception):
+    pass
+
+
+def _raise_cpu_time_limit_exceeded(signum, frame):
+    raise _CPUTimeLimitExceeded("CPU time limit exceeded")
+
+
+def _apply_limits(memory_limit: Optional[int], cpu_time_limit: Optional[int]):
+    if resource is None:
+        return
+
+    _, hard_as = resource.getrlimit(resource.RLIMIT_AS)
+    resource.setrlimit(
+        resource.RLIMIT_AS,
+        (memory_limit if memory_limit else hard_as, hard_as),
+    )
+
+    _, hard_cpu = resource.getrlimit(resource.RLIMIT_CPU)
+    if cpu_time_limit:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        used = int(usage.ru_utime + usage.ru_stime)
+        resource.setrlimit(resource.RLIMIT_CPU, (used + cpu_time_limit, hard_cpu))
+    else:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard_cpu, hard_cpu))
+
+
+def _reset_limits():
+    if resource is None:
+        return
+
+    for limit in (resource.RLIMIT_AS, resource.RLIMIT_CPU):
+        _, hard = resource.getrlimit(limit)
+        resource.setrlimit(limit, (hard, hard))
+
+
+def _worker_main(conn) -> None:
+    """Entry point of a sandbox worker process.
+
+    Heavy libraries are imported once, when the worker boots, so that tasks
+    only pay for the execution of the code itself.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+    from pandasai.core.code_execution.environment import get_environment
+
+    base_environment = get_environment()
+
+    if signal is not None and hasattr(signal, "SIGXCPU"):
+        signal.signal(signal.SIGXCPU, _raise_cpu_time_limit_exceeded)
+
+    conn.send(("ready",))
+
+    def execute_sql_query(sql_query: str) -> pd.DataFrame:
+        conn.send(("sql", sql_query))
+        status, payload = conn.recv()
+        if status == "sql_error":
+            raise RuntimeError(payload)
+        return dataframe_from_ipc(payload)
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+
+        if message[0] == "stop":
+            break
+
+        _, code, memory_limit, cpu_time_limit = message
+        environment = dict(base_environment)
+        environment["execute_sql_query"] = execute_sql_query
+
+        try:
+            _apply_limits(memory_limit, cpu_time_limit)
+            exec(code, environment)
+        except BaseException:
+            _reset_limits()
+            conn.send(("error", traceback.format_exc()))
+            continue
+
+        _reset_limits()
+
+        if "result" not in environment:
+            conn.send(("no_result", "No result returned"))
+            continue
+
+        try:
+            conn.send(("result", _encode_result(environment["result"])))
+        except Exception:
+            conn.send(("error", traceback.format_exc()))
+
+
+class _Worker:
+    """Handle on a single worker process and the parent end of its pipe."""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn,), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self._ready = False
+
+    def wait_until_ready(self) -> None:
+        """Block until the worker has finished importing its libraries."""
+        if not self._ready:
+            self.conn.recv()
+            self._ready = True
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self) -> None:
+        if self.process.is_alive():
+            try:
+                self.conn.send(("stop",))
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ProcessPoolSandbox(Sandbox):
+    """Sandbox executing code in a pool of pre-started worker processes.
+
+    Every worker imports pandas, numpy and matplotlib once at start-up and then
+    executes tasks with per-task address space and CPU time limits and a
+    wall-clock timeout. Calls to `execute_sql_query` are proxied back to the
+    parent process and the resulting dataframes are exchanged as Arrow IPC
+    streams. A worker that times out or crashes is killed and replaced.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 2,
+        timeout: Optional[float] = 60,
+        memory_limit: Optional[int] = None,
+        cpu_time_limit: Optional[int] = None,
+        start_method: Optional[str] = None,
+    ):
+        """
+        Args:
+            pool_size (int): Number of worker processes to keep alive.
+            timeout (Optional[float]): Wall-clock limit of a task in seconds.
+            memory_limit (Optional[int]): Address space limit of a task in bytes.
+            cpu_time_limit (Optional[int]): CPU time limit of a task in seconds.
+            start_method (Optional[str]): Multiprocessing start method, defaults
+                to "forkserver" where available, otherwise "spawn". "fork" is
+                not used by default as the agent runs threads, such as the
+                telemetry and the speculative executor, that a forked worker
+                would inherit in an inconsistent state.
+        """
+        super().__init__()
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+
+        if start_method is None:
+            start_method = (
+                "forkserver"
+                if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn"
+            )
+
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self._memory_limit = memory_limit
+        self._cpu_time_limit = cpu_time_limit
+        self._context = multiprocessing.get_context(start_method)
+        self._workers: list = []
+        self._idle_workers: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+
+            logger.info(f"Starting {self._pool_size} sandbox worker processes")
+            for _ in range(self._pool_size):
+                worker = _Worker(self._context)
+                self._workers.append(worker)
+                self._idle_workers.put(worker)
+            self._started = True
+
+    def stop(self) -> None:
+        with self._lock:
+            if not self._started:
+                return
+
+            logger.info("Stopping sandbox worker processes")
+            # Workers running a task are terminated too, the task fails with
+            # a CodeExecutionError and its worker is not given back to the pool
+            for worker in self._workers:
+                worker.stop()
+            self._workers = []
+            self._idle_workers = queue.Queue()
+            self._started = False
+
+    def _release_worker(self, worker: _Worker) -> None:
+        """Give a worker back to the pool, replacing it if it died."""
+        with self._lock:
+            if worker not in self._workers:
+                # The pool was stopped while the worker was running a task
+                return
+
+            if not worker.is_alive():
+                worker.kill()
+                self._workers.remove(worker)
+                worker = _Worker(self._context)
+                self._workers.append(worker)
+            self._idle_workers.put(worker)
+
+    def _exec_code(self, code: str, environment: dict) -> dict:
+        """Execute Python code in one of the worker processes.
+
+        Args:
+            code (str): Code to execute.
+            environment (dict): Environment of the caller, `execute_sql_query`
+                is served from it.
+
+        Returns:
+            dict: Result of the code execution.
+        """
+        self._compile_code(code)
+
+        worker = self._idle_workers.get()
+        try:
+            return self._run_task(worker, code, environment)
+        finally:
+            self._release_worker(worker)
+
+    def _run_task(self, worker: _Worker, code: str, environment: dict) -> dict:
+        try:
+            worker.wait_until_ready()
+        except (EOFError, OSError) as e:
+            worker.kill()
+            raise CodeExecutionError("Sandbox worker process failed to start") from e
+
+        deadline = time.monotonic() + self._timeout if self._timeout else None
+        worker.conn.send(("exec", code, self._memory_limit, self._cpu_time_limit))
+
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            try:
+                timed_out = remaining is not None and (
+                    remaining <= 0 or not worker.conn.poll(remaining)
+                )
+                message = None if timed_out else worker.conn.recv()
+            except (EOFError, OSError) as e:
+                # OSError is raised when the pool is stopped during the task
+                worker.kill()
+                raise CodeExecutionError(
+                    "Sandbox worker process exited unexpectedly"
+                ) from e
+
+            if timed_out:
+                worker.kill()
+                raise CodeExecutionError(
+                    f"Code execution timed out after {self._timeout} seconds"
+                )
+
+            status, payload = message[0], message[1]
+            if status == "sql":
+                self._serve_sql_query(worker, payload, environment)
+            elif status == "result":
+                return _decode_result(*payload)
+            elif status == "no_result":
+                raise NoResultFoundError(payload)
+            else:
+                raise CodeExecutionError(f"Code execution failed:\n{payload}")
+
+    def _serve_sql_query(self, worker: _Worker, query: str, environment: dict):
+        execute_sql_query_func = environment.get("execute_sql_query")
+        if execute_sql_query_func is None:
+            worker.conn.send(
+                (
+                    "sql_error",
+                    "execute_sql_query function is not defined in the environment.",
+                )
+            )
+            return
+
+        try:
+            payload = dataframe_to_ipc(execute_sql_query_func(query))
+        except Exception as e:
+            worker.conn.send(("sql_error", str(e)))
+            return
+        worker.conn.send(("sql_result", payload))
+
+    def __del__(self) -> None:
+        try:
+            self.stop()
+        except Exception:
+            pass
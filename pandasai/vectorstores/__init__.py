@@ -2,6 +2,8 @@
 Vector stores to store data for training purpose
 """
 
+from .embeddings import CachedEmbeddingFunction
+from .numpy_store import NumpyVectorStore
 from .vectorstore import VectorStore
 
-__all__ = ["VectorStore"]
+__all__ = ["VectorStore", "CachedEmbeddingFunction", "NumpyVectorStore"]
@@ -0,0 +1,175 @@
+"""
+Embedding layer shared by the vector stores.
+
+Vector stores embed the question on every lookup and the whole training set
+on every `train()` call. `CachedEmbeddingFunction` wraps any embedding
+function with an in-memory LRU and an optional on-disk cache keyed by the
+hash of the text, and embeds the texts missing from the cache in batches,
+optionally on a thread pool for CPU bound embedders.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+EmbeddingFunction = Callable[[List[str]], Sequence[Sequence[float]]]
+
+
+class CachedEmbeddingFunction:
+    """
+    Embedding function caching the embeddings of the texts it has seen.
+
+    Args:
+        embedding_function (Callable): Function embedding a list of texts.
+        cache_size (int): Number of embeddings kept in memory.
+        cache_path (str, optional): Directory in which embeddings are persisted
+            across processes. Embeddings are only cached in memory if not set.
+        batch_size (int): Maximum number of texts embedded in one call.
+        max_workers (int): Number of batches embedded in parallel.
+        namespace (str, optional): Identifies the embedding model in the cache
+            keys, so that several models can share a cache directory. Defaults
+            to the class name of the embedding function.
+    """
+
+    def __init__(
+        self,
+        embedding_function: EmbeddingFunction,
+        cache_size: int = 1024,
+        cache_path: Optional[str] = None,
+        batch_size: int = 64,
+        max_workers: int = 1,
+        namespace: Optional[str] = None,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.embedding_function = embedding_function
+        self.cache_size = cache_size
+        self.cache_path = cache_path
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.namespace = namespace or _default_namespace(embedding_function)
+
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if cache_path:
+            os.makedirs(cache_path, exist_ok=True)
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        # The argument is named `input` to satisfy the embedding function
+        # protocol of ChromaDB.
+        texts = [input] if isinstance(input, str) else list(input)
+        keys = [self._key(text) for text in texts]
+
+        embeddings: Dict[str, List[float]] = {}
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in embeddings or key in missing:
+                continue
+            embedding = self._get(key)
+            if embedding is None:
+                missing[key] = text
+            else:
+                embeddings[key] = embedding
+
+        if missing:
+            for key, embedding in zip(missing, self._embed(list(missing.values()))):
+                embeddings[key] = embedding
+                self._set(key, embedding)
+
+        return [embeddings[key] for key in keys]
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        batches = [
+            texts[start : start + self.batch_size]
+            for start in range(0, len(texts), self.batch_size)
+        ]
+
+        if self.max_workers > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(self.embedding_function, batches))
+        else:
+            results = [self.embedding_function(batch) for batch in batches]
+
+        return [
+            [float(value) for value in embedding]
+            for result in results
+            for embedding in result
+        ]
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    def _get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+                return embedding
+
+        if not self.cache_path:
+            return None
+
+        try:
+            embedding = np.load(self._file_path(key)).tolist()
+        except (OSError, ValueError):
+            return None
+
+        self._remember(key, embedding)
+        return embedding
+
+    def _set(self, key: str, embedding: List[float]) -> None:
+        self._remember(key, embedding)
+
+        if self.cache_path:
+            path = self._file_path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as file:
+                np.save(file, np.asarray(embedding, dtype=np.float32))
+            os.replace(tmp_path, path)
+
+    def _remember(self, key: str, embedding: List[float]) -> None:
+        with self._lock:
+            self._cache[key] = embedding
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _file_path(self, key: str) -> str:
+        return os.path.join(self.cache_path, f"{key}.npy")
+
+    def clear(self) -> None:
+        """Clear the in-memory cache. The on-disk cache is kept."""
+        with self._lock:
+            self._cache.clear()
+
+
+def _default_namespace(embedding_function: EmbeddingFunction) -> str:
+    for attribute in ("model_name", "model"):
+        value = getattr(embedding_function, attribute, None)
+        if isinstance(value, str):
+            return value
+    return getattr(
+        embedding_function, "__qualname__", type(embedding_function).__qualname__
+    )
+
+
+def cached_embedding_function(
+    embedding_function: EmbeddingFunction, **kwargs
+) -> CachedEmbeddingFunction:
+    """
+    Wrap an embedding function with a cache, unless it already has one.
+
+    Args:
+        embedding_function (Callable): Function embedding a list of texts.
+        **kwargs: Options of `CachedEmbeddingFunction`.
+    """
+    if isinstance(embedding_function, CachedEmbeddingFunction):
+        return embedding_function
+    return CachedEmbeddingFunction(embedding_function, **kwargs)
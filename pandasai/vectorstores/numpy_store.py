@@ -0,0 +1,437 @@
+"""
+In-process vector store backed by NumPy.
+
+Embeddings are normalized and stored as float32 rows in a file that is
+memory-mapped for search, next to a JSON lines sidecar holding the id,
+document and metadata of each row. Both files are only ever appended to:
+deleted rows are marked with tombstones and dropped when the collection is
+compacted. Searching is a matrix product of the embeddings with the queries,
+which answers in milliseconds for the tens of thousands of examples of a
+typical training set, without any extra service.
+"""
+
+import json
+import os
+import threading
+import uuid
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from pandasai.helpers.logger import Logger
+from pandasai.helpers.path import find_project_root
+
+from .embeddings import EmbeddingFunction, cached_embedding_function
+from .vectorstore import VectorStore
+
+
+class _Collection:
+    """Rows of embeddings with their ids, documents and metadata."""
+
+    search_chunk_size = 65536
+
+    def __init__(self, path: Optional[str], name: str):
+        self.name = name
+        self._vectors_path = path and os.path.join(path, f"{name}.vectors")
+        self._records_path = path and os.path.join(path, f"{name}.jsonl")
+        self._lock = threading.RLock()
+        self._reset()
+        if self._records_path and os.path.exists(self._records_path):
+            self._load()
+
+    def _reset(self) -> None:
+        self.dimensions: Optional[int] = None
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Optional[dict]] = []
+        self.deleted: set = set()
+        self.rows: dict = {}
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+
+    def _load(self) -> None:
+        with open(self._records_path, "r", encoding="utf-8") as file:
+            for line in file:
+                record = json.loads(line)
+                if "dimensions" in record:
+                    self.dimensions = record["dimensions"]
+                elif "deleted" in record:
+                    self._delete_row(record["deleted"])
+                else:
+                    self._append_record(
+                        record["id"], record["document"], record["metadata"]
+                    )
+
+        # Drop the embeddings of an interrupted append, so that the next rows
+        # are written right after the last complete one.
+        if self.dimensions and os.path.exists(self._vectors_path):
+            size = len(self.ids) * self.dimensions * np.dtype(np.float32).itemsize
+            if os.path.getsize(self._vectors_path) > size:
+                with open(self._vectors_path, "r+b") as file:
+                    file.truncate(size)
+        self._map_vectors()
+
+    def _map_vectors(self) -> None:
+        if not self.ids:
+            self._vectors = np.empty((0, self.dimensions or 0), dtype=np.float32)
+        elif self._vectors_path:
+            self._vectors = np.memmap(
+                self._vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(len(self.ids), self.dimensions),
+            )
+
+    def _append_record(self, id: str, document: str, metadata: Optional[dict]):
+        if id in self.rows:
+            self._delete_row(self.rows[id])
+        self.rows[id] = len(self.ids)
+        self.ids.append(id)
+        self.documents.append(document)
+        self.metadatas.append(metadata)
+
+    def _delete_row(self, row: int) -> None:
+        self.deleted.add(row)
+        if self.rows.get(self.ids[row]) == row:
+            del self.rows[self.ids[row]]
+
+    def _write_records(self, records: List[dict]) -> None:
+        if self._records_path:
+            with open(self._records_path, "a", encoding="utf-8") as file:
+                for record in records:
+                    file.write(json.dumps(record) + "\n")
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(
+        self,
+        ids: List[str],
+        documents: List[str],
+        vectors: np.ndarray,
+        metadatas: List[Optional[dict]],
+    ) -> None:
+        """Append rows, replacing the rows with the same ids."""
+        with self._lock:
+            if self.dimensions is None:
+                self.dimensions = vectors.shape[1]
+                self._write_records([{"dimensions": self.dimensions}])
+            elif vectors.shape[1] != self.dimensions:
+                raise ValueError(
+                    f"Embeddings have {vectors.shape[1]} dimensions, "
+                    f"expected {self.dimensions}"
+                )
+
+            # Vectors are written first, so that an interrupted append leaves
+            # unreferenced bytes at the end of the file rather than records
+            # without embeddings.
+            if self._vectors_path:
+                with open(self._vectors_path, "ab") as file:
+                    file.write(vectors.tobytes())
+            else:
+                self._vectors = np.vstack(
+                    [self._vectors.reshape(-1, self.dimensions), vectors]
+                )
+
+            for id, document, metadata in zip(ids, documents, metadatas):
+                self._append_record(id, document, metadata)
+            self._write_records(
+                [
+                    {"id": id, "document": document, "metadata": metadata}
+                    for id, document, metadata in zip(ids, documents, metadatas)
+                ]
+            )
+            self._map_vectors()
+
+    def delete(self, ids: Iterable[str]) -> None:
+        with self._lock:
+            rows = [self.rows[id] for id in ids if id in self.rows]
+            for row in rows:
+                self._delete_row(row)
+            self._write_records([{"deleted": row} for row in rows])
+
+    def compact(self) -> None:
+        """Rewrite the collection without its deleted rows."""
+        with self._lock:
+            live = [row for row in range(len(self.ids)) if row not in self.deleted]
+            vectors = np.ascontiguousarray(self._vectors[live], dtype=np.float32)
+            ids = [self.ids[row] for row in live]
+            documents = [self.documents[row] for row in live]
+            metadatas = [self.metadatas[row] for row in live]
+            dimensions = self.dimensions
+
+            self._vectors = np.empty((0, 0), dtype=np.float32)
+            if self._vectors_path:
+                tmp_path = f"{self._vectors_path}.tmp"
+                with open(tmp_path, "wb") as file:
+                    file.write(vectors.tobytes())
+                os.replace(tmp_path, self._vectors_path)
+
+            self._reset()
+            self.dimensions = dimensions
+            for id, document, metadata in zip(ids, documents, metadatas):
+                self._append_record(id, document, metadata)
+
+            if self._records_path:
+                tmp_path = f"{self._records_path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as file:
+                    file.write(json.dumps({"dimensions": dimensions}) + "\n")
+                    for id, document, metadata in zip(ids, documents, metadatas):
+                        record = {"id": id, "document": document, "metadata": metadata}
+                        file.write(json.dumps(record) + "\n")
+                os.replace(tmp_path, self._records_path)
+                self._map_vectors()
+            else:
+                self._vectors = vectors
+
+    def deleted_ratio(self) -> float:
+        return len(self.deleted) / len(self.ids) if self.ids else 0.0
+
+    def search(self, queries: np.ndarray, k: int) -> List[List[tuple]]:
+        """
+        Find the rows closest to each query.
+
+        Returns:
+            List[List[tuple]]: For each query, the `(row, distance)` of its `k`
+            nearest rows, nearest first. Distances are squared euclidean
+            distances between normalized vectors, from 0 to 4.
+        """
+        with self._lock:
+            vectors = self._vectors
+            deleted = np.fromiter(self.deleted, dtype=np.int64)
+            total = len(self.ids)
+
+        candidates_rows = []
+        candidates_scores = []
+        for start in range(0, total, self.search_chunk_size):
+            end = min(start + self.search_chunk_size, total)
+            scores = queries @ np.asarray(vectors[start:end]).T
+            in_chunk = deleted[(deleted >= start) & (deleted < end)] - start
+            scores[:, in_chunk] = -np.inf
+
+            top = min(k, end - start)
+            rows = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+            candidates_rows.append(rows + start)
+            candidates_scores.append(np.take_along_axis(scores, rows, axis=1))
+
+        if not candidates_rows:
+            return [[] for _ in queries]
+
+        rows = np.concatenate(candidates_rows, axis=1)
+        scores = np.concatenate(candidates_scores, axis=1)
+        order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+
+        results = []
+        for query_rows, query_scores in zip(
+            np.take_along_axis(rows, order, axis=1),
+            np.take_along_axis(scores, order, axis=1),
+        ):
+            results.append(
+                [
+                    (int(row), float(2 - 2 * score))
+                    for row, score in zip(query_rows, query_scores)
+                    if np.isfinite(score)
+                ]
+            )
+        return results
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Vector store keeping the embeddings in memory-mapped NumPy arrays.
+
+    Args:
+        embedding_function (Callable): Function embedding a list of texts.
+        persist_path (str, optional): Directory of the collections. Defaults to
+            a `vectorstore` directory in the project root. Pass `False` to keep
+            the collections in memory only.
+        collection_name (str): Prefix of the collection files.
+        max_samples (int): Default number of results of the lookups.
+        similarity_threshold (float): Maximum squared euclidean distance, from
+            0 to 4, of the results of the lookups.
+        compaction_threshold (float): Ratio of deleted rows above which a
+            collection is compacted.
+        logger (Logger, optional): Logger of the vector store.
+        **embedding_options: Options of `CachedEmbeddingFunction`.
+    """
+
+    def __init__(
+        self,
+        embedding_function: EmbeddingFunction,
+        persist_path: Optional[str] = None,
+        collection_name: str = "pandasai",
+        max_samples: int = 1,
+        similarity_threshold: float = 1.5,
+        compaction_threshold: float = 0.25,
+        logger: Optional[Logger] = None,
+        **embedding_options,
+    ) -> None:
+        self._logger = logger or Logger()
+        self._max_samples = max_samples
+        self._similarity_threshold = similarity_threshold
+        self._compaction_threshold = compaction_threshold
+        self._embedding_function = cached_embedding_function(
+            embedding_function, **embedding_options
+        )
+
+        if persist_path is None:
+            persist_path = os.path.join(find_project_root(), "vectorstore")
+        if persist_path:
+            os.makedirs(persist_path, exist_ok=True)
+            self._logger.log("Persisting Agent Training data in %s", persist_path)
+        self._persist_path = persist_path or None
+
+        self._qa_collection = _Collection(self._persist_path, f"{collection_name}-qa")
+        self._docs_collection = _Collection(
+            self._persist_path, f"{collection_name}-docs"
+        )
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.asarray(self._embedding_function(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def _add(
+        self,
+        collection: _Collection,
+        documents: List[str],
+        ids: Optional[Iterable[str]],
+        metadatas: Optional[List[dict]],
+        suffix: str,
+    ) -> List[str]:
+        ids = list(ids) if ids is not None else []
+        ids = ids or [f"{uuid.uuid4()}-{suffix}" for _ in documents]
+        if len(ids) != len(documents):
+            raise ValueError(
+                f"Ids and documents length doesn't match {len(ids)} != {len(documents)}"
+            )
+        metadatas = metadatas or [None] * len(documents)
+
+        if documents:
+            collection.add(ids, documents, self._embed(documents), metadatas)
+        return ids
+
+    def _check_qa(self, queries: Iterable[str], codes: Iterable[str]) -> List[str]:
+        if len(queries) != len(codes):
+            raise ValueError(
+                f"Queries and codes dimension doesn't match {len(queries)} != {len(codes)}"
+            )
+        return [self._format_qa(query, code) for query, code in zip(queries, codes)]
+
+    def add_question_answer(
+        self,
+        queries: Iterable[str],
+        codes: Iterable[str],
+        ids: Optional[Iterable[str]] = None,
+        metadatas: Optional[List[dict]] = None,
+    ) -> List[str]:
+        qa_str = self._check_qa(queries, codes)
+        return self._add(self._qa_collection, qa_str, ids, metadatas, "qa")
+
+    def add_docs(
+        self,
+        docs: Iterable[str],
+        ids: Optional[Iterable[str]] = None,
+        metadatas: Optional[List[dict]] = None,
+    ) -> List[str]:
+        return self._add(self._docs_collection, list(docs), ids, metadatas, "docs")
+
+    def update_question_answer(
+        self,
+        ids: Iterable[str],
+        queries: Iterable[str],
+        codes: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+    ) -> List[str]:
+        qa_str = self._check_qa(queries, codes)
+        ids = self._add(self._qa_collection, qa_str, ids, metadatas, "qa")
+        self._compact_if_needed(self._qa_collection)
+        return ids
+
+    def update_docs(
+        self,
+        ids: Iterable[str],
+        docs: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+    ) -> List[str]:
+        ids = self._add(self._docs_collection, list(docs), ids, metadatas, "docs")
+        self._compact_if_needed(self._docs_collection)
+        return ids
+
+    def delete_question_and_answers(
+        self, ids: Optional[List[str]] = None
+    ) -> Optional[bool]:
+        self._qa_collection.delete(ids or [])
+        self._compact_if_needed(self._qa_collection)
+        return True
+
+    def delete_docs(self, ids: Optional[List[str]] = None) -> Optional[bool]:
+        self._docs_collection.delete(ids or [])
+        self._compact_if_needed(self._docs_collection)
+        return True
+
+    def delete_collection(self, collection_name: str) -> Optional[bool]:
+        deleted = False
+        for collection in (self._qa_collection, self._docs_collection):
+            if collection.name == collection_name or collection.name.startswith(
+                f"{collection_name}-"
+            ):
+                collection.delete(list(collection.rows))
+                collection.compact()
+                deleted = True
+        return deleted
+
+    def _compact_if_needed(self, collection: _Collection) -> None:
+        if collection.deleted_ratio() > self._compaction_threshold:
+            collection.compact()
+
+    def _query(self, collection: _Collection, question: str, k: Optional[int]) -> dict:
+        k = k or self._max_samples
+        queries = self._embed([question])
+        # The rows are only valid until the collection is compacted
+        with collection._lock:
+            results = collection.search(queries, k)[0]
+            filtered = [
+                (row, distance)
+                for row, distance in results
+                if distance < self._similarity_threshold
+            ]
+
+            return {
+                "documents": [[collection.documents[row] for row, _ in filtered]],
+                "distances": [[distance for _, distance in filtered]],
+                "metadatas": [[collection.metadatas[row] for row, _ in filtered]],
+                "ids": [[collection.ids[row] for row, _ in filtered]],
+            }
+
+    def get_relevant_question_answers(
+        self, question: str, k: Optional[int] = None
+    ) -> List[dict]:
+        return self._query(self._qa_collection, question, k)
+
+    def get_relevant_docs(self, question: str, k: Optional[int] = None) -> List[dict]:
+        return self._query(self._docs_collection, question, k)
+
+    def _get_by_id(self, collection: _Collection, ids: Iterable[str]) -> dict:
+        with collection._lock:
+            rows = [collection.rows[id] for id in ids if id in collection.rows]
+            return {
+                "documents": [collection.documents[row] for row in rows],
+                "metadatas": [collection.metadatas[row] for row in rows],
+                "ids": [collection.ids[row] for row in rows],
+            }
+
+    def get_relevant_question_answers_by_id(self, ids: Iterable[str]) -> List[dict]:
+        return self._get_by_id(self._qa_collection, ids)
+
+    def get_relevant_docs_by_id(self, ids: Iterable[str]) -> List[dict]:
+        return self._get_by_id(self._docs_collection, ids)
+
+    def get_relevant_qa_documents(
+        self, question: str, k: Optional[int] = None
+    ) -> List[str]:
+        return self.get_relevant_question_answers(question, k)["documents"][0]
+
+    def get_relevant_docs_documents(
+        self, question: str, k: Optional[int] = None
+    ) -> List[str]:
+        return self.get_relevant_docs(question, k)["documents"][0]
@@ -0,0 +1,54 @@
+"""Micro-benchmark of the cost of building and rendering the code generation
+prompt, compared with compiling the templates for every prompt.
+
+Run it with `python tests/benchmarks/prompt_construction.py`.
+"""
+
+import os
+import timeit
+from unittest.mock import patch
+
+from jinja2 import Environment, FileSystemLoader
+
+import pandasai as pai
+from pandasai import Agent
+from pandasai.core.prompts.base import TEMPLATES_DIR
+from pandasai.core.prompts.generate_python_code_with_sql import (
+    GeneratePythonCodeWithSQLPrompt,
+)
+from pandasai.llm.fake import FakeLLM
+
+NUMBER = 200
+
+
+def uncached_prompt(context) -> str:
+    """Build the prompt the way it was built before templates were shared."""
+    env = Environment(loader=FileSystemLoader(TEMPLATES_DIR))
+    template = env.get_template(GeneratePythonCodeWithSQLPrompt.template_path)
+    return template.render(context=context, output_type=None)
+
+
+def cached_prompt(context) -> str:
+    return GeneratePythonCodeWithSQLPrompt(
+        context=context, output_type=None
+    ).to_string()
+
+
+def main():
+    df = pai.DataFrame({"country": ["Italy", "France"], "sales": [1, 2]})
+    pai.config.set({"llm": FakeLLM()})
+    # The benchmark must not send the usage ping nor leak into the environment
+    with patch.dict(os.environ, {"PANDABI_API_KEY": ""}), patch(
+        "pandasai.agent.base.scarf_analytics"
+    ):
+        context = Agent(df)._state
+
+    assert uncached_prompt(context) == cached_prompt(context)
+
+    for name, build in (("uncached", uncached_prompt), ("cached", cached_prompt)):
+        total = timeit.timeit(lambda: build(context), number=NUMBER)
+        print(f"{name:>10}: {total / NUMBER * 1e6:10.1f} us per prompt")
+
+
+if __name__ == "__main__":
+    main()
@@ -73,3 +73,69 @@ def test_to_openai_messages_without_agent_description():
     ]
 
     assert memory.to_openai_messages() == expected_messages
+
+
+def test_keeps_the_last_messages():
+    memory = Memory(memory_size=2, max_messages=3)
+    for i in range(5):
+        memory.add(f"Message {i}", is_user=i % 2 == 0)
+
+    assert memory.count() == 3
+    assert [message["message"] for message in memory.all()] == [
+        "Message 2",
+        "Message 3",
+        "Message 4",
+    ]
+    assert memory.get_conversation() == "### ANSWER\n Message 3\n### QUERY\n Message 4"
+    assert memory.get_last_message() == "### QUERY\n Message 4"
+    assert [message["content"] for message in memory.to_openai_messages()] == [
+        "Message 2",
+        "Message 3",
+        "Message 4",
+    ]
+
+
+def test_keeps_at_least_the_default_number_of_messages():
+    memory = Memory()
+    for i in range(150):
+        memory.add(f"Message {i}", is_user=True)
+
+    assert memory.count() == 100
+    assert memory.get_conversation() == "### QUERY\n Message 149"
+
+
+def test_conversation_is_updated_incrementally():
+    memory = Memory(memory_size=10)
+    memory.add("Hello", is_user=True)
+    assert memory.get_previous_conversation() == ""
+
+    memory.add("Hi there!", is_user=False)
+    memory.add("How are you?", is_user=True)
+    assert memory.get_previous_conversation() == (
+        "### QUERY\n Hello\n### ANSWER\n Hi there!"
+    )
+    assert memory.get_conversation(limit=1) == "### QUERY\n How are you?"
+
+    memory.remove_oldest()
+    assert memory.get_previous_conversation() == "### ANSWER\n Hi there!"
+
+    memory.clear()
+    assert memory.get_conversation() == ""
+    assert memory.get_last_message() == ""
+
+
+def test_truncates_long_answers():
+    memory = Memory(memory_size=10)
+    memory.add("a" * 150, is_user=False)
+
+    assert memory.get_last_message() == f"### ANSWER\n {'a' * 100} ..."
+
+
+def test_count_tokens():
+    memory = Memory(memory_size=2)
+    memory.add("a" * 8, is_user=True)
+    memory.add("a" * 4, is_user=False)
+    memory.add("a" * 12, is_user=True)
+
+    assert memory.count_tokens() == 4
+    assert memory.count_tokens(limit=0) == 6
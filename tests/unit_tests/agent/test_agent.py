@@ -9,9 +9,12 @@ from pandasai import DatasetLoader, VirtualDataFrame
 from pandasai.agent.base import Agent
 from pandasai.config import Config, ConfigManager
 from pandasai.core.response.error import ErrorResponse
+from pandasai.core.response.number import NumberResponse
+from pandasai.core.user_query import UserQuery
 from pandasai.data_loader.semantic_layer_schema import SemanticLayerSchema
 from pandasai.dataframe.base import DataFrame
-from pandasai.exceptions import CodeExecutionError, InvalidLLMOutputType
+from pandasai.exceptions import CodeExecutionError, NoCodeFoundError
+from pandasai.helpers.tracing import InMemorySpanExporter, tracer
 from pandasai.llm.fake import FakeLLM
 
 
@@ -164,6 +167,34 @@ print('Cached result: US has the highest GDP.')"""
         assert mock_generate_code.generate_code.called
         assert response == "print('Prompt test.')"
 
+    @patch("pandasai.agent.base.CodeGenerator")
+    def test_generate_code_retrieves_documents_once(
+        self, mock_generate_code, agent: Agent
+    ):
+        vectorstore = agent._state.vectorstore
+        vectorstore.get_relevant_qa_documents.return_value = ["Q: gdp\n A: code"]
+        vectorstore.get_relevant_docs_documents.return_value = ["GDP is in USD"]
+        agent._code_generator = mock_generate_code
+
+        agent.generate_code("Which country has the highest GDP?")
+        prompt = agent._state.last_prompt_used
+        rendered = [prompt.to_string(), prompt.render(), prompt.to_string()]
+
+        vectorstore.get_relevant_qa_documents.assert_called_once()
+        vectorstore.get_relevant_docs_documents.assert_called_once()
+        for text in rendered:
+            assert "Q: gdp\n A: code" in text
+            assert "GDP is in USD" in text
+
+    def test_retrieve_documents_without_vectorstore(self, sample_df, config):
+        agent = Agent(sample_df, config)
+        agent._state.relevant_qa_documents = ["stale"]
+
+        agent._state.retrieve_documents()
+
+        assert agent._state.relevant_qa_documents == []
+        assert agent._state.relevant_docs_documents == []
+
     @patch("pandasai.agent.base.CodeExecutor")
     def test_execute_code_successful_execution(self, mock_code_executor, agent: Agent):
         # Mock CodeExecutor to return a successful result
@@ -216,7 +247,7 @@ print('Cached result: US has the highest GDP.')"""
         result = agent.execute_code(code)
 
         # Verify the logger was called with the correct message
-        agent._state.logger.log.assert_called_with(f"Executing code: {code}")
+        agent._state.logger.log.assert_called_with("Executing code: %s", code)
         assert result == {"result": "Logging test successful"}
         mock_code_executor.return_value.execute_and_return_result.assert_called_with(
             code
@@ -317,6 +348,99 @@ print('Cached result: US has the highest GDP.')"""
         assert agent.execute_code.call_count == 4
         assert agent._regenerate_code_after_error.call_count == 3
 
+    def test_execute_with_retries_repairs_locally(self, agent: Agent):
+        agent.execute_code = Mock(
+            return_value={"type": "number", "value": pd.Series([5]).head(1)}
+        )
+        agent._regenerate_code_after_error = Mock()
+
+        result = agent.execute_with_retries("test_code")
+
+        assert result.value == 5
+        agent._regenerate_code_after_error.assert_not_called()
+        assert agent._code_repairer.successes["coerce_result"] == 1
+
+    def test_execute_with_retries_marks_corrections(self, agent: Agent):
+        agent.execute_code = Mock(
+            side_effect=[CodeExecutionError("error"), {"type": "number", "value": 1}]
+        )
+        retry_counts = []
+        agent._regenerate_code_after_error = Mock(
+            side_effect=lambda code, error: retry_counts.append(
+                agent._state.retry_count
+            )
+            or "test_code"
+        )
+
+        agent.execute_with_retries("test_code")
+
+        assert retry_counts == [1]
+        assert agent._state.retry_count == 0
+
+    def test_code_candidates_first_valid_wins(self, agent: Agent):
+        agent._state.config.code_candidates = 2
+        agent._state.config.enable_cache = False
+        agent._build_prompt = Mock()
+        agent._code_generator.generate_code_candidates = Mock(
+            return_value=iter(["failing_code", "valid_code"])
+        )
+
+        def execute_code(code):
+            if code == "failing_code":
+                raise CodeExecutionError("error")
+            return {"type": "number", "value": 42}
+
+        agent.execute_code = Mock(side_effect=execute_code)
+        agent.execute_with_retries = Mock()
+
+        result = agent._run_query(UserQuery("How many?"))
+
+        assert result.value == 42
+        assert result.last_code_executed == "valid_code"
+        agent.execute_with_retries.assert_not_called()
+        agent._code_generator.generate_code_candidates.assert_called_once_with(
+            agent._build_prompt.return_value, 2
+        )
+
+    def test_code_candidates_fall_back_to_corrections(self, agent: Agent):
+        agent._state.config.code_candidates = 2
+        agent._state.config.enable_cache = False
+        agent._build_prompt = Mock()
+        agent._code_generator.generate_code_candidates = Mock(
+            return_value=iter(["first_code", "second_code"])
+        )
+        executed = []
+        corrected = []
+
+        def execute_code(code):
+            executed.append(code)
+            if code != "fixed_code":
+                raise CodeExecutionError(f"{code} failed")
+            return {"type": "number", "value": 1}
+
+        def regenerate_code(code, error):
+            corrected.append((code, str(error), agent._state.last_code_generated))
+            return "fixed_code"
+
+        agent.execute_code = Mock(side_effect=execute_code)
+        agent._regenerate_code_after_error = Mock(side_effect=regenerate_code)
+
+        result = agent._run_query(UserQuery("How many?"))
+
+        assert result.value == 1
+        assert sorted(executed[:-1]) == ["first_code", "second_code"]
+        assert executed[-1] == "fixed_code"
+        assert corrected == [("first_code", "first_code failed", "first_code")]
+
+    def test_code_candidates_raise_without_candidates(self, agent: Agent):
+        agent._state.config.code_candidates = 2
+        agent._state.config.enable_cache = False
+        agent._build_prompt = Mock()
+        agent._code_generator.generate_code_candidates = Mock(return_value=iter([]))
+
+        with pytest.raises(NoCodeFoundError):
+            agent._execute_code_candidates(UserQuery("How many?"))
+
     def test_execute_with_retries_custom_retries(self, agent: Agent):
         # Test with custom number of retries
         agent._state.config.max_retries = 5
@@ -487,9 +611,54 @@ print('Cached result: US has the highest GDP.')"""
 
         # Verify method calls
         agent.generate_code.assert_called_once()
-        agent.execute_with_retries.assert_called_once_with("result = df['age'].mean()")
+        agent.execute_with_retries.assert_called_once_with(
+            "result = df['age'].mean()", initial_error=None
+        )
         agent._state.cache.set.assert_called_once()
 
+    def test_process_query_timings(self, sample_df, llm):
+        """Test the timing breakdown of the response when tracing is enabled"""
+        llm.response = f"""```python
+df = execute_sql_query("SELECT * FROM {sample_df.schema.name}")
+result = {{"type": "number", "value": len(df)}}
+```"""
+        agent = Agent(
+            sample_df, {"llm": llm, "enable_tracing": True, "enable_cache": False}
+        )
+        exporter = InMemorySpanExporter()
+        tracer.add_exporter(exporter)
+        try:
+            response = agent.chat("How many rows are there?")
+        finally:
+            tracer.remove_exporter(exporter)
+
+        assert response.value == len(sample_df)
+        assert set(response.timings) == {
+            "query",
+            "retrieve_documents",
+            "prompt",
+            "generate_code",
+            "llm",
+            "clean_code",
+            "execute_code",
+            "sql_query",
+            "parse_response",
+        }
+        spans = {span.name: span for span in exporter.spans}
+        assert spans["query"].attributes["retries"] == 0
+        assert len(spans["query"].attributes["query_hash"]) == 16
+        assert spans["sql_query"].attributes["rows"] == len(sample_df)
+        assert spans["llm"].attributes["prompt_tokens"] > 0
+        assert spans["execute_code"].parent_id == spans["query"].span_id
+
+    def test_process_query_without_tracing(self, agent):
+        agent.generate_code = Mock(return_value="result = 1")
+        agent.execute_with_retries = Mock(return_value=NumberResponse(1, "result = 1"))
+
+        response = agent._process_query("What is the answer?")
+
+        assert response.timings is None
+
     def test_process_query_execution_error(self, agent, config):
         """Test the _process_query method with execution error"""
         query = "What is the invalid operation?"
@@ -0,0 +1,135 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandasai.core.code_execution.code_executor import CodeExecutor
+from pandasai.core.code_execution.code_repair import CodeRepairer, coerce_result
+from pandasai.core.response import DataFrameResponse, NumberResponse
+from pandasai.core.response.parser import ResponseParser
+from pandasai.exceptions import (
+    CodeExecutionError,
+    InvalidOutputValueMismatch,
+    NoResultFoundError,
+)
+
+
+def execute_sql_query(query):
+    if "FROM employees" not in query:
+        raise RuntimeError("Table does not exist")
+    return pd.DataFrame({"salary": [10, 20]})
+
+
+@pytest.fixture
+def repairer():
+    context = MagicMock()
+    context.dfs = [MagicMock()]
+    context.dfs[0].schema.name = "employees"
+
+    def execute_code(code):
+        executor = CodeExecutor(MagicMock())
+        executor.add_to_env("execute_sql_query", execute_sql_query)
+        return executor.execute_and_return_result(code)
+
+    return CodeRepairer(context, execute_code, ResponseParser().parse)
+
+
+class TestCoerceResult:
+    @pytest.mark.parametrize(
+        "result, expected",
+        [
+            ({"type": "number", "value": np.int32(3)}, 3),
+            ({"type": "number", "value": pd.Series([2.5])}, 2.5),
+            ({"type": "number", "value": pd.DataFrame({"a": [4]})}, 4),
+            ({"type": "number", "value": "1,200"}, 1200),
+            ({"type": "integer", "value": 5}, 5),
+            ({"value": 7}, 7),
+            (8, 8),
+        ],
+    )
+    def test_numbers(self, result, expected):
+        coerced = coerce_result(result)
+
+        assert coerced == {"type": "number", "value": expected}
+        assert type(coerced["value"]) is type(expected)
+
+    def test_string(self):
+        assert coerce_result({"type": "string", "value": np.float64(1.5)}) == {
+            "type": "string",
+            "value": "1.5",
+        }
+
+    def test_dataframe(self):
+        coerced = coerce_result({"type": "table", "value": [{"a": 1}, {"a": 2}]})
+
+        assert coerced["type"] == "dataframe"
+        assert coerced["value"].equals(pd.DataFrame({"a": [1, 2]}))
+
+    @pytest.mark.parametrize(
+        "result",
+        [
+            {"type": "number", "value": pd.Series([1, 2])},
+            {"type": "number", "value": "many"},
+            {"type": "unknown", "value": object()},
+            None,
+        ],
+    )
+    def test_cannot_coerce(self, result):
+        assert coerce_result(result) is None
+
+
+class TestCodeRepairer:
+    def test_valid_code_is_not_repaired(self, repairer):
+        response, repairs = repairer.repair("result = {'type': 'number', 'value': 1}")
+
+        assert isinstance(response, NumberResponse)
+        assert repairs == []
+
+    def test_coerces_the_result(self, repairer):
+        code = "result = {'type': 'number', 'value': pd.Series([3]).head(1)}"
+        response, repairs = repairer.repair(code)
+
+        assert response.value == 3
+        assert repairs == ["coerce_result"]
+
+    def test_fixes_the_case_of_table_names(self, repairer):
+        code = (
+            "df = execute_sql_query('SELECT salary FROM Employees')\n"
+            "result = {'type': 'dataframe', 'value': df}"
+        )
+
+        response, repairs = repairer.repair(code)
+
+        assert isinstance(response, DataFrameResponse)
+        assert "FROM employees" in response.last_code_executed
+        assert repairs == ["table_name_case"]
+
+    def test_assigns_the_missing_result(self, repairer):
+        response, repairs = repairer.repair("total = int(np.int64(4) + 2)")
+
+        assert response.value == 6
+        assert "result = total" in response.last_code_executed
+        assert repairs == ["coerce_result", "assign_result"]
+
+    def test_assigns_the_last_expression(self, repairer):
+        response = repairer.execute("x = 2\nx * 21")
+
+        assert response.value == 42
+        assert repairer.successes["assign_result"] == 1
+
+    @pytest.mark.parametrize(
+        "code, error",
+        [
+            ("result = undefined_name", CodeExecutionError),
+            ("x = [1, 2]\nfor i in x:\n    pass", NoResultFoundError),
+            (
+                "result = {'type': 'number', 'value': 'many'}",
+                InvalidOutputValueMismatch,
+            ),
+        ],
+    )
+    def test_raises_the_original_error(self, repairer, code, error):
+        with pytest.raises(error):
+            repairer.execute(code)
+        assert sum(repairer.successes.values()) == 0
@@ -0,0 +1,71 @@
+"""Unit tests for the speculative execution of code candidates"""
+
+import threading
+import time
+
+import pytest
+
+from pandasai.core.code_execution.speculative import execute_first_valid
+from pandasai.exceptions import CodeExecutionError, NoCodeFoundError
+
+
+def execute(code):
+    if code.startswith("sleep"):
+        time.sleep(float(code.split()[1]))
+        return code
+    if code.startswith("fail"):
+        raise CodeExecutionError(code)
+    return code
+
+
+class TestExecuteFirstValid:
+    def test_returns_the_first_valid_response(self):
+        result = execute_first_valid(
+            iter(["fail 1", "sleep 0.5", "valid"]), execute, max_workers=3
+        )
+
+        assert result.response == "valid"
+        assert result.code == "valid"
+        assert [str(error) for error in result.errors] == ["fail 1"]
+
+    def test_does_not_wait_for_slower_candidates(self):
+        start = time.perf_counter()
+        result = execute_first_valid(iter(["sleep 1", "valid"]), execute, 2)
+
+        assert result.code == "valid"
+        assert time.perf_counter() - start < 0.5
+
+    def test_reports_all_failures(self):
+        result = execute_first_valid(iter(["fail 1", "fail 2", "fail 1"]), execute, 2)
+
+        assert result.response is None
+        assert result.code is None
+        assert result.candidates == ["fail 1", "fail 2"]
+        assert len(result.errors) == 2
+
+    def test_stops_generating_once_a_candidate_wins(self):
+        generated = []
+        closed = threading.Event()
+
+        def candidates():
+            try:
+                for code in ["valid", "sleep 0.2", "other"]:
+                    generated.append(code)
+                    yield code
+                    time.sleep(0.1)
+            finally:
+                closed.set()
+
+        result = execute_first_valid(candidates(), execute, 3)
+
+        assert result.code == "valid"
+        assert closed.wait(1)
+        assert "other" not in generated
+
+    def test_raises_the_generation_error_without_candidates(self):
+        def candidates():
+            raise NoCodeFoundError("No code found in the response")
+            yield
+
+        with pytest.raises(NoCodeFoundError):
+            execute_first_valid(candidates(), execute, 2)
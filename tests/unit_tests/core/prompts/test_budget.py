@@ -0,0 +1,154 @@
+import pandas as pd
+import pytest
+
+from pandasai.agent.state import AgentState
+from pandasai.core.prompts import (
+    get_chat_prompt_for_sql,
+    get_correct_error_prompt_for_sql,
+)
+from pandasai.core.prompts.budget import PromptBudget
+from pandasai.core.prompts.generate_python_code_with_sql import (
+    GeneratePythonCodeWithSQLPrompt,
+)
+from pandasai.dataframe.base import DataFrame
+from pandasai.helpers.memory import Memory, get_prompt_memory
+from pandasai.helpers.tokenizer import ApproximateTokenizer, Tokenizer
+
+
+def make_df(name, columns, rows=5):
+    return DataFrame(
+        pd.DataFrame({column: range(rows) for column in columns}),
+        _table_name=name,
+    )
+
+
+@pytest.fixture
+def context():
+    dfs = [
+        make_df("orders", ["order_id", "customer_id", "amount"]),
+        make_df("customers", ["customer_id", "country"]),
+        make_df("inventory", [f"item_{i}" for i in range(100)]),
+    ]
+    memory = Memory(10)
+    memory.add("What is the total amount of the orders?", is_user=True)
+    return AgentState(dfs=dfs, memory=memory, _config={})
+
+
+def render(context, max_tokens, tokenizer=None):
+    budget = PromptBudget(max_tokens, tokenizer)
+    prompt = budget.fit(GeneratePythonCodeWithSQLPrompt, context, output_type=None)
+    return prompt.to_string(), budget.count_tokens(prompt, context)
+
+
+class TestPromptBudget:
+    def test_no_budget_renders_the_full_prompt(self, context):
+        prompt = get_chat_prompt_for_sql(context)
+        expected = GeneratePythonCodeWithSQLPrompt(
+            context=context, last_code_generated="", output_type=None
+        ).to_string()
+
+        assert prompt.to_string() == expected
+
+    def test_prompt_within_budget_is_unchanged(self, context):
+        full = GeneratePythonCodeWithSQLPrompt(
+            context=context, output_type=None
+        ).to_string()
+
+        assert render(context, 100_000)[0] == full
+
+    def test_budget_from_config(self, context):
+        context.config.max_prompt_tokens = 500
+
+        prompt = get_chat_prompt_for_sql(context)
+
+        assert 'table_name="inventory"' not in prompt.to_string()
+
+    def test_irrelevant_tables_are_dropped(self, context):
+        prompt, _ = render(context, 500)
+
+        assert 'table_name="orders"' in prompt
+        assert 'table_name="customers"' not in prompt
+        assert 'table_name="inventory"' not in prompt
+
+    def test_columns_are_capped_keeping_the_ones_in_the_question(self, context):
+        context.memory.add("Count the items with item_99 above ten", is_user=True)
+
+        prompt, tokens = render(context, 300)
+
+        assert 'table_name="inventory"' in prompt
+        assert 'dimensions="5x100"' in prompt
+        header = prompt.split('dimensions="5x100">\n')[1].split("\n")[0]
+        assert header.split(",")[0] == "item_99"
+        assert len(header.split(",")) <= 20
+        assert tokens <= 300
+
+    def test_sample_rows_are_shrunk(self, context):
+        full_table = context.dfs[0].serialize_dataframe()
+
+        prompt, _ = render(context, 170)
+
+        assert full_table not in prompt
+        assert "order_id,customer_id,amount\n0,0,0\n</table>" in prompt
+
+    def test_oldest_messages_are_left_out_of_the_prompt(self, context):
+        context.memory.clear()
+        for i in range(6):
+            context.memory.add(f"Old question {i} " + "x" * 400, is_user=True)
+            context.memory.add(f"Old answer {i}", is_user=False)
+        context.memory.add("What is the total amount of the orders?", is_user=True)
+
+        _, tokens = render(context, 450)
+        memory = get_prompt_memory(context)
+
+        assert tokens <= 450
+        assert 1 < context.conversation_limit < 13
+        assert context.memory.count() == 13
+        assert memory.count() == context.conversation_limit
+        assert memory.last()["message"].startswith("What is the total")
+        assert "Old question 0" not in memory.get_previous_conversation()
+        assert memory.to_json()[0]["message"] != context.memory.to_json()[0]["message"]
+
+    def test_correction_prompts_render_the_conversation_limit(self, context):
+        context.memory.clear()
+        for i in range(6):
+            context.memory.add(f"Old question {i} " + "x" * 400, is_user=True)
+            context.memory.add(f"Old answer {i}", is_user=False)
+        context.memory.add("What is the total amount of the orders?", is_user=True)
+        context.config.max_prompt_tokens = 600
+
+        prompt = get_correct_error_prompt_for_sql(context, "result = 1", "error")
+        budget = PromptBudget(600)
+
+        assert 1 < context.conversation_limit < 13
+        assert budget.count_tokens(prompt, context) <= 600
+        assert "Old question 0" not in prompt.to_string()
+        assert len(prompt.to_json()["conversation"]) == context.conversation_limit
+
+    def test_conversation_limit_is_reset_for_each_prompt(self, context):
+        context.conversation_limit = 1
+
+        render(context, 10_000)
+
+        assert context.conversation_limit is None
+
+    def test_smallest_prompt_is_returned_when_budget_is_too_small(self, context):
+        prompt, tokens = render(context, 10)
+
+        assert 'table_name="orders"' in prompt
+        assert tokens > 10
+        assert context.memory.count() == 1
+
+    def test_pluggable_tokenizer(self, context):
+        class WordTokenizer(Tokenizer):
+            def count_tokens(self, text):
+                return len(text.split())
+
+        prompt, tokens = render(context, 150, WordTokenizer())
+
+        assert tokens == WordTokenizer().count_tokens(prompt)
+        assert tokens <= 150
+
+
+def test_approximate_tokenizer():
+    assert ApproximateTokenizer().count_tokens("a" * 9) == 3
+    assert ApproximateTokenizer(chars_per_token=3).count_tokens("a" * 9) == 3
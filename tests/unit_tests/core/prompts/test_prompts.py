@@ -23,6 +23,8 @@ class TestChatPrompts(unittest.TestCase):
         memory = MagicMock()
         memory.count.return_value = 1
         self.context.memory = memory
+        self.context.config.max_prompt_tokens = None
+        self.context.config.max_tables = None
 
     def test_get_chat_prompt_for_sql(self):
         """Test the get_chat_prompt_for_sql function."""
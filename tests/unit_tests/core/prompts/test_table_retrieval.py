@@ -0,0 +1,141 @@
+import pandas as pd
+import pytest
+
+from pandasai.agent.state import AgentState
+from pandasai.core.prompts import get_chat_prompt_for_sql
+from pandasai.core.prompts.table_retrieval import (
+    BM25Index,
+    BM25TableRetriever,
+    TableRetriever,
+    tokenize,
+)
+from pandasai.dataframe.base import DataFrame
+from pandasai.helpers.memory import Memory
+
+
+def make_df(name, columns, description=None):
+    df = DataFrame(
+        pd.DataFrame({column: range(3) for column in columns}),
+        _table_name=name,
+        description=description,
+    )
+    return df
+
+
+@pytest.fixture
+def dfs():
+    return [
+        make_df("orders", ["order_id", "customer_id", "amount"]),
+        make_df("customers", ["customer_id", "country"]),
+        make_df("inventory", ["item_id", "stock"], "Stock of the warehouses"),
+        make_df("employees", ["employee_id", "salary"]),
+    ]
+
+
+@pytest.fixture
+def context(dfs):
+    memory = Memory(10)
+    memory.add("How many items are in stock?", is_user=True)
+    return AgentState(dfs=dfs, memory=memory, _config={})
+
+
+def test_tokenize():
+    assert tokenize("What are the Orders per customer_id?") == [
+        "order",
+        "customer",
+        "id",
+    ]
+    assert tokenize(None) == []
+
+
+class TestBM25Index:
+    def test_rare_terms_weigh_more(self):
+        index = BM25Index([["id", "order"], ["id", "customer"], ["id", "item"]])
+
+        scores = index.scores(["id", "order"])
+
+        assert scores[0] > scores[1] == scores[2] > 0
+
+    def test_unknown_terms_score_zero(self):
+        index = BM25Index([["order"], ["customer"]])
+
+        assert index.scores(["salary"]) == [0.0, 0.0]
+
+
+class TestBM25TableRetriever:
+    def test_scores_by_schema_terms(self, dfs):
+        scores = BM25TableRetriever().score("amount per customer_id", dfs)
+
+        assert scores[0] > scores[1] > scores[2] == scores[3]
+
+    def test_matches_descriptions(self, dfs):
+        scores = BM25TableRetriever().score("stock of the warehouse", dfs)
+
+        assert scores.index(max(scores)) == 2
+
+    def test_retrieve_keeps_the_original_order(self, dfs):
+        retriever = BM25TableRetriever()
+
+        tables = retriever.retrieve("salary of the customers by country", dfs, 2)
+
+        assert [df.schema.name for df in tables] == ["customers", "employees"]
+
+    def test_retrieve_all_tables_when_under_the_limit(self, dfs):
+        assert BM25TableRetriever().retrieve("anything", dfs, 10) == dfs
+
+    def test_index_is_rebuilt_when_the_tables_change(self, dfs):
+        retriever = BM25TableRetriever()
+        retriever.score("orders", dfs)
+        index = retriever._index
+
+        retriever.score("customers", dfs)
+        assert retriever._index is index
+
+        retriever.score("orders", dfs[:2])
+        assert retriever._index is not index
+
+    def test_index_is_rebuilt_when_a_schema_changes(self, dfs):
+        retriever = BM25TableRetriever()
+        retriever.score("orders", dfs)
+        index = retriever._index
+
+        dfs[0].schema.description = "Shipments of the warehouse"
+        retriever.score("orders", dfs)
+        assert retriever._index is not index
+
+
+class TestSelectTables:
+    def test_all_tables_by_default(self, context):
+        prompt = get_chat_prompt_for_sql(context).to_string()
+
+        for name in ("orders", "customers", "inventory", "employees"):
+            assert f'table_name="{name}"' in prompt
+
+    def test_top_tables_from_config(self, context):
+        context.config.max_tables = 1
+
+        prompt = get_chat_prompt_for_sql(context).to_string()
+
+        assert 'table_name="inventory"' in prompt
+        assert 'table_name="orders"' not in prompt
+
+    def test_pluggable_retriever(self, context):
+        class LastTableRetriever(TableRetriever):
+            def score(self, question, dfs):
+                return list(range(len(dfs)))
+
+        context.config.max_tables = 1
+        context.config.table_retriever = LastTableRetriever()
+
+        prompt = get_chat_prompt_for_sql(context).to_string()
+
+        assert 'table_name="employees"' in prompt
+        assert 'table_name="inventory"' not in prompt
+
+    def test_combined_with_the_token_budget(self, context):
+        context.config.max_tables = 2
+        context.config.max_prompt_tokens = 100_000
+
+        prompt = get_chat_prompt_for_sql(context).to_string()
+
+        assert prompt.count("<table ") == 2
@@ -0,0 +1,201 @@
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from pandasai.data_loader.row_count import (
+    ExactRowCount,
+    MetadataRowCount,
+    clear_row_count_cache,
+    register_row_count_strategy,
+)
+from pandasai.data_loader.semantic_layer_schema import SemanticLayerSchema
+from pandasai.data_loader.sql_loader import SQLDatasetLoader
+from pandasai.dataframe.virtual_dataframe import VirtualDataFrame
+from pandasai.query_builders import SqlQueryBuilder
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    clear_row_count_cache()
+    yield
+    clear_row_count_cache()
+
+
+def make_schema(raw_mysql_schema, source_type="mysql", table="users", **row_count):
+    raw_mysql_schema["source"]["type"] = source_type
+    raw_mysql_schema["source"]["table"] = table
+    raw_mysql_schema.pop("transformations", None)
+    if row_count:
+        raw_mysql_schema["row_count"] = row_count
+    return SemanticLayerSchema(**raw_mysql_schema)
+
+
+def count_result(value):
+    return pd.DataFrame({"count": [value]})
+
+
+class TestRowCount:
+    def test_exact_count_by_default(self, raw_mysql_schema):
+        loader = SQLDatasetLoader(make_schema(raw_mysql_schema), "test/users")
+        with patch.object(
+            SQLDatasetLoader, "execute_query", return_value=count_result(42)
+        ) as mock_execute_query:
+            assert loader.get_row_count() == 42
+
+        assert "COUNT(*)" in mock_execute_query.call_args[0][0]
+
+    def test_row_count_is_cached_between_loaders(self, raw_mysql_schema):
+        schema = make_schema(raw_mysql_schema)
+        with patch.object(
+            SQLDatasetLoader, "execute_query", return_value=count_result(42)
+        ) as mock_execute_query:
+            SQLDatasetLoader(schema, "test/users").get_row_count()
+            SQLDatasetLoader(schema, "test/users").get_row_count()
+
+        mock_execute_query.assert_called_once()
+
+    def test_cache_can_be_disabled(self, raw_mysql_schema):
+        loader = SQLDatasetLoader(
+            make_schema(raw_mysql_schema, strategy="exact", cache_ttl=0),
+            "test/users",
+        )
+        with patch.object(
+            SQLDatasetLoader, "execute_query", return_value=count_result(42)
+        ) as mock_execute_query:
+            loader.get_row_count()
+            loader.get_row_count()
+
+        assert mock_execute_query.call_count == 2
+
+    def test_virtual_dataframe_does_not_cache_when_disabled(self, raw_mysql_schema):
+        schema = make_schema(raw_mysql_schema, strategy="exact", cache_ttl=0)
+        df = VirtualDataFrame(
+            schema=schema, data_loader=SQLDatasetLoader(schema, "test/users")
+        )
+        with patch.object(
+            SQLDatasetLoader,
+            "execute_query",
+            side_effect=[count_result(42), count_result(43)],
+        ):
+            assert df.rows_count == 42
+            assert df.rows_count == 43
+
+    def test_driver_errors_fall_back_to_the_exact_count(self, raw_mysql_schema):
+        class DriverError(Exception):
+            pass
+
+        loader = SQLDatasetLoader(
+            make_schema(raw_mysql_schema, source_type="postgres", strategy="metadata"),
+            "test/users",
+        )
+        exact_query = loader.query_builder.get_row_count()
+
+        queries = []
+
+        def execute_query(query):
+            queries.append(query)
+            if query != exact_query:
+                raise DriverError("permission denied on the table statistics")
+            return count_result(7)
+
+        with patch.object(SQLDatasetLoader, "execute_query", side_effect=execute_query):
+            assert loader.get_row_count() == 7
+        assert len(queries) > 1
+
+    def test_metadata_count(self, raw_mysql_schema):
+        loader = SQLDatasetLoader(
+            make_schema(raw_mysql_schema, strategy="metadata"), "test/users"
+        )
+        with patch.object(
+            SQLDatasetLoader, "execute_query", return_value=count_result(1_000_000)
+        ) as mock_execute_query:
+            assert loader.get_row_count() == 1_000_000
+
+        query = mock_execute_query.call_args[0][0]
+        assert "information_schema.tables" in query
+        assert "'test_db'" in query
+
+    def test_metadata_falls_back_to_sample(self, raw_mysql_schema):
+        loader = SQLDatasetLoader(
+            make_schema(
+                raw_mysql_schema,
+                source_type="postgres",
+                strategy="metadata",
+                sample_percent=10,
+            ),
+            "test/users",
+        )
+        # Never analyzed table, then 25 rows in the 10% sample
+        with patch.object(
+            SQLDatasetLoader,
+            "execute_query",
+            side_effect=[count_result(-1), count_result(25)],
+        ) as mock_execute_query:
+            assert loader.get_row_count() == 250
+
+        assert "TABLESAMPLE" in mock_execute_query.call_args[0][0]
+
+    def test_failing_strategy_falls_back_to_exact(self, raw_mysql_schema):
+        loader = SQLDatasetLoader(
+            make_schema(raw_mysql_schema, strategy="metadata"), "test/users"
+        )
+        # MySQL does not support TABLESAMPLE, so the exact count is next
+        with patch.object(
+            SQLDatasetLoader,
+            "execute_query",
+            side_effect=[RuntimeError("permission denied"), count_result(7)],
+        ) as mock_execute_query:
+            assert loader.get_row_count() == 7
+
+        assert "COUNT(*)" in mock_execute_query.call_args[0][0]
+
+    def test_parquet_footer_metadata(self, tmp_path):
+        path = tmp_path / "data.parquet"
+        pd.DataFrame({"a": range(123)}).to_parquet(path)
+        loader = MagicMock()
+        loader.schema.source.type = "parquet"
+        loader.query_builder.file_path = str(path)
+
+        assert MetadataRowCount().get_row_count(loader) == 123
+        loader.execute_query.assert_not_called()
+
+    def test_invalid_strategy(self, raw_mysql_schema):
+        with pytest.raises(ValidationError):
+            make_schema(raw_mysql_schema, strategy="guess")
+
+    def test_register_strategy(self, raw_mysql_schema):
+        fixed = MagicMock()
+        fixed.get_row_count.return_value = 5
+        register_row_count_strategy("fixed", lambda config: [fixed, ExactRowCount()])
+
+        loader = SQLDatasetLoader(
+            make_schema(raw_mysql_schema, strategy="fixed"), "test/users"
+        )
+        assert loader.get_row_count() == 5
+
+
+class TestMetadataQueries:
+    @pytest.mark.parametrize(
+        "source_type,table,expected",
+        [
+            ("postgres", "sales.orders", ["pg_class", "'orders'", "'sales'"]),
+            ("mysql", "orders", ["information_schema.tables", "'test_db'"]),
+            ("snowflake", "orders", ["information_schema.tables", "'ORDERS'"]),
+            ("bigquery", "shop.orders", ["shop.__TABLES__", "'orders'"]),
+            ("oracle", "orders", ["all_tables", "'ORDERS'"]),
+        ],
+    )
+    def test_metadata_query(self, raw_mysql_schema, source_type, table, expected):
+        builder = SqlQueryBuilder(make_schema(raw_mysql_schema, source_type, table))
+        query = builder.get_metadata_row_count()
+        for part in expected:
+            assert part in query
+
+    def test_unsupported_sources(self, raw_mysql_schema):
+        builder = SqlQueryBuilder(make_schema(raw_mysql_schema, "bigquery", "orders"))
+        assert builder.get_metadata_row_count() is None
+
+        builder = SqlQueryBuilder(make_schema(raw_mysql_schema, "mysql", "orders"))
+        assert builder.get_sampled_row_count(1) is None
@@ -1,4 +1,5 @@
-from unittest.mock import MagicMock, Mock, mock_open, patch
+import os
+from unittest.mock import ANY, MagicMock, Mock, patch
 
 import pandas as pd
 import pytest
@@ -7,6 +8,8 @@ import pandasai
 from pandasai.agent import Agent
 from pandasai.dataframe.base import DataFrame
 from pandasai.exceptions import PandaAIApiKeyError
+from pandasai.helpers.dataset_transfer import MultipartStream
+from pandasai.helpers.filemanager import DefaultFileManager
 
 
 class TestDataFrame:
@@ -81,54 +84,34 @@ class TestDataFrame:
         assert isinstance(sample_df.column_hash, str)
         assert len(sample_df.column_hash) == 32  # MD5 hash length
 
+    @pytest.fixture
+    def dataset_files(self, tmp_path):
+        file_manager = DefaultFileManager()
+        file_manager.base_path = str(tmp_path)
+        os.makedirs(tmp_path / "test" / "test")
+        (tmp_path / "test" / "test" / "schema.yaml").write_bytes(b"name: test")
+        (tmp_path / "test" / "test" / "data.parquet").write_bytes(b"PAR1" * 1000)
+        with patch(
+            "pandasai.dataframe.base.ConfigManager.get",
+            return_value=Mock(file_manager=file_manager),
+        ):
+            yield file_manager
+
     @patch("pandasai.dataframe.base.get_pandaai_session")
-    @patch("pandasai.helpers.filemanager.os.path.exists")
-    @patch("pandasai.helpers.filemanager.open", new_callable=mock_open)
     @patch("pandasai.dataframe.base.os.environ")
-    @patch("pandasai.helpers.path.find_project_root")
     def test_push_successful(
-        self,
-        mock_find_project_root,
-        mock_environ,
-        mock_open,
-        mock_path_exists,
-        mock_get_session,
-        sample_df,
+        self, mock_environ, mock_get_session, dataset_files, sample_df
     ):
-        # Mock environment variable
         mock_environ.get.return_value = "fake_api_key"
-
-        # Mock project root
-        mock_find_project_root.return_value = "/fake/project/root"
-
-        # Mock file paths
-        mock_path_exists.side_effect = (
-            lambda x: "data.parquet" in x
-        )  # Only data.parquet exists
-
-        # Mock session and POST request
         mock_session = MagicMock()
         mock_get_session.return_value = mock_session
+
         sample_df.path = "test/test"
         sample_df.push()
 
-        # Verify POST request
         mock_session.post.assert_called_once_with(
             "/datasets/push",
-            files=[
-                (
-                    "files",
-                    ("schema.yaml", "", "application/x-yaml"),
-                ),
-                (
-                    "files",
-                    (
-                        "data.parquet",
-                        "",
-                        "application/octet-stream",
-                    ),
-                ),
-            ],
+            data=ANY,
             params={
                 "path": sample_df.path,
                 "description": sample_df.schema.description,
@@ -137,8 +120,39 @@ class TestDataFrame:
             headers={
                 "accept": "application/json",
                 "x-authorization": "Bearer fake_api_key",
+                "Content-Type": ANY,
             },
         )
+        body = mock_session.post.call_args.kwargs["data"]
+        headers = mock_session.post.call_args.kwargs["headers"]
+        assert isinstance(body, MultipartStream)
+        assert headers["Content-Type"] == body.content_type
+
+    @patch("pandasai.dataframe.base.get_pandaai_session")
+    @patch("pandasai.dataframe.base.os.environ")
+    def test_push_streams_the_files(
+        self, mock_environ, mock_get_session, dataset_files, sample_df
+    ):
+        mock_environ.get.return_value = "fake_api_key"
+        chunks = []
+
+        def post(path, data, **kwargs):
+            length = len(data)
+            while chunk := data.read(1024):
+                chunks.append(chunk)
+            assert sum(map(len, chunks)) == length
+
+        mock_get_session.return_value.post.side_effect = post
+
+        sample_df.path = "test/test"
+        sample_df.push()
+
+        body = b"".join(chunks)
+        assert max(map(len, chunks)) <= 1024
+        assert b'filename="schema.yaml"' in body
+        assert b"name: test" in body
+        assert b'filename="data.parquet"' in body
+        assert b"PAR1" * 1000 in body
 
     def test_push_raises_error_if_path_is_none(self, sample_df):
         # Call the method and assert the exception
@@ -158,27 +172,24 @@ class TestDataFrame:
             sample_df.path = "test/test"
             sample_df.push()
 
-    @patch("pandasai.helpers.filemanager.os.path.exists")
-    @patch("pandasai.helpers.filemanager.open", new_callable=mock_open)
     @patch("pandasai.dataframe.base.get_pandaai_session")
     @patch("pandasai.dataframe.base.os.environ")
     def test_push_closes_files_on_completion(
-        self,
-        mock_environ,
-        mock_get_session,
-        mock_open,
-        mock_path_exists,
-        sample_df: DataFrame,
+        self, mock_environ, mock_get_session, dataset_files, sample_df
     ):
-        # Mock environment variable
         mock_environ.get.return_value = "fake_api_key"
-        # Mock file existence
-        mock_path_exists.return_value = True
+        opened = []
+        open_binary = dataset_files.open_binary
 
-        # Mock session
-        mock_session = MagicMock()
-        mock_get_session.return_value = mock_session
+        def tracking_open_binary(file_path):
+            file = open_binary(file_path)
+            opened.append(file)
+            return file
+
+        dataset_files.open_binary = tracking_open_binary
 
-        # Call the method
         sample_df.path = "test/test"
         sample_df.push()
+
+        assert len(opened) == 2
+        assert all(file.closed for file in opened)
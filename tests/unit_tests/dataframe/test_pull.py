@@ -56,7 +56,8 @@ def test_pull_success(mock_env, sample_df, mock_zip_content, mock_schema, tmp_pa
         # Setup mocks
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.content = mock_zip_content
+        mock_response.headers = {}
+        mock_response.iter_content.return_value = [mock_zip_content]
         mock_session.return_value.get.return_value = mock_response
         mock_root.return_value = str(tmp_path)
 
@@ -78,6 +79,8 @@ def test_pull_success(mock_env, sample_df, mock_zip_content, mock_schema, tmp_pa
                 "x-authorization": "Bearer test_api_key",
             },
             params={"path": "test/path"},
+            raw=True,
+            stream=True,
         )
 
         # Verify file operations
@@ -114,7 +117,8 @@ def test_pull_file_exists(mock_env, sample_df, mock_zip_content, mock_schema, tm
         # Setup mocks
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.content = mock_zip_content
+        mock_response.headers = {}
+        mock_response.iter_content.return_value = [mock_zip_content]
         mock_session.return_value.get.return_value = mock_response
         mock_root.return_value = str(tmp_path)
         mock_exists.return_value = True
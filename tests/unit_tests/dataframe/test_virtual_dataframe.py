@@ -0,0 +1,58 @@
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from pandasai import DataFrame, VirtualDataFrame
+
+
+@pytest.fixture
+def virtual_df(mysql_schema):
+    loader = MagicMock()
+    loader.get_row_count.return_value = 100
+    loader.load_head.return_value = pd.DataFrame(
+        {"email": ["test@example.com"], "first_name": ["John"]}
+    )
+    return VirtualDataFrame(schema=mysql_schema, data_loader=loader)
+
+
+class TestVirtualDataFrame:
+    def test_rows_count_is_read_from_the_loader(self, virtual_df):
+        assert virtual_df.rows_count == 100
+
+        # The loader caches the row count for the TTL of the schema
+        virtual_df._loader.get_row_count.return_value = 150
+        assert virtual_df.rows_count == 150
+
+    def test_serialization_does_not_query_again(self, virtual_df):
+        first = virtual_df.serialize_dataframe()
+        second = virtual_df.serialize_dataframe()
+
+        assert first is second
+        assert 'dimensions="100x' in first
+        virtual_df._loader.load_head.assert_called_once()
+
+    def test_serialization_is_invalidated_by_schema_changes(self, virtual_df):
+        first = virtual_df.serialize_dataframe()
+        virtual_df.schema.description = "Updated description"
+
+        second = virtual_df.serialize_dataframe()
+        assert first != second
+        assert 'description="Updated description"' in second
+
+    def test_invalidate_cache(self, virtual_df):
+        virtual_df.serialize_dataframe()
+        virtual_df._loader.get_row_count.return_value = 200
+
+        virtual_df.invalidate_cache()
+
+        assert 'dimensions="200x' in virtual_df.serialize_dataframe()
+        assert virtual_df._loader.load_head.call_count == 2
+
+    def test_serialization_is_not_copied_to_derived_frames(self, virtual_df):
+        virtual_df.serialize_dataframe()
+
+        derived = DataFrame({"email": ["a@example.com"]}).__finalize__(virtual_df)
+
+        assert derived.schema is virtual_df.schema
+        assert getattr(derived, "_serialized", None) is None
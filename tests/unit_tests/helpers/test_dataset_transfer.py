@@ -0,0 +1,187 @@
+import base64
+import hashlib
+import io
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from pandasai.exceptions import PandaAIApiCallError
+from pandasai.helpers.dataset_transfer import MultipartStream, download, download_zip
+from pandasai.helpers.session import Session
+
+PAYLOAD = bytes(range(256)) * 4096
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.ranges.append(self.headers.get("Range"))
+        if server.status != 200:
+            self.send_response(server.status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        start = 0
+        if self.headers.get("Range") and server.accept_ranges:
+            start = int(self.headers["Range"][len("bytes=") : -1])
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        body = server.payload[start:]
+        self.send_header("Content-Length", str(len(body)))
+        if server.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if server.digest:
+            self.send_header("Digest", f"sha-256={server.digest}")
+        self.end_headers()
+
+        if server.drops:
+            # Close the connection in the middle of the body
+            self.wfile.write(body[: server.drops.pop(0)])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.payload = PAYLOAD
+    server.status = 200
+    server.accept_ranges = True
+    server.digest = base64.b64encode(hashlib.sha256(PAYLOAD).digest()).decode()
+    server.drops = []
+    server.ranges = []
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def session(server):
+    session = Session(
+        endpoint_url=f"http://127.0.0.1:{server.server_port}",
+        api_key="test-key",
+        max_retries=0,
+    )
+    yield session
+    session.close()
+
+
+class TestDownload:
+    def test_streams_the_body_to_a_file(self, session):
+        file = io.BytesIO()
+
+        assert download(session, "/pull", file, chunk_size=4096) == 200
+        assert file.getvalue() == PAYLOAD
+
+    def test_resumes_interrupted_downloads(self, server, session):
+        server.drops = [100_000, 200_000]
+        file = io.BytesIO()
+
+        download(session, "/pull", file, chunk_size=4096)
+
+        assert file.getvalue() == PAYLOAD
+        assert len(server.ranges) == 3
+        resumed_at = [int(r[len("bytes=") : -1]) for r in server.ranges[1:]]
+        assert 90_000 < resumed_at[0] <= 100_000
+        assert resumed_at[0] < resumed_at[1] <= resumed_at[0] + 200_000
+
+    def test_fails_when_ranges_are_not_supported(self, server, session):
+        server.drops = [100_000]
+        server.accept_ranges = False
+
+        with pytest.raises(PandaAIApiCallError, match="Download failed"):
+            download(session, "/pull", io.BytesIO())
+
+    def test_gives_up_after_max_resumes(self, server, session):
+        server.drops = [1000, 1000, 1000]
+
+        with pytest.raises(PandaAIApiCallError, match="Download failed"):
+            download(session, "/pull", io.BytesIO(), max_resumes=2)
+
+    def test_checks_the_digest(self, server, session):
+        server.digest = base64.b64encode(hashlib.sha256(b"other").digest()).decode()
+
+        with pytest.raises(PandaAIApiCallError, match="checksum mismatch"):
+            download(session, "/pull", io.BytesIO())
+
+    def test_nothing_is_written_on_error(self, server, session):
+        server.status = 404
+        file = io.BytesIO()
+
+        assert download(session, "/pull", file) == 404
+        assert file.getvalue() == b""
+
+    def test_closes_the_responses(self, server, session):
+        responses = []
+        get = session.get
+
+        def record(*args, **kwargs):
+            responses.append(get(*args, **kwargs))
+            return responses[-1]
+
+        session.get = record
+        server.drops = [100_000]
+        download(session, "/pull", io.BytesIO(), chunk_size=4096)
+        server.status = 404
+        download(session, "/pull", io.BytesIO())
+
+        assert len(responses) == 3
+        assert all(response.raw.closed for response in responses)
+
+
+class TestDownloadZip:
+    def test_yields_the_archive(self, server, session):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zip_file:
+            zip_file.writestr("schema.yaml", "name: test")
+        server.payload = buffer.getvalue()
+        server.digest = None
+
+        with download_zip(session, "/pull") as zip_file:
+            assert zip_file.read("schema.yaml") == b"name: test"
+
+    def test_yields_none_on_error(self, server, session):
+        server.status = 404
+
+        with download_zip(session, "/pull") as zip_file:
+            assert zip_file is None
+
+
+class TestMultipartStream:
+    def test_matches_requests_encoding(self, tmp_path):
+        path = tmp_path / "data.parquet"
+        path.write_bytes(b"PAR1" * 100)
+
+        with open(path, "rb") as file:
+            body = MultipartStream(
+                [
+                    ("files", ("schema.yaml", b"name: test", "application/x-yaml")),
+                    ("files", ("data.parquet", file, "application/octet-stream")),
+                ]
+            )
+            length = len(body)
+            content = b""
+            while chunk := body.read(7):
+                content += chunk
+
+        boundary = body.boundary.encode()
+        assert len(content) == length
+        assert content.startswith(b"--" + boundary + b"\r\n")
+        assert content.endswith(b"--" + boundary + b"--\r\n")
+        assert b"\r\n\r\nname: test\r\n" in content
+        assert b"PAR1" * 100 + b"\r\n" in content
+        assert body.content_type == f"multipart/form-data; boundary={body.boundary}"
@@ -73,3 +73,70 @@ def test_save_logs_property():
     logger = Logger(save_logs=False, verbose=False)
     logger._logger.handlers = []  # Reset handlers to match the property's expected behavior
     assert logger.save_logs is False
+
+
+def test_logs_keep_the_last_messages():
+    logger = Logger(save_logs=False, max_logs=3)
+    for index in range(5):
+        logger.log(f"message {index}")
+
+    assert [log["msg"] for log in logger.logs] == [
+        "message 2",
+        "message 3",
+        "message 4",
+    ]
+
+
+def test_log_formats_lazily():
+    logger = Logger(save_logs=False)
+    calls = []
+
+    def message():
+        calls.append(1)
+        return "expensive"
+
+    logger.log(message)
+    logger.log("%s rows", 42)
+    assert calls == []
+
+    assert [log["msg"] for log in logger.logs] == ["expensive", "42 rows"]
+    assert [log["msg"] for log in logger.logs] == ["expensive", "42 rows"]
+    assert calls == [1]
+
+
+def test_log_skips_messages_below_level():
+    logger = Logger(save_logs=False, level=logging.WARNING)
+
+    def message():
+        raise AssertionError("the message must not be formatted")
+
+    logger.log(message)
+    logger.log("warning", level=logging.WARNING)
+
+    assert [(log["msg"], log["level"]) for log in logger.logs] == [
+        ("warning", "WARNING")
+    ]
+
+
+def test_log_with_args_skips_formatting_below_level():
+    logger = Logger(save_logs=False, level=logging.WARNING)
+
+    class Prompt:
+        def __str__(self):
+            raise AssertionError("the message must not be formatted")
+
+    logger.log("Prompt: %s", Prompt())
+    logger.log("%s rows", 42, level=logging.WARNING)
+
+    assert [log["msg"] for log in logger.logs] == ["42 rows"]
+
+
+def test_log_records_the_calling_class():
+    class Caller:
+        def run(self, logger):
+            logger.log("hello")
+
+    logger = Logger(save_logs=False)
+    Caller().run(logger)
+
+    assert logger.logs[0]["source"] == "Caller"
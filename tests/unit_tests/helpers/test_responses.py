@@ -130,7 +130,7 @@ class TestResponseParser(unittest.TestCase):
         result = {"type": "plot", "value": "/valid/path/to/plot.png"}
         self.assertTrue(self.response_parser._validate_response(result))
 
-    @patch("pandasai.core.response.chart.Image.open")  # Mock the Image.open method
+    @patch("PIL.Image.open")  # Mock the Image.open method
     def test_get_base64_image(self, mock_image_open):
         # Create a mock image
         mock_image = MagicMock(spec=Image.Image)
@@ -1,4 +1,7 @@
+import json
 import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch
 
 import pytest
@@ -112,7 +115,7 @@ def test_get_pandaai_session_with_env_api_url():
 
 
 @patch("pandasai.os.environ", {})
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_make_request_success(mock_request):
     """Test successful API request"""
     # Mock successful response
@@ -139,7 +142,7 @@ def test_make_request_success(mock_request):
     assert result == {"data": "test_data"}
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_make_request_error_response(mock_request):
     """Test API request with error response"""
     # Mock error response
@@ -154,7 +157,7 @@ def test_make_request_error_response(mock_request):
     assert str(exc_info.value) == "Bad request"
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_make_request_network_error(mock_request):
     """Test API request with network error"""
     # Mock network error
@@ -167,7 +170,7 @@ def test_make_request_network_error(mock_request):
     assert "Request failed: Network error" in str(exc_info.value)
 
 
-@patch("requests.request")
+@patch("requests.Session.request")
 def test_make_request_custom_headers(mock_request):
     """Test API request with custom headers"""
     # Mock successful response
@@ -183,3 +186,98 @@ def test_make_request_custom_headers(mock_request):
     called_headers = mock_request.call_args[1]["headers"]
     assert called_headers["Custom-Header"] == "test-value"
     assert "x-authorization" not in called_headers
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        self.server.requests.append((self.command, self.path, self.client_address))
+        status, content_type, body = self.server.responses.pop(0)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _respond
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.requests = []
+    server.responses = []
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def local_session(server):
+    session = Session(
+        endpoint_url=f"http://127.0.0.1:{server.server_port}",
+        api_key="test-key",
+        backoff_factor=0,
+    )
+    yield session
+    session.close()
+
+
+def _json(status, body):
+    return status, "application/json", json.dumps(body).encode()
+
+
+def test_connections_are_kept_alive(server, local_session):
+    server.responses = [_json(200, {"answer": i}) for i in range(3)]
+
+    results = [local_session.get("/test") for _ in range(3)]
+
+    assert results == [{"answer": 0}, {"answer": 1}, {"answer": 2}]
+    assert len({address for _, _, address in server.requests}) == 1
+
+
+def test_idempotent_requests_are_retried(server, local_session):
+    server.responses = [_json(503, {"detail": "unavailable"}), _json(200, {"ok": 1})]
+
+    assert local_session.get("/test") == {"ok": 1}
+    assert len(server.requests) == 2
+
+
+def test_post_requests_are_not_retried(server, local_session):
+    server.responses = [_json(503, {"detail": "unavailable"}), _json(200, {"ok": 1})]
+
+    with pytest.raises(PandaAIApiCallError, match="unavailable"):
+        local_session.post("/test", json={})
+    assert len(server.requests) == 1
+
+
+def test_raw_responses_are_streamed_without_parsing(server, local_session):
+    body = b"PK\x03\x04" + bytes(range(256)) * 64
+    server.responses = [(200, "application/zip", body)]
+
+    with patch("requests.Response.json") as mock_json:
+        response = local_session.get("/datasets/pull", raw=True, stream=True)
+        content = b"".join(response.iter_content(chunk_size=1024))
+
+    assert content == body
+    mock_json.assert_not_called()
+
+
+@patch.dict(
+    os.environ,
+    {"PANDABI_API_KEY": "test-env-key", "PANDABI_API_URL": "http://shared.url"},
+)
+def test_get_pandaai_session_is_shared():
+    assert get_pandaai_session() is get_pandaai_session()
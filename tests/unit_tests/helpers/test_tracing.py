@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from pandasai.helpers.tracing import (
+    NOOP_SPAN,
+    InMemorySpanExporter,
+    JsonlSpanExporter,
+    Tracer,
+)
+
+
+@pytest.fixture
+def tracer():
+    return Tracer()
+
+
+@pytest.fixture
+def exporter(tracer):
+    exporter = InMemorySpanExporter()
+    tracer.add_exporter(exporter)
+    return exporter
+
+
+def test_spans_are_noop_without_exporters(tracer):
+    assert tracer.start_trace("query") is NOOP_SPAN
+    assert tracer.span("llm") is NOOP_SPAN
+    assert tracer.current_span() is NOOP_SPAN
+
+
+def test_enabled_trace_records_spans_without_exporters(tracer):
+    with tracer.start_trace("query", enabled=True) as root:
+        with tracer.span("llm") as span:
+            assert span.is_recording
+            assert span.parent_id == root.span_id
+
+    assert set(root.timings()) == {"query", "llm"}
+
+
+def test_spans_are_nested_and_exported(tracer, exporter):
+    with tracer.start_trace("query", {"query_hash": "abc"}) as root:
+        with tracer.span("generate_code"):
+            with tracer.span("llm") as llm:
+                llm.set_attribute("prompt_tokens", 12)
+        tracer.current_span().set_attribute("retries", 1)
+
+    names = [span.name for span in exporter.spans]
+    assert names == ["llm", "generate_code", "query"]
+
+    llm, generate_code, query = exporter.spans
+    assert {span.trace_id for span in exporter.spans} == {root.trace_id}
+    assert llm.parent_id == generate_code.span_id
+    assert generate_code.parent_id == query.span_id
+    assert query.parent_id is None
+    assert llm.attributes == {"prompt_tokens": 12}
+    assert query.attributes == {"query_hash": "abc", "retries": 1}
+    assert query.end_time >= query.start_time
+    assert query.duration >= generate_code.duration >= llm.duration
+
+
+def test_timings_sum_repeated_stages(tracer, exporter):
+    with tracer.start_trace("query") as root:
+        for _ in range(3):
+            with tracer.span("execute_code"):
+                pass
+
+    executions = [span for span in exporter.spans if span.name == "execute_code"]
+    assert root.timings()["execute_code"] == pytest.approx(
+        sum(span.duration for span in executions)
+    )
+
+
+def test_span_records_errors(tracer, exporter):
+    with pytest.raises(ValueError):
+        with tracer.span("execute_code"):
+            raise ValueError("boom")
+
+    assert exporter.spans[0].error == "ValueError: boom"
+
+
+def test_jsonl_exporter(tracer, tmp_path):
+    path = tmp_path / "spans.jsonl"
+    tracer.add_exporter(JsonlSpanExporter(str(path)))
+
+    with tracer.start_trace("query"):
+        with tracer.span("sql_query", {"rows": 3}):
+            pass
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [span["name"] for span in spans] == ["sql_query", "query"]
+    assert spans[0]["attributes"] == {"rows": 3}
+    assert spans[0]["parent_id"] == spans[1]["span_id"]
+
+
+def test_remove_exporter(tracer, exporter):
+    tracer.remove_exporter(exporter)
+
+    with tracer.span("query"):
+        pass
+
+    assert exporter.spans == []
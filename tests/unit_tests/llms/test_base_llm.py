@@ -2,9 +2,36 @@
 
 import pytest
 
+from pandasai.core.prompts.base import BasePrompt
 from pandasai.exceptions import APIKeyNotFoundError, NoCodeFoundError
 from pandasai.helpers.memory import Memory
 from pandasai.llm import LLM
+from pandasai.llm.fake import FakeLLM
+from pandasai.llm.streaming import CodeBlockDetector
+
+
+class Prompt(BasePrompt):
+    template = "{{ question }}"
+
+
+class StreamingLLM(FakeLLM):
+    """Fake LLM streaming its response in chunks."""
+
+    def __init__(self, chunks):
+        super().__init__()
+        self.streaming = True
+        self.chunks = chunks
+        self.consumed = 0
+        self.closed = False
+
+    def stream(self, instruction, context=None):
+        self.last_prompt = instruction.to_string()
+        try:
+            for chunk in self.chunks:
+                self.consumed += 1
+                yield chunk
+        finally:
+            self.closed = True
 
 
 class TestBaseLLM:
@@ -121,6 +148,20 @@ print('Hello World')
             == ' xyz \n\n### PREVIOUS CONVERSATION\n### QUERY\n hello world\n### ANSWER\n print("hello world)\n'
         )
 
+    def test_get_system_prompt_memory_window(self):
+        mem = Memory(agent_description="xyz", memory_size=10)
+        mem.add("hello world", True)
+        mem.add('print("hello world)', False)
+        mem.add("hello again", True)
+        mem.add("print(1)", False)
+        mem.add("hello world", True)
+
+        assert (
+            LLM().get_system_prompt(mem.window(3))
+            == " xyz \n\n### PREVIOUS CONVERSATION\n### QUERY\n hello again\n### ANSWER\n print(1)\n"
+        )
+        assert mem.count() == 5
+
     def test_prepend_system_prompt_with_empty_mem(self):
         assert LLM().prepend_system_prompt("hello world", Memory()) == "\nhello world"
 
@@ -136,3 +177,80 @@ print('Hello World')
 
     def test_prepend_system_prompt_with_memory_none(self):
         assert LLM().prepend_system_prompt("hello world", None) == "hello world"
+
+
+class TestCodeBlockDetector:
+    def test_detects_the_closing_fence(self):
+        detector = CodeBlockDetector()
+
+        assert detector.feed("Sure:\n```python\nprint(1)\n") is False
+        assert detector.feed("```\nThis code prints 1.") is True
+        assert detector.text == "Sure:\n```python\nprint(1)\n```"
+
+    def test_detects_fences_split_across_chunks(self):
+        detector = CodeBlockDetector()
+        text = "```python\nprint(1)\n```\nmore"
+
+        closed = [detector.feed(char) for char in text]
+
+        assert closed.index(True) == text.index("```", 3) + 2
+        assert detector.text == "```python\nprint(1)\n```"
+
+    def test_without_code_block(self):
+        detector = CodeBlockDetector()
+
+        assert detector.feed("print(1)") is False
+        assert detector.feed("") is False
+        assert detector.text == "print(1)"
+
+
+class TestStreaming:
+    def test_stops_streaming_at_the_end_of_the_code_block(self):
+        llm = StreamingLLM(
+            ["Here:\n```py", "thon\nresult = 1\n", "``", "`\n", "Explanation", "..."]
+        )
+
+        code = llm.generate_code(Prompt(question="How many?"), None)
+
+        assert code == "result = 1"
+        assert llm.consumed == 4
+        assert llm.closed is True
+        assert llm.last_prompt == "How many?"
+
+    def test_extracts_the_code_of_a_complete_stream(self):
+        llm = StreamingLLM(["result ", "= 1"])
+
+        assert llm.generate_code(Prompt(question="How many?"), None) == "result = 1"
+        assert llm.consumed == 2
+
+    def test_raises_when_no_code_is_streamed(self):
+        llm = StreamingLLM(["```python\n", "result =", "\n```"])
+
+        with pytest.raises(NoCodeFoundError):
+            llm.generate_code(Prompt(question="How many?"), None)
+        assert llm.closed is True
+
+    def test_default_stream_yields_the_whole_response(self):
+        llm = FakeLLM()
+        llm.response = "```python\nresult = 1\n```"
+        llm.streaming = True
+
+        assert list(llm.stream(Prompt(question="How many?"))) == [llm.response]
+        assert llm.generate_code(Prompt(question="How many?"), None) == "result = 1"
+
+
+class TestCodeCandidates:
+    def test_calls_the_llm_once_per_candidate(self):
+        responses = iter(["```python\nresult = 1\n```", "no code", "result = 2"])
+        llm = FakeLLM()
+        llm.call = lambda instruction, context=None: next(responses)
+
+        candidates = llm.generate_code_candidates(Prompt(question="?"), None, 3)
+
+        assert sorted(candidates) == ["result = 1", "result = 2"]
+
+    def test_raises_when_no_candidate_is_valid(self):
+        llm = FakeLLM(output="I cannot answer that.")
+
+        with pytest.raises(NoCodeFoundError):
+            list(llm.generate_code_candidates(Prompt(question="?"), None, 2))
@@ -0,0 +1,88 @@
+"""Unit tests for the registry of the OpenAI SDK clients"""
+
+import asyncio
+
+import pytest
+
+from pandasai.llm.client_registry import ClientRegistry
+
+
+class Client:
+    def __init__(self, **params):
+        self.params = params
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestClientRegistry:
+    def test_shares_clients_with_the_same_parameters(self):
+        registry = ClientRegistry()
+
+        client = registry.get(Client, base_url="http://a", api_key="key")
+
+        assert registry.get(Client, base_url="http://a", api_key="key") is client
+        assert client.params == {"base_url": "http://a", "api_key": "key"}
+
+    def test_separates_clients_by_url_credentials_and_proxy(self):
+        registry = ClientRegistry()
+        client = registry.get(Client, base_url="http://a", api_key="key")
+
+        assert registry.get(Client, base_url="http://b", api_key="key") is not client
+        assert registry.get(Client, base_url="http://a", api_key="other") is not client
+        assert (
+            registry.get(Client, base_url="http://a", api_key="key", proxy=None)
+            is client
+        )
+
+    def test_accepts_unhashable_parameters(self):
+        registry = ClientRegistry()
+
+        client = registry.get(Client, default_headers={"X-Team": "data"})
+
+        assert registry.get(Client, default_headers={"X-Team": "data"}) is client
+        assert registry.get(Client, default_headers={"X-Team": "other"}) is not client
+
+    def test_async_clients_are_shared_within_an_event_loop(self):
+        registry = ClientRegistry()
+
+        async def get_clients():
+            return registry.get_async(Client, api_key="key"), registry.get_async(
+                Client, api_key="key"
+            )
+
+        first, second = asyncio.run(get_clients())
+        other_loop, _ = asyncio.run(get_clients())
+
+        assert first is second
+        assert other_loop is not first
+        assert registry.get(Client, api_key="key") is not first
+
+    def test_configure_creates_new_clients(self):
+        registry = ClientRegistry()
+        client = registry.get(Client, api_key="key")
+
+        registry.configure(keepalive_expiry=60)
+
+        assert registry._limits == {"keepalive_expiry": 60}
+        assert client not in registry._clients.values()
+        # The LLMs created before keep using their client
+        assert client.closed is False
+
+    def test_close(self):
+        registry = ClientRegistry()
+        client = registry.get(Client, api_key="key")
+
+        registry.close()
+
+        assert client.closed is True
+        assert registry.get(Client, api_key="key") is not client
+
+    def test_configured_limits(self):
+        httpx = pytest.importorskip("httpx")
+        registry = ClientRegistry(max_connections=10, keepalive_expiry=60)
+
+        client = registry.get(Client, api_key="key")
+
+        assert isinstance(client.params["http_client"], httpx.Client)
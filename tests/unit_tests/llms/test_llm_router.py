@@ -0,0 +1,224 @@
+"""Unit tests for the LLM router"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from pandasai.core.prompts.base import BasePrompt
+from pandasai.exceptions import NoCodeFoundError
+from pandasai.helpers.tracing import InMemorySpanExporter, tracer
+from pandasai.llm import LLMRouter
+from pandasai.llm.fake import FakeLLM
+from pandasai.llm.router import BackendStats
+
+
+class Prompt(BasePrompt):
+    template = "{{ question }}"
+
+
+class Backend(FakeLLM):
+    """Fake backend with a configurable latency."""
+
+    def __init__(self, name, latency=0.0, errors=None, response=None):
+        super().__init__(type=name)
+        self.latency = latency
+        self.errors = list(errors or [])
+        self.response = response or f"```python\nresult = '{name}'\n```"
+        self.calls = 0
+        self.finished = threading.Event()
+
+    def call(self, instruction, context=None):
+        self.calls += 1
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if self.errors:
+                raise self.errors.pop(0)
+            return super().call(instruction, context)
+        finally:
+            self.finished.set()
+
+
+def warm_up(router, backend, latency, calls=10):
+    for _ in range(calls):
+        router._stats[id(backend)].record_success(latency)
+
+
+class TestBackendStats:
+    def test_percentiles(self):
+        stats = BackendStats()
+        for latency in range(1, 101):
+            stats.record_success(latency / 100)
+
+        assert stats.percentile(50) == 0.5
+        assert stats.percentile(95) == 0.95
+        assert stats.percentile(100) == 1.0
+
+    def test_errors_increase_the_expected_latency(self):
+        stats = BackendStats()
+        stats.record_success(1.0)
+        assert stats.expected_latency() == 1.0
+
+        stats.record_error()
+        assert stats.expected_latency() == pytest.approx(1 / 0.8)
+        assert stats.errors == 1
+        assert stats.calls == 2
+
+    def test_window(self):
+        stats = BackendStats(window=2)
+        for latency in (10.0, 1.0, 1.0):
+            stats.record_success(latency)
+
+        assert stats.percentile(100) == 1.0
+
+
+class TestLLMRouter:
+    def test_requires_llms(self):
+        with pytest.raises(ValueError):
+            LLMRouter([])
+
+    def test_routes_to_the_fastest_backend(self):
+        slow, fast = Backend("slow"), Backend("fast")
+        router = LLMRouter([slow, fast])
+        warm_up(router, slow, 2.0)
+        warm_up(router, fast, 0.5)
+
+        code = router.generate_code(Prompt(question="How many?"), None)
+
+        assert code == "result = 'fast'"
+        assert (slow.calls, fast.calls) == (0, 1)
+        assert router.type == "router"
+        assert router.last_prompt == "How many?"
+
+    def test_tries_unknown_backends_first(self):
+        first, second = Backend("first"), Backend("second")
+        router = LLMRouter([first, second])
+        warm_up(router, first, 0.01)
+
+        router.call(Prompt(question="How many?"))
+
+        assert second.calls == 1
+
+    def test_falls_back_on_errors(self):
+        failing = Backend("failing", errors=[ConnectionError("down")])
+        backup = Backend("backup")
+        router = LLMRouter([failing, backup])
+
+        assert router.call(Prompt(question="How many?")) == backup.response
+        assert router.stats[0]["errors"] == 1
+        assert router.stats[0]["error_rate"] > 0
+
+    def test_falls_back_on_responses_without_code(self):
+        invalid = Backend("invalid", response="I cannot answer that.")
+        valid = Backend("valid")
+        router = LLMRouter([invalid, valid])
+
+        assert router.generate_code(Prompt(question="?"), None) == "result = 'valid'"
+
+    def test_raises_the_last_error(self):
+        router = LLMRouter(
+            [Backend("a", response="no code"), Backend("b", response="no code")]
+        )
+
+        with pytest.raises(NoCodeFoundError):
+            router.generate_code(Prompt(question="?"), None)
+
+    def test_hedges_slow_requests(self):
+        slow = Backend("slow", latency=1.0)
+        fast = Backend("fast", latency=0.01)
+        router = LLMRouter([slow, fast], hedge=True, hedge_after=0.05)
+
+        start = time.perf_counter()
+        code = router.generate_code(Prompt(question="How many?"), None)
+
+        assert code == "result = 'fast'"
+        assert time.perf_counter() - start < 0.5
+        assert (slow.calls, fast.calls) == (1, 1)
+
+    def test_does_not_hedge_fast_requests(self):
+        primary = Backend("primary", latency=0.01)
+        secondary = Backend("secondary")
+        router = LLMRouter([primary, secondary], hedge=True, hedge_after=0.5)
+
+        assert router.generate_code(Prompt(question="?"), None) == "result = 'primary'"
+        assert secondary.calls == 0
+
+    def test_hedge_delay_is_a_percentile_of_the_latency(self):
+        backend = Backend("backend")
+        router = LLMRouter([backend, Backend("other")], hedge=True)
+        assert router._hedge_delay(backend) is None
+
+        for latency in range(1, 21):
+            router._stats[id(backend)].record_success(latency / 10)
+
+        assert router._hedge_delay(backend) == 1.9
+
+    def test_hedged_request_falls_back_on_errors(self):
+        failing = Backend("failing", latency=0.01, errors=[TimeoutError()])
+        backup = Backend("backup")
+        router = LLMRouter([failing, backup], hedge=True, hedge_after=1.0)
+
+        start = time.perf_counter()
+        assert router.generate_code(Prompt(question="?"), None) == "result = 'backup'"
+        assert time.perf_counter() - start < 0.5
+
+    def test_hedge_delay_of_the_fallback_backend(self):
+        failing = Backend("failing", errors=[TimeoutError()])
+        slow = Backend("slow", latency=1.0)
+        fast = Backend("fast")
+        router = LLMRouter([failing, slow, fast], hedge=True)
+        warm_up(router, slow, 0.05)
+        warm_up(router, fast, 0.06)
+
+        start = time.perf_counter()
+        assert router.generate_code(Prompt(question="?"), None) == "result = 'fast'"
+        assert time.perf_counter() - start < 0.5
+
+    def test_hedged_requests_keep_the_trace(self):
+        spans = []
+
+        class TracedBackend(Backend):
+            def call(self, instruction, context=None):
+                spans.append(tracer.current_span())
+                return super().call(instruction, context)
+
+        exporter = InMemorySpanExporter()
+        tracer.add_exporter(exporter)
+        try:
+            slow = TracedBackend("slow", latency=0.2)
+            router = LLMRouter(
+                [slow, TracedBackend("fast")], hedge=True, hedge_after=0.01
+            )
+            with tracer.span("llm") as span:
+                router.generate_code(Prompt(question="?"), None)
+        finally:
+            tracer.remove_exporter(exporter)
+
+        assert spans == [span, span]
+
+    def test_routes_corrections_to_the_correction_llm(self):
+        main, fast = Backend("main"), Backend("fast")
+        router = LLMRouter([main], correction_llm=fast)
+        context = MagicMock(retry_count=0)
+
+        assert router.generate_code(Prompt(question="?"), context) == "result = 'main'"
+
+        context.retry_count = 1
+        assert router.generate_code(Prompt(question="?"), context) == "result = 'fast'"
+        assert [stats["llm"] for stats in router.stats] == ["main", "fast"]
+
+    def test_records_the_backend_in_the_trace(self):
+        exporter = InMemorySpanExporter()
+        tracer.add_exporter(exporter)
+        try:
+            slow = Backend("slow", latency=1.0)
+            router = LLMRouter([slow, Backend("fast")], hedge=True, hedge_after=0.01)
+            with tracer.span("llm"):
+                router.generate_code(Prompt(question="?"), None)
+        finally:
+            tracer.remove_exporter(exporter)
+
+        (span,) = exporter.spans
+        assert span.attributes == {"llm_backend": "fast", "hedged": True}
@@ -0,0 +1,213 @@
+"""Unit tests for the rate limited LLM wrapper"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from pandasai.core.prompts.base import BasePrompt
+from pandasai.helpers.memory import Memory
+from pandasai.llm import RateLimitedLLM
+from pandasai.llm.fake import FakeLLM
+from pandasai.llm.rate_limited import TokenBucket
+
+
+class Prompt(BasePrompt):
+    template = "{{ question }}"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class SlowLLM(FakeLLM):
+    """Fake LLM recording the calls in flight."""
+
+    def __init__(self, delay=0.05, errors=None):
+        super().__init__()
+        self.response = "```python\nresult = {'type': 'number', 'value': 1}\n```"
+        self.delay = delay
+        self.errors = list(errors or [])
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def call(self, instruction, context=None):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            if self.errors:
+                raise self.errors.pop(0)
+            return super().call(instruction, context)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+def run_in_threads(count, target):
+    results = [None] * count
+    errors = []
+
+    def run(index):
+        try:
+            results[index] = target(index)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+class TestTokenBucket:
+    def test_burst_up_to_capacity_then_waits(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock=clock, sleep=clock.sleep)
+
+        for _ in range(60):
+            assert bucket.acquire() == 0
+        assert bucket.acquire() == pytest.approx(1.0)
+        assert clock.now == pytest.approx(1.0)
+
+    def test_large_amounts_wait_for_a_full_bucket(self):
+        clock = FakeClock()
+        bucket = TokenBucket(600, clock=clock, sleep=clock.sleep)
+        bucket.acquire(600)
+
+        assert bucket.acquire(10_000) == pytest.approx(60.0)
+
+    def test_consume_goes_into_debt(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock=clock, sleep=clock.sleep)
+        bucket.consume(90)
+
+        assert bucket.acquire(1) == pytest.approx(31.0)
+
+
+class TestRateLimitedLLM:
+    def test_generates_code_like_the_wrapped_llm(self):
+        llm = RateLimitedLLM(SlowLLM(delay=0))
+
+        code = llm.generate_code(Prompt(question="How many?"), None)
+
+        assert code == "result = {'type': 'number', 'value': 1}"
+        assert llm.type == "fake"
+        assert llm.last_prompt == "How many?"
+
+    def test_coalesces_identical_prompts_in_flight(self):
+        wrapped = SlowLLM(delay=0.1)
+        llm = RateLimitedLLM(wrapped)
+
+        results, errors = run_in_threads(
+            10, lambda _: llm.call(Prompt(question="Same question"))
+        )
+
+        assert errors == []
+        assert wrapped.calls == 1
+        assert set(results) == {wrapped.response}
+
+    def test_does_not_coalesce_different_conversations(self):
+        wrapped = SlowLLM(delay=0.05)
+        llm = RateLimitedLLM(wrapped)
+
+        class Context:
+            def __init__(self, message):
+                self.memory = Memory()
+                self.memory.add(message, is_user=True)
+
+        run_in_threads(
+            2, lambda i: llm.call(Prompt(question="Same"), Context(f"message {i}"))
+        )
+
+        assert wrapped.calls == 2
+
+    def test_coalesced_callers_get_the_error(self):
+        wrapped = SlowLLM(delay=0.1, errors=[ValueError("invalid")])
+        llm = RateLimitedLLM(wrapped)
+
+        _, errors = run_in_threads(5, lambda _: llm.call(Prompt(question="Same")))
+
+        assert wrapped.calls == 1
+        assert len(errors) == 5
+        assert all(isinstance(error, ValueError) for error in errors)
+
+    def test_limits_concurrency(self):
+        wrapped = SlowLLM(delay=0.05)
+        llm = RateLimitedLLM(wrapped, max_concurrency=2)
+
+        _, errors = run_in_threads(
+            8, lambda i: llm.call(Prompt(question=f"Question {i}"))
+        )
+
+        assert errors == []
+        assert wrapped.calls == 8
+        assert wrapped.max_in_flight == 2
+
+    def test_limits_requests_per_minute(self):
+        clock = FakeClock()
+        llm = RateLimitedLLM(SlowLLM(delay=0), requests_per_minute=120)
+        llm._request_bucket = TokenBucket(
+            120, capacity=1, clock=clock, sleep=clock.sleep
+        )
+
+        for i in range(5):
+            llm.call(Prompt(question=f"Question {i}"))
+
+        assert clock.now == pytest.approx(2.0)
+
+    @patch("pandasai.llm.rate_limited.time.sleep")
+    def test_retries_rate_limited_requests(self, mock_sleep):
+        wrapped = SlowLLM(delay=0, errors=[RateLimitError(), HTTPError(503)])
+        llm = RateLimitedLLM(wrapped, backoff_factor=2)
+
+        assert llm.call(Prompt(question="Question")) == wrapped.response
+        assert wrapped.calls == 3
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        assert len(delays) == 2
+        assert 0 <= delays[0] <= 2
+        assert 0 <= delays[1] <= 4
+
+    @patch("pandasai.llm.rate_limited.time.sleep")
+    def test_does_not_retry_client_errors(self, mock_sleep):
+        wrapped = SlowLLM(delay=0, errors=[HTTPError(400)])
+        llm = RateLimitedLLM(wrapped)
+
+        with pytest.raises(HTTPError):
+            llm.call(Prompt(question="Question"))
+        assert wrapped.calls == 1
+        mock_sleep.assert_not_called()
+
+    @patch("pandasai.llm.rate_limited.time.sleep")
+    def test_gives_up_after_max_retries(self, mock_sleep):
+        wrapped = SlowLLM(delay=0, errors=[HTTPError(429)] * 5)
+        llm = RateLimitedLLM(wrapped, max_retries=2)
+
+        with pytest.raises(HTTPError):
+            llm.call(Prompt(question="Question"))
+        assert wrapped.calls == 3
@@ -0,0 +1,39 @@
+"""Unit tests for the base prompt class"""
+
+from unittest.mock import patch
+
+from pandasai.core.prompts.base import BasePrompt, get_environment, get_template
+
+
+class InlinePrompt(BasePrompt):
+    template = "Hello {{ name }}!\n\n\n\nBye"
+
+
+class FilePrompt(BasePrompt):
+    template_path = "generate_system_message.tmpl"
+
+
+class TestBasePrompt:
+    def test_file_templates_are_compiled_once(self):
+        first = FilePrompt()
+        with patch.object(get_environment(), "_parse") as mock_parse:
+            second = FilePrompt()
+
+        assert first.prompt is second.prompt
+        assert first.prompt is get_template(FilePrompt.template_path)
+        mock_parse.assert_not_called()
+
+    def test_inline_templates_are_compiled_once(self):
+        first = InlinePrompt(name="first")
+        with patch.object(get_environment(), "_parse") as mock_parse:
+            second = InlinePrompt(name="second")
+
+        assert first.prompt is second.prompt
+        mock_parse.assert_not_called()
+        assert first.to_string() == "Hello first!\n\n\n\nBye"
+        assert second.render() == "Hello second!\n\nBye"
+
+    def test_to_string_is_resolved_once(self):
+        prompt = InlinePrompt(name="world")
+        assert prompt.to_string() is prompt.to_string()
+        assert str(prompt) == "Hello world!\n\n\n\nBye"
@@ -1,6 +1,5 @@
 """Unit tests for the correct error prompt class"""
 
-import os
 import sys
 
 import pytest
@@ -41,11 +40,11 @@ class TestGeneratePythonCodeWithSQLPrompt:
             ),
         ],
     )
-    def test_str_with_args(self, output_type, output_type_template):
+    def test_str_with_args(self, output_type, output_type_template, monkeypatch):
         """Test that the __str__ method is implemented"""
 
-        os.environ["PANDABI_API_URL"] = ""
-        os.environ["PANDABI_API_KEY"] = ""
+        monkeypatch.setenv("PANDABI_API_URL", "")
+        monkeypatch.setenv("PANDABI_API_KEY", "")
 
         llm = FakeLLM()
         agent = Agent(
@@ -0,0 +1,142 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from pandasai.exceptions import CodeExecutionError, NoResultFoundError
+from pandasai.sandbox import ProcessPoolSandbox
+from pandasai.sandbox.process_pool_sandbox import (
+    dataframe_from_ipc,
+    dataframe_to_ipc,
+)
+
+
+class TestProcessPoolSandbox(unittest.TestCase):
+    def setUp(self):
+        self.sandbox = ProcessPoolSandbox(pool_size=1, timeout=10)
+
+    def tearDown(self):
+        self.sandbox.stop()
+
+    def test_start_and_stop(self):
+        self.sandbox.start()
+        self.assertTrue(self.sandbox._started)
+        self.assertEqual(len(self.sandbox._workers), 1)
+        self.assertTrue(self.sandbox._workers[0].is_alive())
+
+        self.sandbox.stop()
+        self.assertFalse(self.sandbox._started)
+        self.assertEqual(self.sandbox._workers, [])
+
+    def test_invalid_pool_size(self):
+        with self.assertRaises(ValueError):
+            ProcessPoolSandbox(pool_size=0)
+
+    def test_execute_returns_result(self):
+        result = self.sandbox.execute(
+            'result = {"type": "number", "value": int(np.sum([1, 2, 3]))}', {}
+        )
+        self.assertEqual(result, {"type": "number", "value": 6})
+
+    def test_execute_proxies_sql_queries(self):
+        execute_sql_query = MagicMock(
+            return_value=pd.DataFrame({"artist": ["a", "b"], "streams": [1, 2]})
+        )
+        code = """
+df = execute_sql_query("SELECT * FROM artists")
+result = {"type": "dataframe", "value": df[df["streams"] > 1]}
+"""
+        result = self.sandbox.execute(code, {"execute_sql_query": execute_sql_query})
+
+        execute_sql_query.assert_called_once_with("SELECT * FROM artists")
+        self.assertEqual(result["type"], "dataframe")
+        self.assertEqual(result["value"]["artist"].tolist(), ["b"])
+
+    def test_sql_errors_are_raised_in_the_code(self):
+        execute_sql_query = MagicMock(side_effect=RuntimeError("table not found"))
+        code = """
+try:
+    execute_sql_query("SELECT * FROM missing")
+except RuntimeError as e:
+    result = {"type": "string", "value": str(e)}
+"""
+        result = self.sandbox.execute(code, {"execute_sql_query": execute_sql_query})
+        self.assertEqual(result, {"type": "string", "value": "table not found"})
+
+    def test_execute_raises_code_execution_error(self):
+        with self.assertRaises(CodeExecutionError) as context:
+            self.sandbox.execute("result = 1 / 0", {})
+        self.assertIn("ZeroDivisionError", str(context.exception))
+
+    def test_execute_raises_no_result_found(self):
+        with self.assertRaises(NoResultFoundError):
+            self.sandbox.execute("x = 1", {})
+
+    def test_timeout_replaces_worker(self):
+        sandbox = ProcessPoolSandbox(pool_size=1, timeout=0.5)
+        try:
+            sandbox.start()
+            worker = sandbox._workers[0]
+
+            with self.assertRaises(CodeExecutionError) as context:
+                sandbox.execute("while True:\n    pass", {})
+            self.assertIn("timed out", str(context.exception))
+            self.assertFalse(worker.is_alive())
+
+            result = sandbox.execute('result = {"type": "number", "value": 1}', {})
+            self.assertEqual(result, {"type": "number", "value": 1})
+        finally:
+            sandbox.stop()
+
+    def test_default_start_method_is_not_fork(self):
+        self.assertNotEqual(self.sandbox._context.get_start_method(), "fork")
+
+    def test_stop_terminates_busy_workers(self):
+        self.sandbox.start()
+        worker = self.sandbox._workers[0]
+        errors = []
+
+        def run():
+            try:
+                self.sandbox.execute("while True:\n    pass", {})
+            except CodeExecutionError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        # Wait for the worker to receive the task
+        while self.sandbox._idle_workers.qsize():
+            time.sleep(0.01)
+        time.sleep(0.2)
+
+        self.sandbox.stop()
+        thread.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(self.sandbox._workers, [])
+        self.assertEqual(self.sandbox._idle_workers.qsize(), 0)
+
+    def test_cpu_time_limit(self):
+        sandbox = ProcessPoolSandbox(pool_size=1, timeout=10, cpu_time_limit=1)
+        try:
+            with self.assertRaises(CodeExecutionError) as context:
+                sandbox.execute("while True:\n    pass", {})
+            self.assertIn("CPU time limit exceeded", str(context.exception))
+        finally:
+            sandbox.stop()
+
+    def test_syntax_error_is_raised_before_dispatch(self):
+        with self.assertRaises(SyntaxError):
+            self.sandbox.execute("x = ", {})
+
+    def test_dataframe_ipc_round_trip(self):
+        df = pd.DataFrame({"a": [1, 2], "b": [0.5, 1.5], "c": ["x", "y"]})
+        pd.testing.assert_frame_equal(dataframe_from_ipc(dataframe_to_ipc(df)), df)
+
+
+if __name__ == "__main__":
+    unittest.main()
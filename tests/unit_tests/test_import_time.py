@@ -0,0 +1,77 @@
+import json
+import subprocess
+import sys
+
+# Generous enough for slow CI machines, while importing pandas alone takes
+# several times longer
+IMPORT_TIME_BUDGET = 0.2
+
+HEAVY_MODULES = [
+    "duckdb",
+    "jinja2",
+    "matplotlib",
+    "numpy",
+    "pandas",
+    "PIL",
+    "pydantic",
+    "requests",
+    "sqlglot",
+]
+
+
+def run_python(code: str) -> dict:
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+    return json.loads(output)
+
+
+def test_import_does_not_load_heavy_dependencies():
+    loaded = run_python(
+        "import json, sys; import pandasai; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+
+    assert loaded == []
+
+
+def test_import_time_budget():
+    # Best of several runs, to be robust to the noise of the machine
+    durations = run_python(
+        "import importlib, json, sys, time\n"
+        "durations = []\n"
+        "for _ in range(3):\n"
+        "    for name in [m for m in sys.modules if m.startswith('pandasai')]:\n"
+        "        del sys.modules[name]\n"
+        "    start = time.perf_counter()\n"
+        "    importlib.import_module('pandasai')\n"
+        "    durations.append(time.perf_counter() - start)\n"
+        "print(json.dumps(durations))\n"
+    )
+
+    assert min(durations) < IMPORT_TIME_BUDGET
+
+
+def test_public_names_are_imported_on_access():
+    names = run_python(
+        "import json, pandasai\n"
+        "print(json.dumps({\n"
+        "    'DataFrame': pandasai.DataFrame.__module__,\n"
+        "    'Agent': pandasai.Agent.__module__,\n"
+        "    'config': pandasai.config.get.__qualname__,\n"
+        "}))\n"
+    )
+
+    assert names == {
+        "DataFrame": "pandasai.dataframe.base",
+        "Agent": "pandasai.agent.base",
+        "config": "ConfigManager.get",
+    }
+
+
+def test_sandbox_import_does_not_load_the_process_pool():
+    loaded = run_python(
+        "import json, sys; import pandasai.sandbox; "
+        "print(json.dumps([m for m in ['pyarrow', "
+        "'pandasai.sandbox.process_pool_sandbox'] if m in sys.modules]))"
+    )
+
+    assert loaded == []
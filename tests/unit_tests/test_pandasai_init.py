@@ -54,12 +54,12 @@ class TestPandaAIInit:
         return {"type": "sqlite", "path": "/path/to/database.db", "table": "countries"}
 
     def test_chat_creates_agent(self, sample_df):
-        with patch("pandasai.Agent") as MockAgent:
+        with patch("pandasai.agent.Agent") as MockAgent:
             pandasai.chat("Test query", sample_df)
             MockAgent.assert_called_once_with([sample_df], sandbox=None)
 
     def test_chat_sandbox_passed_to_agent(self, sample_df):
-        with patch("pandasai.Agent") as MockAgent:
+        with patch("pandasai.agent.Agent") as MockAgent:
             sandbox = MagicMock()
             pandasai.chat("Test query", sample_df, sandbox=sandbox)
             MockAgent.assert_called_once_with([sample_df], sandbox=sandbox)
@@ -74,14 +74,14 @@ class TestPandaAIInit:
             pandasai.follow_up("Follow-up query")
 
     def test_follow_up_after_chat(self, sample_df):
-        with patch("pandasai.Agent") as MockAgent:
+        with patch("pandasai.agent.Agent") as MockAgent:
             mock_agent = MockAgent.return_value
             pandasai.chat("Test query", sample_df)
             pandasai.follow_up("Follow-up query")
             mock_agent.follow_up.assert_called_once_with("Follow-up query")
 
     def test_chat_with_multiple_dataframes(self, sample_dataframes):
-        with patch("pandasai.Agent") as MockAgent:
+        with patch("pandasai.agent.Agent") as MockAgent:
             mock_agent_instance = MagicMock()
             MockAgent.return_value = mock_agent_instance
             mock_agent_instance.chat.return_value = "Mocked response"
@@ -95,7 +95,7 @@ class TestPandaAIInit:
             assert result == "Mocked response"
 
     def test_chat_with_single_dataframe(self, sample_dataframes):
-        with patch("pandasai.Agent") as MockAgent:
+        with patch("pandasai.agent.Agent") as MockAgent:
             mock_agent_instance = MagicMock()
             MockAgent.return_value = mock_agent_instance
             mock_agent_instance.chat.return_value = "Mocked response"
@@ -130,13 +130,13 @@ class TestPandaAIInit:
     @patch("zipfile.ZipFile")
     @patch("io.BytesIO")
     @patch("os.environ")
-    def test_load_dataset_not_found(self, mockenviron, mock_bytes_io, mock_zip_file):
+    @patch("pandasai.helpers.session.get_pandaai_session")
+    def test_load_dataset_not_found(
+        self, mock_request_session, mockenviron, mock_bytes_io, mock_zip_file
+    ):
         """Test loading when dataset does not exist locally and API returns not found."""
         mockenviron.return_value = {"PANDABI_API_URL": "localhost:8000"}
-        mock_request_session = MagicMock()
-        pandasai.get_pandaai_session = mock_request_session
-        pandasai.get_pandaai_session.return_value = MagicMock()
-        mock_request_session.get.return_value.status_code = 404
+        mock_request_session.return_value.get.return_value.status_code = 404
 
         dataset_path = "org/dataset-name"
 
@@ -145,7 +145,7 @@ class TestPandaAIInit:
 
     @patch("pandasai.os.path.exists")
     @patch("pandasai.os.environ", {})
-    @patch("pandasai.get_pandaai_session")
+    @patch("pandasai.helpers.session.get_pandaai_session")
     def test_load_missing_not_found_locally_and_no_remote_key(
         self, mock_session, mock_exists
     ):
@@ -164,9 +164,11 @@ class TestPandaAIInit:
 
     @patch("pandasai.os.path.exists")
     @patch("pandasai.os.environ", {"PANDABI_API_KEY": "key"})
-    def test_load_missing_api_url(self, mock_exists):
+    @patch("pandasai.helpers.session.get_pandaai_session")
+    def test_load_missing_api_url(self, mock_session, mock_exists):
         """Test loading when API URL is missing."""
         mock_exists.return_value = False
+        mock_session.return_value.get.return_value.status_code = 404
         dataset_path = "org/dataset-name"
 
         with pytest.raises(DatasetNotFound):
@@ -174,7 +176,7 @@ class TestPandaAIInit:
 
     @patch("pandasai.os.path.exists")
     @patch("pandasai.os.environ", {"PANDABI_API_KEY": "key"})
-    @patch("pandasai.get_pandaai_session")
+    @patch("pandasai.helpers.session.get_pandaai_session")
     def test_load_missing_not_found(self, mock_session, mock_exists):
         """Test loading when API URL is missing."""
         mock_exists.return_value = False
@@ -188,12 +190,10 @@ class TestPandaAIInit:
 
     @patch("pandasai.os.environ", new_callable=dict)
     @patch("pandasai.os.path.exists")
-    @patch("pandasai.get_pandaai_session")
-    @patch("pandasai.ZipFile")
-    @patch("pandasai.BytesIO")
+    @patch("pandasai.helpers.session.get_pandaai_session")
+    @patch("pandasai.helpers.dataset_transfer.ZipFile")
     def test_load_successful_zip_extraction(
         self,
-        mock_bytes_io,
         mock_zip_file,
         mock_get_pandaai_session,
         mock_exists,
@@ -206,7 +206,10 @@ class TestPandaAIInit:
         mock_request_session = MagicMock()
         mock_get_pandaai_session.return_value = mock_request_session
         mock_request_session.get.return_value.status_code = 200
-        mock_request_session.get.return_value.content = b"mock zip content"
+        mock_request_session.get.return_value.headers = {}
+        mock_request_session.get.return_value.iter_content.return_value = [
+            b"mock zip content"
+        ]
 
         dataset_path = "org/dataset-name"
 
@@ -243,7 +246,7 @@ class TestPandaAIInit:
             mock_clear.assert_called_once()
 
     @patch.dict(os.environ, {"PANDABI_API_KEY": "test-key"})
-    @patch("pandasai.get_pandaai_session")
+    @patch("pandasai.helpers.session.get_pandaai_session")
     @patch("pandasai.os.path.exists")
     @patch("pandasai.helpers.path.find_project_root")
     @patch("pandasai.os.makedirs")
@@ -255,7 +258,8 @@ class TestPandaAIInit:
         mock_exists.return_value = False
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.content = create_test_zip()
+        mock_response.headers = {}
+        mock_response.iter_content.return_value = [create_test_zip()]
         mock_session.return_value.get.return_value = mock_response
 
         with patch("builtins.open", mock_open()) as mock_file:
@@ -272,13 +276,15 @@ class TestPandaAIInit:
                 "x-authorization": "Bearer test-key",
             },
             params={"path": "org/dataset"},
+            raw=True,
+            stream=True,
         )
 
     @patch.dict(
         os.environ,
         {"PANDABI_API_KEY": "test-key", "PANDABI_API_URL": "https://custom.api.url"},
     )
-    @patch("pandasai.get_pandaai_session")
+    @patch("pandasai.helpers.session.get_pandaai_session")
     @patch("pandasai.os.path.exists")
     @patch("pandasai.helpers.path.find_project_root")
     @patch("pandasai.os.makedirs")
@@ -290,7 +296,8 @@ class TestPandaAIInit:
         mock_exists.return_value = False
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.content = create_test_zip()
+        mock_response.headers = {}
+        mock_response.iter_content.return_value = [create_test_zip()]
         mock_session.return_value.get.return_value = mock_response
 
         with patch("builtins.open", mock_open()) as mock_file:
@@ -307,6 +314,8 @@ class TestPandaAIInit:
                 "x-authorization": "Bearer test-key",
             },
             params={"path": "org/dataset"},
+            raw=True,
+            stream=True,
         )
 
     def test_create_valid_dataset_no_params(
@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from pandasai.vectorstores.embeddings import (
+    CachedEmbeddingFunction,
+    cached_embedding_function,
+)
+
+
+class FakeEmbedder:
+    model_name = "fake-model"
+
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        self.threads.add(threading.get_ident())
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+@pytest.fixture
+def embedder():
+    return FakeEmbedder()
+
+
+def test_identical_texts_are_embedded_once(embedder):
+    embed = CachedEmbeddingFunction(embedder)
+
+    assert embed(["a", "bb", "a"]) == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert embed(["bb"]) == [[2.0, 1.0]]
+    assert embedder.calls == [["a", "bb"]]
+
+
+def test_single_text(embedder):
+    embed = CachedEmbeddingFunction(embedder)
+
+    assert embed("abc") == [[3.0, 1.0]]
+
+
+def test_least_recently_used_embeddings_are_evicted(embedder):
+    embed = CachedEmbeddingFunction(embedder, cache_size=2)
+
+    embed(["a"])
+    embed(["bb"])
+    embed(["a"])
+    embed(["ccc"])
+    embed(["a", "bb"])
+
+    assert embedder.calls == [["a"], ["bb"], ["ccc"], ["bb"]]
+
+
+def test_texts_are_embedded_in_batches(embedder):
+    embed = CachedEmbeddingFunction(embedder, batch_size=2)
+
+    result = embed(["a", "bb", "ccc", "dddd", "eeeee"])
+
+    assert [len(call) for call in embedder.calls] == [2, 2, 1]
+    assert [embedding[0] for embedding in result] == [1, 2, 3, 4, 5]
+
+
+def test_batches_are_embedded_on_a_thread_pool(embedder):
+    embed = CachedEmbeddingFunction(embedder, batch_size=1, max_workers=4)
+
+    result = embed([str(i) * i for i in range(1, 9)])
+
+    assert [embedding[0] for embedding in result] == list(range(1, 9))
+    assert threading.get_ident() not in embedder.threads
+
+
+def test_embeddings_are_persisted_on_disk(embedder, tmp_path):
+    CachedEmbeddingFunction(embedder, cache_path=str(tmp_path))(["a", "bb"])
+
+    other = FakeEmbedder()
+    embed = CachedEmbeddingFunction(other, cache_path=str(tmp_path))
+
+    assert embed(["bb", "a"]) == [[2.0, 1.0], [1.0, 1.0]]
+    assert other.calls == []
+
+
+def test_namespace_separates_models(embedder, tmp_path):
+    CachedEmbeddingFunction(embedder, cache_path=str(tmp_path))(["a"])
+
+    other = FakeEmbedder()
+    CachedEmbeddingFunction(other, cache_path=str(tmp_path), namespace="other")(["a"])
+
+    assert other.calls == [["a"]]
+
+
+def test_invalid_batch_size(embedder):
+    with pytest.raises(ValueError):
+        CachedEmbeddingFunction(embedder, batch_size=0)
+
+
+def test_cached_embedding_function_does_not_wrap_twice(embedder):
+    embed = cached_embedding_function(embedder, batch_size=8)
+
+    assert cached_embedding_function(embed) is embed
+    assert embed.batch_size == 8
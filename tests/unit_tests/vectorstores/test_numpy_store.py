@@ -0,0 +1,181 @@
+import threading
+
+import numpy as np
+import pytest
+
+from pandasai.vectorstores import NumpyVectorStore
+
+VOCABULARY = ["sales", "country", "gdp", "revenue", "employee", "salary"]
+
+
+def embed(texts):
+    # Bag of words over a tiny vocabulary, so that the nearest documents are
+    # the ones sharing the most words with the question
+    return [
+        [float(word in text.lower()) for word in VOCABULARY] + [0.1] for text in texts
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NumpyVectorStore(embed, persist_path=str(tmp_path), max_samples=2)
+
+
+class TestNumpyVectorStore:
+    def test_add_and_query_question_answers(self, store):
+        ids = store.add_question_answer(
+            ["Total sales per country", "Average salary per employee"],
+            ["df.groupby('country').sales.sum()", "df.salary.mean()"],
+        )
+
+        result = store.get_relevant_question_answers("What are the sales by country?")
+
+        assert len(ids) == 2
+        assert result["ids"][0][0] == ids[0]
+        assert result["documents"][0][0].startswith("Q: Total sales per country")
+        assert len(result["ids"][0]) == 1
+        assert 0 <= result["distances"][0][0] < 1.5
+
+    def test_distance_threshold(self, store):
+        store.add_docs(["GDP is in USD", "Salary is yearly"], ids=["gdp", "salary"])
+
+        documents = store.get_relevant_docs_documents("gdp", k=2)
+
+        assert documents == ["GDP is in USD"]
+
+    def test_qa_and_docs_are_separate(self, store):
+        store.add_docs(["Revenue includes taxes"])
+
+        assert store.get_relevant_qa_documents("revenue") == []
+        assert store.get_relevant_docs_documents("revenue") == [
+            "Revenue includes taxes"
+        ]
+
+    def test_get_by_id(self, store):
+        store.add_docs(["GDP is in USD"], ids=["gdp"], metadatas=[{"source": "wiki"}])
+
+        assert store.get_relevant_docs_by_id(["gdp", "unknown"]) == {
+            "documents": ["GDP is in USD"],
+            "metadatas": [{"source": "wiki"}],
+            "ids": ["gdp"],
+        }
+
+    def test_update_replaces_the_document(self, store):
+        store.add_docs(["Sales are in EUR"], ids=["currency"])
+
+        store.update_docs(["currency"], ["Sales are in USD"])
+
+        assert store.get_relevant_docs_documents("sales", k=5) == ["Sales are in USD"]
+
+    def test_deleted_rows_are_not_returned(self, store):
+        store.add_docs(["GDP is in USD", "GDP per country"], ids=["a", "b"])
+        store._compaction_threshold = 1
+
+        store.delete_docs(["a"])
+
+        assert store.get_relevant_docs_documents("gdp country", k=5) == [
+            "GDP per country"
+        ]
+        assert store._docs_collection.deleted == {0}
+
+    def test_query_is_consistent_with_a_concurrent_compaction(self, store):
+        store.add_docs(["Salary is yearly", "GDP is in USD"], ids=["a", "b"])
+        store._compaction_threshold = 1
+        store.delete_docs(["a"])
+        collection = store._docs_collection
+        search = collection.search
+
+        def search_then_compact(*args):
+            results = search(*args)
+            compaction = threading.Thread(target=collection.compact)
+            compaction.start()
+            compaction.join(0.2)
+            return results
+
+        collection.search = search_then_compact
+
+        assert store.get_relevant_docs_documents("gdp") == ["GDP is in USD"]
+
+    def test_collections_are_compacted(self, store):
+        store.add_docs([f"GDP document {i}" for i in range(4)], ids=list("abcd"))
+
+        store.delete_docs(["a", "b"])
+
+        collection = store._docs_collection
+        assert collection.deleted == set()
+        assert collection.ids == ["c", "d"]
+        assert collection._vectors.shape == (2, len(VOCABULARY) + 1)
+
+    def test_collections_are_persisted(self, store, tmp_path):
+        store.add_question_answer(["Total sales"], ["df.sales.sum()"], ids=["q1"])
+        store.add_docs(["GDP is in USD", "Salary is yearly"], ids=["gdp", "salary"])
+        store._compaction_threshold = 1
+        store.delete_docs(["salary"])
+        store.add_docs(["Revenue includes taxes"], ids=["revenue"])
+
+        reopened = NumpyVectorStore(embed, persist_path=str(tmp_path))
+
+        assert reopened.get_relevant_qa_documents("sales") == [
+            "Q: Total sales\n A: df.sales.sum()"
+        ]
+        assert reopened.get_relevant_docs_documents("revenue") == [
+            "Revenue includes taxes"
+        ]
+        assert isinstance(reopened._docs_collection._vectors, np.memmap)
+        assert "salary" not in reopened._docs_collection.rows
+
+    def test_interrupted_append_is_discarded(self, store, tmp_path):
+        store.add_docs(["GDP is in USD"], ids=["gdp"])
+        with open(store._docs_collection._vectors_path, "ab") as file:
+            file.write(b"\0" * 12)
+
+        reopened = NumpyVectorStore(embed, persist_path=str(tmp_path))
+        reopened.add_docs(["Revenue includes taxes"], ids=["revenue"])
+
+        assert reopened.get_relevant_docs_documents("revenue") == [
+            "Revenue includes taxes"
+        ]
+
+    def test_in_memory(self):
+        store = NumpyVectorStore(embed, persist_path=False)
+        store.add_docs(["GDP is in USD"])
+        store.add_docs(["Revenue includes taxes"])
+
+        assert store.get_relevant_docs_documents("revenue") == [
+            "Revenue includes taxes"
+        ]
+
+    def test_search_across_chunks(self, store):
+        store._docs_collection.search_chunk_size = 2
+        store.add_docs([f"Document {i}" for i in range(5)] + ["Salary is yearly"])
+
+        assert store.get_relevant_docs_documents("salary") == ["Salary is yearly"]
+
+    def test_embeddings_are_cached(self, tmp_path):
+        calls = []
+
+        def counting_embed(texts):
+            calls.append(texts)
+            return embed(texts)
+
+        store = NumpyVectorStore(counting_embed, persist_path=False)
+        store.get_relevant_docs("gdp")
+        store.get_relevant_question_answers("gdp")
+
+        assert calls == [["gdp"]]
+
+    def test_mismatched_dimensions(self, store):
+        store.add_docs(["GDP is in USD"])
+        store._embedding_function.embedding_function = lambda texts: [[1.0]]
+
+        with pytest.raises(ValueError):
+            store.add_docs(["Revenue includes taxes"])
+
+    def test_delete_collection(self, store):
+        store.add_question_answer(["Total sales"], ["df.sales.sum()"])
+        store.add_docs(["GDP is in USD"])
+
+        assert store.delete_collection("pandasai-docs")
+
+        assert store.get_relevant_docs_documents("gdp") == []
+        assert store.get_relevant_qa_documents("sales") != []